@@ -0,0 +1,180 @@
+# benchmarks/flight_standin.py
+#
+# SERVER ARROW FLIGHT MINIMAL YANG MENIRU DREMIO UNTUK QUERY DI routers/model.py:
+#   CREATE TABLE Minio."<nama>" AS SELECT TO_DATE(A, ...) ... FROM MinIO.raw."<file>.xlsx" ...
+#   SELECT * FROM Minio."<nama>" [LIMIT n]
+#   SELECT * FROM Minio."<nama>" WHERE Tanggal IS NOT NULL | > TO_DATE('<tgl>', 'YYYY-MM-DD')
+#       ORDER BY Tanggal [ASC|DESC] [LIMIT n]           (utils/seed_windows.py)
+# CTAS membaca XLSX dari S3StandIn (bucket datalake), kolom A..K dipetakan sesuai
+# urutan INGEST_COLUMNS (L = Stasiun jika ada) dan baris yang tanggalnya tidak valid
+# (header) dibuang, sama seperti TO_DATE(..., 1) + WHERE Tanggal IS NOT NULL.
+# Query lain -> error.
+#
+#   flight_server = FlightStandIn(s3=stand_in, bucket="datalake").start()
+#   os.environ["DREMIO_ENDPOINT"] = flight_server.endpoint
+#   ...
+#   flight_server.stop()
+import io
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import flight
+
+from benchmarks.s3_standin import S3StandIn
+from utils.data_validation import DATE_COL, INGEST_COLUMNS, STATION_COL
+
+_CTAS = re.compile(
+    r'CREATE\s+TABLE\s+Minio\."(?P<table>[^"]+)"\s+AS\s+'
+    r'.*?FROM\s+MinIO\.raw\."(?P<file>[^"]+)"',
+    re.IGNORECASE | re.DOTALL,
+)
+_CTAS_TICKET = "CTAS:"
+_SELECT = re.compile(
+    r'^\s*SELECT\s+\*\s+FROM\s+Minio\."(?P<table>[^"]+)"'
+    r"(?:\s+LIMIT\s+(?P<limit>\d+))?\s*;?\s*$",
+    re.IGNORECASE,
+)
+_SELECT_WHERE = re.compile(
+    r'^\s*SELECT\s+\*\s+FROM\s+Minio\."(?P<table>[^"]+)"\s+WHERE\s+Tanggal\s+'
+    r"(?:IS\s+NOT\s+NULL|>\s*TO_DATE\('(?P<since>\d{4}-\d{2}-\d{2})',\s*'YYYY-MM-DD'\))"
+    r"\s+ORDER\s+BY\s+Tanggal(?:\s+(?P<order>ASC|DESC))?"
+    r"(?:\s+LIMIT\s+(?P<limit>\d+))?\s*;?\s*$",
+    re.IGNORECASE,
+)
+
+
+class FlightStandIn(flight.FlightServerBase):
+    def __init__(
+        self,
+        s3: Optional[S3StandIn] = None,
+        bucket: str = "datalake",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+    ):
+        super().__init__(f"grpc+tcp://{host}:{port}")
+        self.host = host
+        self.s3 = s3
+        self.bucket = bucket
+        self.latency = latency_ms / 1000.0
+        self.tables: Dict[str, pa.Table] = {}
+        self.queries = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve, daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        return f"grpc+tcp://{self.host}:{self.port}"
+
+    def start(self) -> "FlightStandIn":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+
+    def add_table(self, name: str, df: pd.DataFrame) -> None:
+        """Daftarkan tabel langsung (mis. data latih sintetis untuk /model/train)."""
+        with self._lock:
+            self.tables[name] = pa.Table.from_pandas(df, preserve_index=False)
+
+    def drop_table(self, name: str) -> None:
+        with self._lock:
+            self.tables.pop(name, None)
+
+    # =========================
+    # QUERY
+    # =========================
+    def _execute(self, query: str) -> pa.Table:
+        with self._lock:
+            self.queries += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        match = _SELECT.match(query) or _SELECT_WHERE.match(query)
+        if match:
+            with self._lock:
+                table = self.tables.get(match["table"])
+            if table is None:
+                raise flight.FlightServerError(f"Table 'Minio.{match['table']}' not found")
+            if match.re is _SELECT_WHERE:
+                table = self._filter_sorted(table, match)
+            return table.slice(0, int(match["limit"])) if match["limit"] else table
+
+        if query.startswith(_CTAS_TICKET):
+            return self._ctas_summary(query[len(_CTAS_TICKET):])
+        match = _CTAS.search(query)
+        if match:
+            self._create_table(match["table"], match["file"])
+            return self._ctas_summary(match["table"])
+        raise flight.FlightServerError(f"Unsupported query: {query.strip()[:200]}")
+
+    @staticmethod
+    def _filter_sorted(table: pa.Table, match: re.Match) -> pa.Table:
+        df = table.to_pandas()
+        dates = pd.to_datetime(df[DATE_COL])
+        keep = dates.notna()
+        if match["since"]:
+            keep &= dates > pd.Timestamp(match["since"])
+        df = df[keep].iloc[dates[keep].argsort(kind="stable")]
+        if (match["order"] or "ASC").upper() == "DESC":
+            df = df.iloc[::-1]
+        return pa.Table.from_pandas(df, preserve_index=False, schema=table.schema)
+
+    def _ctas_summary(self, name: str) -> pa.Table:
+        # RINGKASAN CTAS ALA DREMIO
+        with self._lock:
+            rows = self.tables[name].num_rows if name in self.tables else 0
+        return pa.table({"Fragment": ["0_0"], "Records": [rows], "Path": [name]})
+
+    def _create_table(self, name: str, file_name: str) -> None:
+        with self._lock:
+            if name in self.tables:
+                raise flight.FlightServerError(f"Table 'Minio.{name}' already exists")
+        obj = None
+        if self.s3 is not None:
+            obj = self.s3.store.objects.get((self.bucket, f"raw/{file_name}"))
+        if obj is None:
+            raise flight.FlightServerError(f"Object raw/{file_name} not found")
+
+        raw = pd.read_excel(io.BytesIO(obj["data"]), header=None, dtype=str)
+        columns = INGEST_COLUMNS + [STATION_COL]
+        raw = raw.iloc[:, : len(columns)]
+        raw.columns = columns[: raw.shape[1]]
+        df = pd.DataFrame(
+            {DATE_COL: pd.to_datetime(raw[DATE_COL], format="%Y-%m-%d", errors="coerce")}
+        )
+        for column in INGEST_COLUMNS[1:]:
+            df[column] = pd.to_numeric(raw.get(column), errors="coerce")
+        if STATION_COL in raw.columns:
+            df[STATION_COL] = raw[STATION_COL]
+        df = df[df[DATE_COL].notna()]
+        df[DATE_COL] = df[DATE_COL].dt.date
+
+        with self._lock:
+            self.tables[name] = pa.Table.from_pandas(df, preserve_index=False)
+
+    # =========================
+    # FLIGHT RPC
+    # =========================
+    def get_flight_info(self, context, descriptor):
+        query = descriptor.command.decode("utf-8")
+        table = self._execute(query)
+        # TICKET = QUERY, DIEKSEKUSI ULANG DI do_get (TIDAK ADA HASIL YANG DITAHAN)
+        if not (_SELECT.match(query) or _SELECT_WHERE.match(query)):
+            query = _CTAS_TICKET + table.column("Path")[0].as_py()
+        ticket = query.encode("utf-8")
+        return flight.FlightInfo(
+            table.schema,
+            descriptor,
+            [flight.FlightEndpoint(ticket, [])],
+            table.num_rows,
+            -1,
+        )
+
+    def do_get(self, context, ticket):
+        return flight.RecordBatchStream(self._execute(ticket.ticket.decode("utf-8")))
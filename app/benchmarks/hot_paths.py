@@ -0,0 +1,388 @@
+# benchmarks/hot_paths.py
+#
+# MICRO-BENCHMARK JALUR PANAS PREDIKSI DAN TRAINING, DENGAN DATA SINTETIS DAN MODEL
+# KECIL (build_model, bobot acak) SUPAYA BISA DIULANG DI MESIN MANA SAJA TANPA DREMIO.
+#
+#   cd app
+#   python -m benchmarks.hot_paths run --output /tmp/base.json
+#   ... ubah kode ...
+#   python -m benchmarks.hot_paths run --output /tmp/new.json --baseline /tmp/base.json
+#   python -m benchmarks.hot_paths compare /tmp/base.json /tmp/new.json --threshold 0.15
+#
+# Metrik yang diukur:
+#   synthetic / preprocess_data / make_sequences -> setiap --rows (1k sampai 10M)
+#   model_load.bundle / model_load.keras         -> load_saved_model
+#   rollout.1d / forecast.14d / forecast.90d     -> predict_future_pollutants
+#   forecast.batch                               -> --batch-size x predict_pollutants
+#   train.epoch                                  -> satu epoch model.fit, --train-rows baris
+#
+# compare keluar dengan kode 1 jika median suatu metrik naik lebih dari --threshold
+# (relatif) DAN lebih dari --min-delta-ms (absolut, supaya noise metrik kecil diabaikan).
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
+import keras
+import tensorflow as tf
+from sklearn.preprocessing import MinMaxScaler
+
+from predictions_model.bundle import write_inference_bundle
+from predictions_model.model import build_model, make_sequences, preprocess_data
+from predictions_model.predict import (
+    load_saved_model,
+    meteorology,
+    pollutants,
+    predict_future_pollutants,
+    predict_pollutants,
+)
+
+FEATURES = pollutants + meteorology
+TIME_STEP = 7
+
+# (RATA-RATA, AMPLITUDO MUSIMAN RELATIF, SKALA NOISE GAMMA)
+_POLLUTANT_PROFILE = {
+    "PM10": (55.0, 0.30, 12.0),
+    "SO2": (25.0, 0.20, 6.0),
+    "CO": (1800.0, 0.25, 400.0),
+    "O3": (60.0, 0.35, 15.0),
+    "NO2": (35.0, 0.25, 8.0),
+}
+
+
+# =========================
+# DATA DAN MODEL SINTETIS
+# =========================
+def _date_index(rows: int, start: str = "2000-01-01") -> pd.DatetimeIndex:
+    # datetime64[ns] BERHENTI DI TAHUN 2262: > ~90k HARI PINDAH KE PER JAM / PER MENIT
+    freq = "D" if rows <= 90_000 else "h" if rows <= 2_000_000 else "min"
+    return pd.date_range(start, periods=rows, freq=freq)
+
+
+def synthetic_dataset(rows: int, seed: int = 0, missing_rate: float = 0.01) -> pd.DataFrame:
+    """
+    DataFrame dengan skema data latih (Tanggal + 5 polutan + 5 meteorologi).
+    Polutan punya pola musiman + noise, dan sebagian kecil bernilai 0 (data hilang)
+    supaya preprocess_data benar-benar melakukan interpolasi.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(rows, dtype=np.float64)
+    season = np.sin(2 * np.pi * t / 365.25)
+
+    df = pd.DataFrame({"Tanggal": _date_index(rows)})
+    for name, (mean, amplitude, noise) in _POLLUTANT_PROFILE.items():
+        values = mean * (1.0 + amplitude * season) + rng.gamma(2.0, noise / 2.0, rows)
+        values -= noise
+        values = np.clip(values, 0.1, None).round(2)
+        values[rng.random(rows) < missing_rate] = 0.0
+        df[name] = values
+    df["Temperatur"] = (27.5 + 1.5 * season + rng.normal(0, 0.8, rows)).round(1)
+    df["Kelembapan"] = np.clip(78 - 8 * season + rng.normal(0, 5, rows), 40, 100).round(0)
+    df["Curah Hujan"] = np.where(
+        rng.random(rows) < 0.55, 0.0, rng.gamma(1.2, 9.0, rows)
+    ).round(1)
+    df["Penyinaran Matahari"] = np.clip(
+        5.5 + 2 * season + rng.normal(0, 2, rows), 0, 12
+    ).round(1)
+    df["Kecepatan Angin"] = np.clip(rng.gamma(3.0, 0.8, rows), 0, 15).round(1)
+    return df
+
+
+def future_meteorology(days: int, start: pd.Timestamp, seed: int = 0) -> pd.DataFrame:
+    met = synthetic_dataset(days, seed=seed + 1)[["Tanggal", *meteorology]]
+    met["Tanggal"] = pd.date_range(start, periods=days, freq="D")
+    return met
+
+
+def build_tiny_model_dir(
+    root: Path,
+    train_df: pd.DataFrame,
+    lstm_units: int = 16,
+    seed: int = 0,
+    backend: Optional[str] = None,
+) -> Dict[str, Path]:
+    """
+    Model kecil dengan bobot acak + scaler hasil fit data sintetis, disimpan dalam
+    dua format: folder .keras/joblib biasa dan folder bundle (format produksi).
+    """
+    import joblib
+
+    keras.utils.set_random_seed(seed)
+    df = preprocess_data(train_df)
+    scaler_X = MinMaxScaler().fit(df[FEATURES].values)
+    scaler_y = MinMaxScaler().fit(df[pollutants].values)
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = build_model(TIME_STEP, len(FEATURES), len(pollutants), lstm_units=lstm_units)
+
+    seed_window = df.set_index("Tanggal")[FEATURES].iloc[-TIME_STEP:]
+    metadata = {"time_step": TIME_STEP, "features": FEATURES, "targets": pollutants}
+    if backend:
+        metadata["inference"] = {"backend": backend}
+
+    dirs = {"keras": root / "keras", "bundle": root / "bundle"}
+    for path in dirs.values():
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "metadata.json").write_text(json.dumps(metadata))
+    model.save(dirs["keras"] / "bilstm_model.keras")
+    joblib.dump(scaler_X, dirs["keras"] / "scaler_X.joblib")
+    joblib.dump(scaler_y, dirs["keras"] / "scaler_y.joblib")
+    seed_window.to_csv(dirs["keras"] / "seed_window.csv", index=True)
+    write_inference_bundle(dirs["bundle"], model, scaler_X, scaler_y, seed_window, metadata)
+    return dirs
+
+
+# =========================
+# PENGUKURAN
+# =========================
+def _timeit(fn: Callable, repeat: int, warmup: int = 1) -> Dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "min_ms": min(samples),
+        "repeat": repeat,
+    }
+
+
+def _environment(args) -> Dict:
+    return {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "tensorflow": tf.__version__,
+        "keras": keras.__version__,
+        "args": {
+            k: v for k, v in vars(args).items() if k not in ("func", "output", "baseline")
+        },
+    }
+
+
+def run(args) -> Dict:
+    metrics: Dict[str, Dict] = {}
+
+    def record(name: str, fn: Callable, repeat: int, **extra) -> None:
+        metrics[name] = {**_timeit(fn, repeat), **extra}
+        print(f"  {name:<40}{metrics[name]['median_ms']:>12.3f} ms", file=sys.stderr)
+
+    # SKALA DATA
+    for rows in args.rows:
+        record(
+            f"synthetic.rows={rows}",
+            lambda: synthetic_dataset(rows, args.seed),
+            args.repeat,
+            rows=rows,
+        )
+        df = synthetic_dataset(rows, args.seed)
+        record(
+            f"preprocess_data.rows={rows}", lambda: preprocess_data(df), args.repeat, rows=rows
+        )
+        values = preprocess_data(df)[FEATURES].to_numpy()
+        record(
+            f"make_sequences.rows={rows}",
+            lambda: make_sequences(values, values[:, : len(pollutants)], TIME_STEP),
+            args.repeat,
+            rows=rows,
+        )
+        del df, values
+
+    train_df = synthetic_dataset(args.train_rows, args.seed)
+    heavy_repeat = max(1, min(args.repeat, 3))
+    with tempfile.TemporaryDirectory(prefix="bench-model-") as tmp:
+        dirs = build_tiny_model_dir(
+            Path(tmp), train_df, args.lstm_units, args.seed, args.backend
+        )
+
+        # LOAD MODEL
+        record("model_load.bundle", lambda: load_saved_model(dirs["bundle"]), args.repeat)
+        record("model_load.keras", lambda: load_saved_model(dirs["keras"]), heavy_repeat)
+
+        # ROLLOUT (RUNTIME SUDAH DI-CACHE SETELAH WARM-UP, SAMA DENGAN KONDISI SERVER)
+        history = train_df.iloc[-60:].reset_index(drop=True)
+        start = history["Tanggal"].iloc[-1] + pd.Timedelta(days=1)
+        for name, days in (("rollout.1d", 1), ("forecast.14d", 14), ("forecast.90d", 90)):
+            met = future_meteorology(days, start, args.seed)
+            record(
+                name,
+                lambda met=met: predict_future_pollutants(history, met, dirs["bundle"]),
+                args.repeat,
+                steps=days,
+            )
+
+        week1 = [
+            future_meteorology(7, start, args.seed + i) for i in range(args.batch_size)
+        ]
+
+        def batch():
+            for met in week1:
+                predict_pollutants(met, dirs["bundle"], history)
+
+        record("forecast.batch", batch, heavy_repeat, batch_size=args.batch_size)
+
+        # SATU EPOCH TRAINING (PARAMETER SAMA DENGAN train_model)
+        df = preprocess_data(train_df)
+        X = MinMaxScaler().fit_transform(df[FEATURES].values)
+        y = MinMaxScaler().fit_transform(df[pollutants].values)
+        Xs, ys = make_sequences(X, y, TIME_STEP)
+        keras.utils.set_random_seed(args.seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = build_model(
+                TIME_STEP, len(FEATURES), len(pollutants), lstm_units=args.lstm_units
+            )
+        record(
+            "train.epoch",
+            lambda: model.fit(
+                Xs,
+                ys,
+                epochs=1,
+                batch_size=64,
+                validation_split=0.2,
+                verbose=0,
+                shuffle=False,
+            ),
+            heavy_repeat,
+            rows=args.train_rows,
+        )
+
+    return {"environment": _environment(args), "metrics": metrics}
+
+
+def compare(
+    baseline: Dict, current: Dict, threshold: float, min_delta_ms: float
+) -> List[Dict]:
+    rows = []
+    for name, cur in current["metrics"].items():
+        base = baseline["metrics"].get(name)
+        if base is None:
+            rows.append({"metric": name, "current_ms": cur["median_ms"], "status": "new"})
+            continue
+        delta = cur["median_ms"] - base["median_ms"]
+        ratio = cur["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        if ratio > 1 + threshold and delta > min_delta_ms:
+            status = "REGRESSION"
+        elif ratio < 1 - threshold and -delta > min_delta_ms:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append(
+            {
+                "metric": name,
+                "baseline_ms": base["median_ms"],
+                "current_ms": cur["median_ms"],
+                "ratio": ratio,
+                "status": status,
+            }
+        )
+    for name in baseline["metrics"].keys() - current["metrics"].keys():
+        rows.append(
+            {
+                "metric": name,
+                "baseline_ms": baseline["metrics"][name]["median_ms"],
+                "status": "missing",
+            }
+        )
+    return rows
+
+
+def _print_comparison(rows: List[Dict]) -> None:
+    print(f"{'metric':<40}{'baseline ms':>14}{'current ms':>14}{'ratio':>9}  status")
+    for r in rows:
+        base = f"{r['baseline_ms']:.3f}" if "baseline_ms" in r else "-"
+        cur = f"{r['current_ms']:.3f}" if "current_ms" in r else "-"
+        ratio = f"{r['ratio']:.2f}x" if "ratio" in r else "-"
+        print(f"{r['metric']:<40}{base:>14}{cur:>14}{ratio:>9}  {r['status']}")
+
+
+def _load(path: str) -> Dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _cmd_run(args) -> int:
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(text)
+        print(f"Saved {len(report['metrics'])} metrics to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    if not args.baseline:
+        return 0
+    rows = compare(_load(args.baseline), report, args.threshold, args.min_delta_ms)
+    _print_comparison(rows)
+    return 1 if any(r["status"] == "REGRESSION" for r in rows) else 0
+
+
+def _cmd_compare(args) -> int:
+    rows = compare(
+        _load(args.baseline), _load(args.current), args.threshold, args.min_delta_ms
+    )
+    _print_comparison(rows)
+    return 1 if any(r["status"] == "REGRESSION" for r in rows) else 0
+
+
+def _add_threshold_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="regresi relatif, 0.10 = +10%%"
+    )
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark jalur panas prediksi dan training."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="jalankan benchmark dan simpan hasil JSON")
+    p_run.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[1_000, 100_000],
+        help="ukuran data untuk synthetic/preprocess/make_sequences (10M butuh ~10 GB RAM)",
+    )
+    p_run.add_argument("--train-rows", type=int, default=5_000)
+    p_run.add_argument("--batch-size", type=int, default=8)
+    p_run.add_argument("--lstm-units", type=int, default=16)
+    p_run.add_argument("--backend", help="backend inferensi, mis. direct / tf_function")
+    p_run.add_argument("--repeat", type=int, default=5)
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--output", help="file JSON hasil (default: stdout)")
+    p_run.add_argument("--baseline", help="bandingkan langsung dengan file JSON ini")
+    _add_threshold_args(p_run)
+    p_run.set_defaults(func=_cmd_run)
+
+    p_cmp = sub.add_parser("compare", help="bandingkan dua file hasil")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    _add_threshold_args(p_cmp)
+    p_cmp.set_defaults(func=_cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
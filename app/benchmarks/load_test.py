@@ -0,0 +1,480 @@
+# benchmarks/load_test.py
+#
+# LOAD TEST END-TO-END TANPA MINIO/DREMIO SUNGGUHAN. App FastAPI dijalankan di proses
+# yang sama (httpx ASGITransport, atau uvicorn di thread dengan --transport uvicorn),
+# bersama S3StandIn (pengganti MinIO) dan FlightStandIn (pengganti Dremio).
+#
+#   cd app
+#   python -m benchmarks.load_test --concurrency 8 --requests 400
+#   python -m benchmarks.load_test --mix predict=1,result=5 --concurrency 16 --duration 60
+#   # SUSTAINED: cari kebocoran memori (RSS dicatat berkala, tracemalloc opsional)
+#   python -m benchmarks.load_test --duration 900 --sample-seconds 10 --tracemalloc \
+#       --max-rss-growth-mb-per-min 2
+#   (--tracemalloc memperlambat semua request; latensinya jangan dibandingkan)
+#
+# Workload:
+#   predict        POST /model/predict, cuaca 7 hari (JSON)
+#   predict_batch  POST /model/predict, cuaca 7 hari + riwayat --history-days hari
+#                  (columnar JSON; tidak ada endpoint batch terpisah)
+#   result         GET  /model/predict/result
+#   upload         POST /model/upload, CSV --upload-rows baris -> S3 -> CTAS Flight
+#   storage        POST /upload/, file biner --storage-kb KiB
+#
+# Output: throughput dan p50/p95/p99 per workload; keluar dengan kode 1 jika error rate
+# atau pertumbuhan RSS melewati batas yang diberikan.
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from array import array
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from benchmarks.flight_standin import FlightStandIn
+from benchmarks.s3_standin import S3StandIn
+from benchmarks.wire_formats import synthetic_request
+
+WORKLOADS = ("predict", "predict_batch", "result", "upload", "storage")
+DEFAULT_MIX = "predict=4,predict_batch=1,result=10,upload=1,storage=2"
+COLUMNAR_JSON = "application/vnd.airquality.columnar+json"
+
+
+# =========================
+# LINGKUNGAN
+# =========================
+def start_backends(args, state_dir: str):
+    """Jalankan stand-in lalu arahkan env app ke sana (HARUS sebelum import main)."""
+    s3 = S3StandIn(
+        latency_ms=args.s3_latency_ms,
+        bandwidth_mbps=args.s3_bandwidth_mbps,
+        buckets=("storage", "datalake", "models"),
+    ).start()
+    flight_server = FlightStandIn(
+        s3=s3, bucket="datalake", latency_ms=args.flight_latency_ms
+    ).start()
+    os.environ.update(
+        {
+            "MINIO_ENDPOINT": s3.endpoint,
+            "MINIO_ACCESS_KEY": "loadtest",
+            "MINIO_SECRET_KEY": "loadtest",
+            "MINIO_DATALAKE_BUCKET": "datalake",
+            "MINIO_STORAGE_BUCKET": "storage",
+            "DREMIO_ENDPOINT": flight_server.endpoint,
+            "DREMIO_USERNAME": "loadtest",
+            "DREMIO_PASSWORD": "loadtest",
+            "MODEL_REGISTRY_ENABLED": "false",
+            # STATE YANG DITULIS APP MASUK KE FOLDER SEMENTARA, BUKAN KE REPO
+            "FORECAST_DB_PATH": os.path.join(state_dir, "forecast_history.sqlite3"),
+            "MODEL_CATALOG_PATH": os.path.join(state_dir, "model_catalog.sqlite3"),
+            "PROFILE_DIR": os.path.join(state_dir, "profiles"),
+            "STANDARD_FORECAST_PATH": os.path.join(state_dir, "standard_forecast.json"),
+            "SEED_WINDOW_PATH": os.path.join(state_dir, "seed_window_state.json"),
+        }
+    )
+    os.environ.setdefault("TRACING_EXPORTER", "none")
+    os.environ.setdefault("ADMIN_USER", "loadtest")
+    os.environ.setdefault("ADMIN_PASSWORD", "loadtest")
+    os.environ.setdefault("JWT_SECRET", uuid.uuid4().hex)
+    return s3, flight_server
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _AppClient:
+    """Context manager: app in-process + httpx.AsyncClient yang mengarah ke app."""
+
+    def __init__(self, transport: str):
+        self.transport = transport
+        self._lifespan = None
+        self._server = None
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        from main import app
+
+        if self.transport == "uvicorn":
+            import uvicorn
+
+            port = _free_port()
+            self._server = uvicorn.Server(
+                uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+            )
+            threading.Thread(target=self._server.run, daemon=True).start()
+            while not self._server.started:
+                await asyncio.sleep(0.05)
+            self.client = httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}",
+                timeout=None,
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+            )
+        else:
+            # ASGITransport TIDAK MENJALANKAN LIFESPAN, JADI DIPANGGIL MANUAL
+            self._lifespan = app.router.lifespan_context(app)
+            await self._lifespan.__aenter__()
+            self.client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://loadtest",
+                timeout=None,
+            )
+        return self.client
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+        if self._lifespan is not None:
+            await self._lifespan.__aexit__(*exc)
+        if self._server is not None:
+            self._server.should_exit = True
+
+
+# =========================
+# WORKLOAD
+# =========================
+class Workloads:
+    def __init__(self, args, s3: S3StandIn, flight_server: FlightStandIn):
+        self.s3 = s3
+        self.flight = flight_server
+        self.headers: Dict[str, str] = {}
+
+        week1 = synthetic_request(args.history_days, seed=args.seed)
+        columns = {
+            **week1["week1"].to_dict(orient="list"),
+            "history": week1["history"].to_dict(orient="list"),
+        }
+        self.predict_body = json.dumps(
+            {k: v for k, v in columns.items() if k != "history"}
+        ).encode("utf-8")
+        self.predict_batch_body = json.dumps(columns).encode("utf-8")
+
+        # IMPORT DI SINI: hot_paths MEMUAT MODUL APP YANG MEMBACA ENV SAAT IMPORT
+        from benchmarks.hot_paths import synthetic_dataset
+
+        csv = synthetic_dataset(args.upload_rows, seed=args.seed)
+        self.upload_csv = csv.to_csv(index=False, date_format="%Y-%m-%d").encode("utf-8")
+        self.storage_blob = os.urandom(int(args.storage_kb * 1024))
+
+    async def login(self, client: httpx.AsyncClient) -> None:
+        response = await client.post(
+            "/auth/login",
+            data={
+                "username": os.environ["ADMIN_USER"],
+                "password": os.environ["ADMIN_PASSWORD"],
+            },
+        )
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def predict(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post(
+            "/model/predict",
+            content=self.predict_body,
+            headers={"Content-Type": "application/json"},
+        )
+
+    async def predict_batch(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post(
+            "/model/predict",
+            content=self.predict_batch_body,
+            headers={"Content-Type": COLUMNAR_JSON, "Accept": COLUMNAR_JSON},
+        )
+
+    async def result(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/model/predict/result")
+
+    async def upload(self, client: httpx.AsyncClient) -> httpx.Response:
+        base_name = f"loadtest_{uuid.uuid4().hex[:12]}"
+        try:
+            return await client.post(
+                "/model/upload",
+                files={"file": (f"{base_name}.csv", self.upload_csv, "text/csv")},
+                headers=self.headers,
+            )
+        finally:
+            # DATA STAND-IN DIBUANG SUPAYA TIDAK TERHITUNG SEBAGAI PERTUMBUHAN MEMORI APP
+            self.flight.drop_table(base_name)
+            self._drop_object("datalake", f"raw/{base_name}.xlsx")
+
+    async def storage(self, client: httpx.AsyncClient) -> httpx.Response:
+        name = f"loadtest_{uuid.uuid4().hex[:12]}.bin"
+        try:
+            return await client.post(
+                "/upload/",
+                files={"file": (name, self.storage_blob, "application/octet-stream")},
+                headers=self.headers,
+            )
+        finally:
+            self._drop_object("storage", name)
+
+    def _drop_object(self, bucket: str, key: str) -> None:
+        with self.s3.store.lock:
+            self.s3.store.objects.pop((bucket, key), None)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in WORKLOADS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown workload '{name}' (pilihan: {WORKLOADS})"
+            )
+        mix[name] = float(weight or 1)
+    if not any(w > 0 for w in mix.values()):
+        raise argparse.ArgumentTypeError("Mix needs at least one workload with weight > 0")
+    return mix
+
+
+# =========================
+# DRIVER
+# =========================
+class _Stats:
+    def __init__(self):
+        self.latencies: Dict[str, array] = {}
+        self.status: Dict[str, Counter] = {}
+        self.errors: Dict[str, Counter] = {}
+
+    def record(
+        self, name: str, seconds: float, status: Optional[int], error: str = ""
+    ) -> None:
+        self.latencies.setdefault(name, array("d")).append(seconds * 1000.0)
+        self.status.setdefault(name, Counter())[str(status or "exception")] += 1
+        if error:
+            self.errors.setdefault(name, Counter())[error[:200]] += 1
+
+
+async def _call(stats: _Stats, name: str, fn: Callable[[], Awaitable[httpx.Response]]):
+    t0 = time.perf_counter()
+    try:
+        response = await fn()
+    except Exception as e:
+        stats.record(name, time.perf_counter() - t0, None, f"{type(e).__name__}: {e}")
+        return
+    error = "" if response.status_code < 400 else response.text
+    stats.record(name, time.perf_counter() - t0, response.status_code, error)
+
+
+async def _sample_memory(samples: List, interval: float, t_start: float, stop: asyncio.Event):
+    from utils.metrics import process_rss_bytes
+
+    while True:
+        gc.collect()
+        samples.append((time.perf_counter() - t_start, process_rss_bytes() / 2**20))
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+
+def _percentiles(values: array) -> Dict[str, float]:
+    data = np.frombuffer(values, dtype=np.float64)
+    p50, p95, p99 = np.percentile(data, [50, 95, 99])
+    return {
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "mean_ms": float(data.mean()),
+        "max_ms": float(data.max()),
+    }
+
+
+def _growth_per_minute(samples: List) -> Optional[float]:
+    # SAMPEL AWAL (PEMANASAN CACHE/ALLOCATOR) TIDAK IKUT DIHITUNG
+    steady = samples[len(samples) // 5 :]
+    if len(steady) < 3:
+        return None
+    t, rss = np.array(steady).T
+    slope, _ = np.polyfit(t, rss, 1)
+    return float(slope * 60.0)
+
+
+async def run(args) -> Dict:
+    mix = args.mix
+    names, weights = list(mix), [mix[n] for n in mix]
+
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as state_dir:
+        s3, flight_server = start_backends(args, state_dir)
+        try:
+            workloads = Workloads(args, s3, flight_server)
+            async with _AppClient(args.transport) as client:
+                await workloads.login(client)
+
+                # PEMANASAN: MUAT MODEL, CACHE RESPONSE, KONEKSI (TIDAK DIUKUR)
+                warm = _Stats()
+                for name in names:
+                    for _ in range(args.warmup):
+                        await _call(warm, name, lambda n=name: getattr(workloads, n)(client))
+                failed = {n: c for n, c in warm.errors.items() if c}
+                if failed:
+                    raise RuntimeError(f"Warm-up failed: {json.dumps(failed)[:1000]}")
+
+                if args.tracemalloc:
+                    tracemalloc.start(10)
+                    baseline_snapshot = tracemalloc.take_snapshot()
+
+                stats = _Stats()
+                samples: List = []
+                stop = asyncio.Event()
+                issued = 0
+                t_start = time.perf_counter()
+                deadline = t_start + args.duration if args.duration else None
+                sampler = asyncio.ensure_future(
+                    _sample_memory(samples, args.sample_seconds, t_start, stop)
+                )
+
+                async def worker(worker_id: int) -> None:
+                    nonlocal issued
+                    rng = random.Random(args.seed * 1000 + worker_id)
+                    while True:
+                        if deadline is not None and time.perf_counter() >= deadline:
+                            return
+                        if deadline is None:
+                            if issued >= args.requests:
+                                return
+                            issued += 1
+                        name = rng.choices(names, weights)[0]
+                        await _call(stats, name, lambda: getattr(workloads, name)(client))
+
+                await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+                wall = time.perf_counter() - t_start
+                stop.set()
+                await sampler
+
+                top_growth = []
+                if args.tracemalloc:
+                    diff = tracemalloc.take_snapshot().compare_to(baseline_snapshot, "lineno")
+                    top_growth = [
+                        {"where": str(d.traceback), "size_diff_kb": d.size_diff / 1024}
+                        for d in diff[:10]
+                    ]
+                    tracemalloc.stop()
+        finally:
+            flight_server.stop()
+            s3.stop()
+
+    endpoints = {}
+    for name in names:
+        if name not in stats.latencies:
+            continue
+        count = len(stats.latencies[name])
+        errors = sum(stats.errors.get(name, Counter()).values())
+        endpoints[name] = {
+            "requests": count,
+            "errors": errors,
+            "rps": count / wall,
+            **_percentiles(stats.latencies[name]),
+            "status": dict(stats.status[name]),
+            "top_errors": stats.errors.get(name, Counter()).most_common(3),
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    total_errors = sum(e["errors"] for e in endpoints.values())
+    return {
+        "config": {
+            k: v for k, v in vars(args).items() if k not in ("output", "func")
+        },
+        "wall_seconds": wall,
+        "total": {
+            "requests": total,
+            "errors": total_errors,
+            "error_rate": total_errors / total if total else 0.0,
+            "rps": total / wall,
+        },
+        "endpoints": endpoints,
+        "memory": {
+            "samples": samples,
+            "rss_start_mb": samples[0][1] if samples else None,
+            "rss_end_mb": samples[-1][1] if samples else None,
+            "growth_mb_per_min": _growth_per_minute(samples),
+            "top_growth": top_growth,
+        },
+    }
+
+
+def _print_report(report: Dict) -> None:
+    total = report["total"]
+    print(
+        f"{total['requests']} requests in {report['wall_seconds']:.1f}s "
+        f"({total['rps']:.1f} req/s), errors {total['errors']} ({total['error_rate']:.1%})"
+    )
+    print(
+        f"{'workload':<16}{'requests':>10}{'errors':>8}{'req/s':>9}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    )
+    for name, e in report["endpoints"].items():
+        print(
+            f"{name:<16}{e['requests']:>10}{e['errors']:>8}{e['rps']:>9.1f}"
+            f"{e['p50_ms']:>10.1f}{e['p95_ms']:>10.1f}{e['p99_ms']:>10.1f}{e['max_ms']:>10.1f}"
+        )
+        for message, count in e["top_errors"]:
+            print(f"    {count}x {message}")
+    memory = report["memory"]
+    if memory["rss_start_mb"] is not None:
+        growth = memory["growth_mb_per_min"]
+        print(
+            f"RSS {memory['rss_start_mb']:.0f} -> {memory['rss_end_mb']:.0f} MiB"
+            + (f", trend {growth:+.2f} MiB/min" if growth is not None else "")
+        )
+    for item in memory["top_growth"]:
+        print(f"    {item['size_diff_kb']:+10.1f} KiB  {item['where']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test API dengan stand-in MinIO/Dremio.")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--duration", type=float, help="detik; mengganti --requests")
+    parser.add_argument("--warmup", type=int, default=2, help="request per workload")
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--history-days", type=int, default=365)
+    parser.add_argument("--upload-rows", type=int, default=365)
+    parser.add_argument("--storage-kb", type=float, default=256)
+    parser.add_argument("--s3-latency-ms", type=float, default=2)
+    parser.add_argument("--s3-bandwidth-mbps", type=float)
+    parser.add_argument("--flight-latency-ms", type=float, default=5)
+    parser.add_argument("--sample-seconds", type=float, default=5)
+    parser.add_argument("--tracemalloc", action="store_true")
+    parser.add_argument("--max-error-rate", type=float)
+    parser.add_argument("--max-rss-growth-mb-per-min", type=float)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="simpan laporan JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+    failed = False
+    if args.max_error_rate is not None and report["total"]["error_rate"] > args.max_error_rate:
+        print(f"FAIL: error rate above {args.max_error_rate:.1%}")
+        failed = True
+    growth = report["memory"]["growth_mb_per_min"]
+    if args.max_rss_growth_mb_per_min is not None and growth is not None:
+        if growth > args.max_rss_growth_mb_per_min:
+            print(
+                f"FAIL: RSS grows {growth:.2f} MiB/min "
+                f"(limit {args.max_rss_growth_mb_per_min})"
+            )
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+# benchmarks/s3_standin.py
+#
+# SERVER S3 MINIMAL DI MEMORI (PENGGANTI MINIO UNTUK BENCHMARK/LOAD TEST)
+# Mendukung API yang dipakai app: list/lokasi/buat bucket, put/get/head/delete
+# object, dan multipart (create, upload part, list parts, complete, abort).
+# Autentikasi tidak dicek. latency_ms dan bandwidth_mbps mensimulasikan jaringan
+# per request supaya efek upload paralel terlihat di mesin lokal.
+#
+#   stand_in = S3StandIn(latency_ms=20, bandwidth_mbps=200).start()
+#   client = Minio(stand_in.endpoint, "x", "y", secure=False)
+#   ...
+#   stand_in.stop()
+import base64
+import hashlib
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+_NS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+def _xml(root: str, body: str) -> bytes:
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<{root} xmlns="{_NS}">{body}</{root}>'
+    ).encode("utf-8")
+
+
+class _Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: Dict[str, float] = {}
+        self.objects: Dict[Tuple[str, str], Dict] = {}
+        self.uploads: Dict[str, Dict] = {}
+
+
+class S3StandIn:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        bandwidth_mbps: Optional[float] = None,
+        buckets: Tuple[str, ...] = ("storage", "datalake", "models"),
+    ):
+        self.latency = latency_ms / 1000.0
+        self.bandwidth = bandwidth_mbps * 1e6 / 8 if bandwidth_mbps else None
+        self.store = _Store()
+        for name in buckets:
+            self.store.buckets[name] = time.time()
+        self.requests = 0
+        handler = type("Handler", (_Handler,), {"standin": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> "S3StandIn":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def simulate_network(self, n_bytes: int) -> None:
+        delay = self.latency + (n_bytes / self.bandwidth if self.bandwidth else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    standin: S3StandIn
+
+    def log_message(self, *args):
+        pass
+
+    # =========================
+    # UTIL
+    # =========================
+    def _send(self, status: int, body: bytes = b"", headers: Optional[Dict] = None):
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _error(self, status: int, code: str, message: str):
+        resource = self.path.split("?")[0]
+        body = _xml(
+            "Error",
+            f"<Code>{code}</Code><Message>{message}</Message><Resource>{resource}</Resource>"
+            f"<RequestId>{uuid.uuid4().hex}</RequestId>",
+        )
+        self._send(status, body, {"Content-Type": "application/xml"})
+
+    def _parse(self):
+        url = urlsplit(self.path)
+        parts = unquote(url.path).lstrip("/").split("/", 1)
+        bucket = parts[0] or None
+        key = parts[1] if len(parts) > 1 and parts[1] else None
+        query = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        return bucket, key, query
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self):
+        s = self.standin
+        with s.store.lock:
+            s.requests += 1
+        bucket, key, query = self._parse()
+        body = self._body() if self.command in ("PUT", "POST") else b""
+        s.simulate_network(len(body))
+        handler = getattr(self, f"_{self.command.lower()}_{'object' if key else 'bucket'}")
+        handler(bucket, key, query, body)
+
+    do_GET = do_PUT = do_POST = do_DELETE = do_HEAD = _dispatch
+
+    # =========================
+    # BUCKET
+    # =========================
+    def _get_bucket(self, bucket, key, query, body):
+        store = self.standin.store
+        if bucket is None:
+            items = "".join(
+                f"<Bucket><Name>{name}</Name><CreationDate>"
+                f"{time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(created))}"
+                f"</CreationDate></Bucket>"
+                for name, created in sorted(store.buckets.items())
+            )
+            return self._send(
+                200,
+                _xml("ListAllMyBucketsResult", f"<Buckets>{items}</Buckets>"),
+                {"Content-Type": "application/xml"},
+            )
+        if bucket not in store.buckets:
+            return self._error(404, "NoSuchBucket", "The specified bucket does not exist")
+        if "location" in query:
+            return self._send(
+                200, _xml("LocationConstraint", ""), {"Content-Type": "application/xml"}
+            )
+        return self._error(501, "NotImplemented", "Only ?location is supported")
+
+    def _head_bucket(self, bucket, key, query, body):
+        self._send(200 if bucket in self.standin.store.buckets else 404)
+
+    def _put_bucket(self, bucket, key, query, body):
+        with self.standin.store.lock:
+            self.standin.store.buckets.setdefault(bucket, time.time())
+        self._send(200, headers={"Location": f"/{bucket}"})
+
+    # =========================
+    # OBJECT
+    # =========================
+    def _check_md5(self, body: bytes) -> bool:
+        expected = self.headers.get("Content-MD5")
+        if expected is None:
+            return True
+        return base64.b64encode(hashlib.md5(body).digest()).decode("ascii") == expected
+
+    def _put_object(self, bucket, key, query, body):
+        store = self.standin.store
+        if bucket not in store.buckets:
+            return self._error(404, "NoSuchBucket", "The specified bucket does not exist")
+        if not self._check_md5(body):
+            return self._error(400, "BadDigest", "The Content-MD5 you specified did not match")
+        etag = hashlib.md5(body).hexdigest()
+        if "uploadId" in query:
+            with store.lock:
+                upload = store.uploads.get(query["uploadId"])
+                if upload is None:
+                    return self._error(404, "NoSuchUpload", "The upload does not exist")
+                upload["parts"][int(query["partNumber"])] = (body, etag, time.time())
+            return self._send(200, headers={"ETag": f'"{etag}"'})
+        with store.lock:
+            store.objects[(bucket, key)] = {
+                "data": body,
+                "etag": etag,
+                "content_type": self.headers.get("Content-Type", "application/octet-stream"),
+                "modified": time.time(),
+            }
+        self._send(200, headers={"ETag": f'"{etag}"'})
+
+    def _post_object(self, bucket, key, query, body):
+        store = self.standin.store
+        if "uploads" in query:
+            upload_id = uuid.uuid4().hex
+            with store.lock:
+                store.uploads[upload_id] = {
+                    "bucket": bucket,
+                    "key": key,
+                    "parts": {},
+                    "content_type": self.headers.get("Content-Type", "application/octet-stream"),
+                }
+            return self._send(
+                200,
+                _xml(
+                    "InitiateMultipartUploadResult",
+                    f"<Bucket>{bucket}</Bucket><Key>{key}</Key><UploadId>{upload_id}</UploadId>",
+                ),
+                {"Content-Type": "application/xml"},
+            )
+        if "uploadId" in query:
+            root = ET.fromstring(body)
+            wanted = [
+                (
+                    int(p.findtext(f"{{{_NS}}}PartNumber") or p.findtext("PartNumber")),
+                    (p.findtext(f"{{{_NS}}}ETag") or p.findtext("ETag")).strip('"'),
+                )
+                for p in root
+            ]
+            with store.lock:
+                upload = store.uploads.get(query["uploadId"])
+                if upload is None:
+                    return self._error(404, "NoSuchUpload", "The upload does not exist")
+                chunks, md5s = [], []
+                for number, etag in wanted:
+                    part = upload["parts"].get(number)
+                    if part is None or part[1] != etag:
+                        return self._error(400, "InvalidPart", f"Part {number} is missing")
+                    chunks.append(part[0])
+                    md5s.append(bytes.fromhex(part[1]))
+                etag = f"{hashlib.md5(b''.join(md5s)).hexdigest()}-{len(md5s)}"
+                store.objects[(bucket, key)] = {
+                    "data": b"".join(chunks),
+                    "etag": etag,
+                    "content_type": upload["content_type"],
+                    "modified": time.time(),
+                }
+                del store.uploads[query["uploadId"]]
+            return self._send(
+                200,
+                _xml(
+                    "CompleteMultipartUploadResult",
+                    f"<Location>/{bucket}/{key}</Location><Bucket>{bucket}</Bucket>"
+                    f"<Key>{key}</Key><ETag>&quot;{etag}&quot;</ETag>",
+                ),
+                {"Content-Type": "application/xml"},
+            )
+        self._error(501, "NotImplemented", "Unsupported POST")
+
+    def _get_object(self, bucket, key, query, body):
+        store = self.standin.store
+        if "uploadId" in query:
+            with store.lock:
+                upload = store.uploads.get(query["uploadId"])
+                parts = sorted(upload["parts"].items()) if upload else None
+            if parts is None:
+                return self._error(404, "NoSuchUpload", "The upload does not exist")
+            items = "".join(
+                f"<Part><PartNumber>{n}</PartNumber><ETag>&quot;{etag}&quot;</ETag>"
+                f"<Size>{len(data)}</Size><LastModified>"
+                f"{time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(modified))}"
+                f"</LastModified></Part>"
+                for n, (data, etag, modified) in parts
+            )
+            return self._send(
+                200,
+                _xml(
+                    "ListPartsResult",
+                    f"<Bucket>{bucket}</Bucket><Key>{key}</Key>"
+                    f"<UploadId>{query['uploadId']}</UploadId><IsTruncated>false</IsTruncated>"
+                    f"{items}",
+                ),
+                {"Content-Type": "application/xml"},
+            )
+        obj = store.objects.get((bucket, key))
+        if obj is None:
+            return self._error(404, "NoSuchKey", "The specified key does not exist.")
+        self.standin.simulate_network(len(obj["data"]))
+        self._send(200, obj["data"], self._object_headers(obj))
+
+    def _head_object(self, bucket, key, query, body):
+        obj = self.standin.store.objects.get((bucket, key))
+        if obj is None:
+            return self._send(404)
+        self.send_response(200)
+        for k, v in self._object_headers(obj).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(obj["data"])))
+        self.end_headers()
+
+    def _delete_object(self, bucket, key, query, body):
+        store = self.standin.store
+        with store.lock:
+            if "uploadId" in query:
+                store.uploads.pop(query["uploadId"], None)
+            else:
+                store.objects.pop((bucket, key), None)
+        self._send(204)
+
+    @staticmethod
+    def _object_headers(obj: Dict) -> Dict[str, str]:
+        return {
+            "ETag": f'"{obj["etag"]}"',
+            "Content-Type": obj["content_type"],
+            "Last-Modified": formatdate(obj["modified"], usegmt=True),
+        }
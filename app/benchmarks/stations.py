@@ -0,0 +1,177 @@
+# benchmarks/stations.py
+#
+# SKALA INFERENSI MULTI-STASIUN: FORECAST 14 HARI SEMUA STASIUN DALAM SATU ROLLOUT BATCH
+# (predict_stations, satu forward pass per hari) vs SATU ROLLOUT PER STASIUN.
+# Model kecil bobot acak (build_model, input fitur + one-hot stasiun) dan data sintetis
+# per stasiun, jadi bisa diulang tanpa Dremio.
+#
+#   cd app
+#   python -m benchmarks.stations --stations 1 10 50 100 200 --loop-max 50
+#   python -m benchmarks.stations --backend direct --output /tmp/stations.json
+#
+# Output per jumlah stasiun S:
+#   batched_ms        predict_stations(semua stasiun), 14 forward pass dengan batch S
+#   per_station_ms    predict_stations(stations=[s]) untuk setiap s (S x 14 forward pass),
+#                     hanya untuk S <= --loop-max (selebihnya terlalu lama)
+#   ms_per_station    batched_ms / S
+#
+# Hasil acuan (1 vCPU, TF 2.x CPU, lstm_units=16, --repeat 3, median ms):
+#               keras_predict (default)          direct
+#      S    batched  per_station  ms/stn   batched  per_station  ms/stn
+#      1        943          986   943.0       707          733   707.0
+#     10        989         9157    98.9       685         5532    68.5
+#     50       1096        53574    21.9       844        31269    16.9
+#    100       1668            -    16.7       696            -     7.0
+#    200       1859            -     9.3       700            -     3.5
+# Rollout batch hampir tetap sampai ratusan stasiun (didominasi overhead 14 panggilan
+# model, bukan ukuran batch), sedangkan rollout per stasiun naik linear dengan S
+# (~49x lebih lambat di S=50). Ukur ulang di mesin target sebelum dipakai untuk sizing.
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from benchmarks.hot_paths import TIME_STEP, future_meteorology, synthetic_dataset
+from predictions_model.model import build_model, preprocess_data
+from predictions_model.predict import meteorology, pollutants, predict_stations
+from predictions_model.stations import (
+    STATION_COL,
+    STATION_SCALERS_FILENAME,
+    STATION_SEEDS_FILENAME,
+    StationScaler,
+    save_station_scalers,
+)
+
+FEATURES = pollutants + meteorology
+
+
+def build_station_model_dir(
+    root: Path,
+    n_stations: int,
+    rows: int = 120,
+    lstm_units: int = 16,
+    seed: int = 0,
+    backend: str | None = None,
+) -> List[str]:
+    """Folder model multi-stasiun (format sama dengan _train_station_model); return stasiun."""
+    import keras
+
+    keras.utils.set_random_seed(seed)
+    stations = [f"ST{i:03d}" for i in range(n_stations)]
+    frames = [
+        preprocess_data(synthetic_dataset(rows, seed=seed + i)) for i in range(n_stations)
+    ]
+    scaler_X = StationScaler.fit([f[FEATURES].to_numpy() for f in frames])
+    scaler_y = StationScaler.fit([f[pollutants].to_numpy() for f in frames])
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = build_model(
+            TIME_STEP, len(FEATURES) + n_stations, len(pollutants), lstm_units=lstm_units
+        )
+
+    seeds = pd.concat(
+        f.set_index("Tanggal")[FEATURES].iloc[-TIME_STEP:].assign(**{STATION_COL: name})
+        for name, f in zip(stations, frames)
+    )
+    metadata = {
+        "time_step": TIME_STEP,
+        "features": FEATURES,
+        "targets": pollutants,
+        "stations": stations,
+        "station_encoding": "one_hot",
+        "n_inputs": len(FEATURES) + n_stations,
+    }
+    if backend:
+        metadata["inference"] = {"backend": backend}
+
+    root.mkdir(parents=True, exist_ok=True)
+    model.save(root / "bilstm_model.keras")
+    save_station_scalers(root / STATION_SCALERS_FILENAME, scaler_X, scaler_y)
+    seeds[[STATION_COL, *FEATURES]].to_csv(root / STATION_SEEDS_FILENAME, index=True)
+    (root / "metadata.json").write_text(json.dumps(metadata))
+    return stations
+
+
+def _median_ms(fn: Callable, repeat: int) -> float:
+    fn()  # WARM-UP (LOAD MODEL + TRACE)
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def run(args) -> Dict:
+    results = []
+    for n_stations in args.stations:
+        with tempfile.TemporaryDirectory(prefix="bench-stations-") as tmp:
+            model_dir = Path(tmp) / "model"
+            stations = build_station_model_dir(
+                model_dir,
+                n_stations,
+                lstm_units=args.lstm_units,
+                seed=args.seed,
+                backend=args.backend,
+            )
+            start = pd.Timestamp("2000-01-01") + pd.Timedelta(days=120)
+            met = future_meteorology(7, start, args.seed)
+
+            row = {"stations": n_stations}
+            row["batched_ms"] = _median_ms(
+                lambda: predict_stations(met, model_dir), args.repeat
+            )
+            row["ms_per_station"] = row["batched_ms"] / n_stations
+            if n_stations <= args.loop_max:
+
+                def loop():
+                    for name in stations:
+                        predict_stations(met, model_dir, stations=[name])
+
+                row["per_station_ms"] = _median_ms(loop, max(1, min(args.repeat, 3)))
+                row["speedup"] = row["per_station_ms"] / row["batched_ms"]
+            results.append(row)
+            print(
+                f"  S={n_stations:<5} batched={row['batched_ms']:>9.1f} ms"
+                f"  per_station={row.get('per_station_ms', float('nan')):>10.1f} ms"
+                f"  ms/station={row['ms_per_station']:>8.2f}",
+                file=sys.stderr,
+            )
+    return {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "args": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark rollout batch multi-stasiun vs rollout per stasiun."
+    )
+    parser.add_argument("--stations", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--loop-max", type=int, default=50)
+    parser.add_argument("--lstm-units", type=int, default=16)
+    parser.add_argument("--backend", help="backend inferensi, mis. direct / tf_function")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file JSON hasil (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# benchmarks/upload_throughput.py
+#
+# THROUGHPUT UPLOAD (MB/s): CARA LAMA (put_object length=-1 DI EVENT LOOP) vs
+# put_parallel DENGAN BERBAGAI CONCURRENCY. Default memakai S3StandIn lokal dengan
+# latensi/bandwidth simulasi; --endpoint untuk MinIO sungguhan.
+#
+#   cd app
+#   python -m benchmarks.upload_throughput --size-mb 128 --concurrency 1 2 4 8
+#   python -m benchmarks.upload_throughput --endpoint localhost:9000 --bucket storage \
+#       --access-key admin --secret-key admin1234
+#
+# Kolom "loop_block_ms" = jeda terlama event loop selama upload (detak 10 ms),
+# menunjukkan berapa lama request lain tertahan.
+import argparse
+import asyncio
+import io
+import json
+import os
+import time
+from typing import Dict, List
+
+from minio import Minio
+
+from benchmarks.s3_standin import S3StandIn
+from utils.uploads import put_parallel
+
+TICK = 0.01
+
+
+async def _watch_loop(stop: asyncio.Event, worst: List[float]) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(TICK)
+        worst[0] = max(worst[0], time.perf_counter() - t0 - TICK)
+
+
+async def _measure(label: str, upload, size: int) -> Dict:
+    stop, worst = asyncio.Event(), [0.0]
+    watcher = asyncio.ensure_future(_watch_loop(stop, worst))
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    await upload()
+    seconds = time.perf_counter() - t0
+    stop.set()
+    await watcher
+    return {
+        "mode": label,
+        "seconds": seconds,
+        "mb_per_s": size / 1e6 / seconds,
+        "loop_block_ms": worst[0] * 1000.0,
+    }
+
+
+async def run(args) -> List[Dict]:
+    stand_in = None
+    if args.endpoint:
+        client = Minio(
+            args.endpoint, args.access_key, args.secret_key, secure=args.secure
+        )
+    else:
+        stand_in = S3StandIn(
+            latency_ms=args.latency_ms, bandwidth_mbps=args.bandwidth_mbps
+        ).start()
+        client = Minio(stand_in.endpoint, "bench", "bench", secure=False)
+
+    size = int(args.size_mb * 1024 * 1024)
+    payload = os.urandom(size)
+    part_size = int(args.part_mb * 1024 * 1024)
+    results = []
+    try:
+
+        async def legacy():
+            # SAMA DENGAN HANDLER LAMA: SINKRON DI DALAM async def
+            client.put_object(
+                args.bucket,
+                "bench/legacy.bin",
+                io.BytesIO(payload),
+                length=-1,
+                part_size=10 * 1024 * 1024,
+            )
+
+        # minio-py SUDAH MEMAKAI 3 THREAD PART, TAPI MEMBLOKIR EVENT LOOP SELAMA TRANSFER
+        results.append(await _measure("legacy put_object (3 threads)", legacy, size))
+        for concurrency in args.concurrency:
+
+            async def parallel(c=concurrency):
+                await put_parallel(
+                    client,
+                    args.bucket,
+                    f"bench/parallel-{c}.bin",
+                    io.BytesIO(payload),
+                    part_size=part_size,
+                    concurrency=c,
+                )
+
+            results.append(
+                await _measure(f"put_parallel concurrency={concurrency}", parallel, size)
+            )
+    finally:
+        if stand_in is not None:
+            stand_in.stop()
+    return results
+
+
+def main(argv=None) -> List[Dict]:
+    parser = argparse.ArgumentParser(description="Benchmark throughput upload ke MinIO/S3.")
+    parser.add_argument("--size-mb", type=float, default=64)
+    parser.add_argument("--part-mb", type=float, default=8)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latency-ms", type=float, default=20, help="stand-in saja")
+    parser.add_argument(
+        "--bandwidth-mbps", type=float, default=400, help="stand-in saja, per koneksi"
+    )
+    parser.add_argument("--endpoint", help="MinIO sungguhan, mis. localhost:9000")
+    parser.add_argument("--access-key", default=os.getenv("MINIO_ACCESS_KEY", ""))
+    parser.add_argument("--secret-key", default=os.getenv("MINIO_SECRET_KEY", ""))
+    parser.add_argument("--secure", action="store_true")
+    parser.add_argument("--bucket", default="storage")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return results
+    target = args.endpoint or (
+        f"S3StandIn (latency {args.latency_ms} ms, {args.bandwidth_mbps} Mbps/connection)"
+    )
+    print(f"{args.size_mb} MB to {target}, part {args.part_mb} MB")
+    print(f"{'mode':<36}{'seconds':>10}{'MB/s':>10}{'loop_block_ms':>15}")
+    for r in results:
+        print(
+            f"{r['mode']:<36}{r['seconds']:>10.2f}{r['mb_per_s']:>10.1f}"
+            f"{r['loop_block_ms']:>15.1f}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# benchmarks/wire_formats.py
+#
+# BANDINGKAN UKURAN PAYLOAD DAN WAKTU ENCODE/DECODE FORMAT ENDPOINT PREDIKSI
+# (JSON lama vs columnar JSON vs Arrow IPC) tanpa memuat model.
+#
+#   cd app
+#   python -m benchmarks.wire_formats --rows 365 3650 36500 --repeat 20
+#
+# request  : history sepanjang N hari, sisi server = parse body -> DataFrame
+# response : N baris prediksi, sisi server = DataFrame -> bytes, sisi klien = bytes -> objek
+import argparse
+import json
+import statistics
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from utils import wire_formats
+from utils.user_input_utils import (
+    PredictRequest,
+    _history_from_columns,
+    _history_to_dataframe,
+    _week1_from_columns,
+)
+
+POLLUTANTS = ["PM10", "SO2", "CO", "O3", "NO2"]
+METEOROLOGY = [
+    "temperatur",
+    "kelembapan",
+    "curah_hujan",
+    "penyinaran_matahari",
+    "kecepatan_angin",
+]
+
+
+def _timeit(fn: Callable, repeat: int) -> float:
+    """Median milidetik dari `repeat` kali pemanggilan."""
+    fn()  # WARM-UP
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def synthetic_request(rows: int, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2010-01-01", periods=rows + 7, freq="D")
+    history = pd.DataFrame({"tanggal": dates[:rows].strftime("%Y-%m-%d")})
+    for name in METEOROLOGY + POLLUTANTS:
+        history[name] = rng.gamma(2.0, 20.0, rows).round(2)
+    week1 = pd.DataFrame({"tanggal": dates[rows:].strftime("%Y-%m-%d")})
+    for name in METEOROLOGY:
+        week1[name] = rng.gamma(2.0, 10.0, 7).round(2)
+    return {"week1": week1, "history": history}
+
+
+def synthetic_predictions(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"Tanggal": pd.date_range("2025-01-01", periods=rows, freq="D")})
+    for name in POLLUTANTS:
+        df[name] = rng.gamma(2.0, 20.0, rows).astype("float32")
+    return df
+
+
+def bench_request(rows: int, repeat: int) -> List[Dict]:
+    frames = synthetic_request(rows)
+    payload = {
+        **frames["week1"].to_dict(orient="list"),
+        "history": frames["history"].to_dict(orient="list"),
+    }
+    json_body = json.dumps(payload).encode("utf-8")
+    columnar_body = wire_formats.dumps(payload)
+    # KLIEN ARROW MENGIRIM TANGGAL SEBAGAI TIPE TANGGAL, BUKAN STRING
+    arrow_frames = {
+        k: v.assign(tanggal=pd.to_datetime(v["tanggal"])) for k, v in frames.items()
+    }
+    arrow_body = wire_formats.write_arrow(arrow_frames["week1"]) + wire_formats.write_arrow(
+        arrow_frames["history"]
+    )
+
+    def decode_json():
+        body = PredictRequest.model_validate_json(json_body)
+        return _history_to_dataframe(body.history)
+
+    def decode_columnar():
+        obj = wire_formats.loads(columnar_body)
+        _week1_from_columns(obj)
+        return _history_from_columns(obj["history"])
+
+    def decode_arrow():
+        week1, history = wire_formats.read_arrow_tables(arrow_body)
+        _week1_from_columns(wire_formats.table_to_columns(week1))
+        return _history_from_columns(wire_formats.table_to_columns(history))
+
+    return [
+        {
+            "format": wire_formats.JSON,
+            "bytes": len(json_body),
+            "encode_ms": _timeit(lambda: json.dumps(payload), repeat),
+            "decode_ms": _timeit(decode_json, repeat),
+        },
+        {
+            "format": wire_formats.COLUMNAR_JSON,
+            "bytes": len(columnar_body),
+            "encode_ms": _timeit(lambda: wire_formats.dumps(payload), repeat),
+            "decode_ms": _timeit(decode_columnar, repeat),
+        },
+        {
+            "format": wire_formats.ARROW_STREAM,
+            "bytes": len(arrow_body),
+            "encode_ms": _timeit(
+                lambda: wire_formats.write_arrow(arrow_frames["week1"])
+                + wire_formats.write_arrow(arrow_frames["history"]),
+                repeat,
+            ),
+            "decode_ms": _timeit(decode_arrow, repeat),
+        },
+    ]
+
+
+def bench_response(rows: int, repeat: int) -> List[Dict]:
+    df = synthetic_predictions(rows)
+    meta = {"model_name": "bench", "request_hash": "0" * 64}
+
+    # SAMA DENGAN JALUR LAMA: to_dict(records) -> jsonable_encoder -> json.dumps
+    def encode_json():
+        records = df.to_dict(orient="records")
+        return json.dumps(jsonable_encoder({"predictions": records, **meta})).encode("utf-8")
+
+    def encode_columnar():
+        return wire_formats.dumps({"predictions": wire_formats.frame_to_columns(df), **meta})
+
+    def encode_arrow():
+        return wire_formats.write_arrow(df, meta)
+
+    json_body, columnar_body, arrow_body = encode_json(), encode_columnar(), encode_arrow()
+    return [
+        {
+            "format": wire_formats.JSON,
+            "bytes": len(json_body),
+            "encode_ms": _timeit(encode_json, repeat),
+            "decode_ms": _timeit(lambda: json.loads(json_body), repeat),
+        },
+        {
+            "format": wire_formats.COLUMNAR_JSON,
+            "bytes": len(columnar_body),
+            "encode_ms": _timeit(encode_columnar, repeat),
+            "decode_ms": _timeit(lambda: wire_formats.loads(columnar_body), repeat),
+        },
+        {
+            "format": wire_formats.ARROW_STREAM,
+            "bytes": len(arrow_body),
+            "encode_ms": _timeit(encode_arrow, repeat),
+            "decode_ms": _timeit(
+                lambda: wire_formats.read_arrow_tables(arrow_body)[0].to_pandas(), repeat
+            ),
+        },
+    ]
+
+
+def _print_table(title: str, rows: int, results: List[Dict]) -> None:
+    base = results[0]
+    print(f"\n{title} ({rows} rows)")
+    print(
+        f"{'format':<45}{'bytes':>12}{'size':>8}"
+        f"{'encode ms':>12}{'decode ms':>12}{'speedup':>9}"
+    )
+    for r in results:
+        total = r["encode_ms"] + r["decode_ms"]
+        speedup = (base["encode_ms"] + base["decode_ms"]) / total if total else float("nan")
+        print(
+            f"{r['format']:<45}{r['bytes']:>12,}{r['bytes'] / base['bytes']:>8.2f}"
+            f"{r['encode_ms']:>12.3f}{r['decode_ms']:>12.3f}{speedup:>8.1f}x"
+        )
+
+
+def main(argv=None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark format request/response prediksi.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[365, 3650, 36500])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print hasil sebagai JSON")
+    args = parser.parse_args(argv)
+
+    report = {"orjson": wire_formats.orjson is not None, "request": {}, "response": {}}
+    for rows in args.rows:
+        report["request"][rows] = bench_request(rows, args.repeat)
+        report["response"][rows] = bench_response(rows, args.repeat)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return report
+    print(f"orjson: {'yes' if report['orjson'] else 'no (stdlib json)'}")
+    for rows in args.rows:
+        _print_table("REQUEST history -> DataFrame", rows, report["request"][rows])
+        _print_table("RESPONSE DataFrame -> client", rows, report["response"][rows])
+    return report
+
+
+if __name__ == "__main__":
+    main()
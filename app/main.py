@@ -1,9 +1,42 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 from routers import auth, model, upload
+from utils.forecast_scheduler import request_refresh, start_scheduler, stop_scheduler
+from utils.metrics import (
+    REQUEST_SECONDS,
+    REQUESTS_IN_FLIGHT,
+    monitor_event_loop_lag,
+    render_prometheus,
+)
+from utils.model_registry import MODEL_REGISTRY_ENABLED, ActivePointerWatcher
+from utils.tracing import flush as flush_traces
+from utils.tracing import span
+
+
+# ? https://fastapi.tiangolo.com/advanced/events/#lifespan
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    watcher = None
+    if MODEL_REGISTRY_ENABLED:
+        watcher = ActivePointerWatcher(
+            model.minio_client, on_change=lambda _: request_refresh("model_changed")
+        ).start()
+    start_scheduler()
+    lag_task = asyncio.create_task(monitor_event_loop_lag())
+    yield
+    lag_task.cancel()
+    stop_scheduler()
+    flush_traces()
+    if watcher is not None:
+        watcher.stop()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # ? https://fastapi.tiangolo.com/tutorial/bigger-applications/#path-operations-with-apirouter
 app.include_router(upload.router, prefix="/upload", tags=["upload"])
@@ -19,6 +52,46 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    REQUESTS_IN_FLIGHT.inc()
+    t0 = time.perf_counter()
+    status_code = 500
+    # SPAN SERVER PER REQUEST, MELANJUTKAN TRACE DARI HEADER traceparent JIKA ADA
+    with span(
+        f"{request.method} {request.url.path}",
+        kind="server",
+        traceparent=request.headers.get("traceparent"),
+        **{"http.method": request.method, "http.target": request.url.path},
+    ) as request_span:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            if request_span is not None:
+                response.headers["X-Trace-Id"] = request_span.trace_id
+            return response
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - t0,
+                method=request.method,
+                route=route,
+                status=str(status_code),
+            )
+            if request_span is not None:
+                request_span.name = f"{request.method} {route}"
+                request_span.set_attribute("http.route", route)
+                request_span.set_attribute("http.status_code", status_code)
+
+
 @app.get("/")
 async def root():
     return RedirectResponse(url="/docs")
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,287 @@
+# predictions_model/attribution.py
+#
+# ATRIBUSI FITUR UNTUK FORECAST: SEBERAPA BESAR SETIAP INPUT (SEED WINDOW + CUACA SETIAP
+# HARI FORECAST) MENDORONG NILAI POLUTAN DI HARI FORECAST TERTENTU.
+# - Rollout autoregresif 14 hari ditulis ulang sebagai graf TF (logika sama dengan
+#   rollout_batch), jadi gradien mengalir lewat prediksi yang diumpankan balik.
+# - Scaling ada di dalam graf (scale_/min_ dari scaler_X dan scaler_y), sehingga gradien
+#   dihitung terhadap input dalam satuan asli dan atribusi dalam satuan polutan
+#   (jumlah atribusi ~= prediksi - prediksi baseline).
+# - integrated_gradients: semua titik interpolasi x semua (hari, polutan) yang diminta
+#   ditumpuk di sumbu batch; satu panggilan gradien per potongan ATTRIBUTION_BATCH_ROWS
+#   baris, bukan satu panggilan per fitur / per output.
+# - gradient_x_input: gradien di input x (input - baseline), satu titik saja.
+# ? https://arxiv.org/abs/1703.01365 (Integrated Gradients)
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from predictions_model.predict import (
+    _resolve_model_dir,
+    _stations_meteorology,
+    load_saved_model,
+    load_seed_window,
+    meteorology,
+    model_signature,
+    read_active_model_name,
+)
+from predictions_model.stations import STATION_COL, is_station_model, station_seed_frame
+from utils.tracing import span
+
+ATTRIBUTION_METHODS = ("integrated_gradients", "gradient_x_input")
+ATTRIBUTION_BASELINES = ("min", "persistence")
+ATTRIBUTION_BATCH_ROWS = 512
+
+# MODEL KERAS (BUKAN BACKEND INFERENSI) KARENA BUTUH GRADIEN; CACHE PER FOLDER + MTIME
+_MODEL_CACHE: Dict[Path, tuple] = {}
+_MODEL_LOCK = threading.Lock()
+
+
+def _load_model(model_dir: Path):
+    signature = model_signature(model_dir)
+    with _MODEL_LOCK:
+        cached = _MODEL_CACHE.get(model_dir)
+        if cached is None or cached[0] != signature:
+            cached = (signature, load_saved_model(model_dir))
+            _MODEL_CACHE[model_dir] = cached
+        return cached[1]
+
+
+def _affine(scaler, station: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """(scale, offset) dengan x_scaled = x * scale + offset (MinMaxScaler / StationScaler)."""
+    if station is None:
+        return scaler.scale_, scaler.min_
+    span_ = scaler.data_range[station]
+    return 1.0 / span_, -scaler.data_min[station] / span_
+
+
+class _Rollout:
+    """Rollout autoregresif dalam TF: seed (B, T, F) + cuaca (B, H, 5) -> (B, H, target)."""
+
+    def __init__(self, model, scaler_X, scaler_y, metadata: dict, station: Optional[int]):
+        feat_cols: List[str] = list(metadata["features"])
+        target_cols: List[str] = list(metadata["targets"])
+        combined = target_cols + meteorology
+        if sorted(feat_cols) != sorted(combined):
+            raise ValueError("Attribution needs features = targets + meteorology.")
+        self.model = model
+        # BARIS BARU = gather([target, cuaca], order) SESUAI URUTAN feat_cols
+        self.order = [combined.index(c) for c in feat_cols]
+        self.tgt_idx = [feat_cols.index(c) for c in target_cols]
+        x_scale, x_offset = _affine(scaler_X, station)
+        y_scale, y_offset = _affine(scaler_y, station)
+        self.x_scale = tf.constant(x_scale, tf.float32)
+        self.x_offset = tf.constant(x_offset, tf.float32)
+        self.y_scale = tf.constant(y_scale, tf.float32)
+        self.y_offset = tf.constant(y_offset, tf.float32)
+        self.x_min = (0.0 - x_offset) / x_scale
+        self.one_hot = None
+        if station is not None:
+            self.one_hot = np.zeros(len(metadata["stations"]), np.float32)
+            self.one_hot[station] = 1.0
+
+    def _row(self, targets, met_day):
+        return tf.gather(tf.concat([targets, met_day], axis=1), self.order, axis=1)[:, None]
+
+    def __call__(self, seed, met, horizon: int):
+        window = seed
+        outputs = []
+        for step in range(horizon):
+            met_day = met[:, step]
+            # PLACEHOLDER TARGET = HARI SEBELUMNYA (SAMA DENGAN rollout_batch)
+            last = tf.gather(window[:, -1], self.tgt_idx, axis=1)
+            window = tf.concat([window[:, 1:], self._row(last, met_day)], axis=1)
+            x = window * self.x_scale + self.x_offset
+            if self.one_hot is not None:
+                shape = (tf.shape(x)[0], x.shape[1], len(self.one_hot))
+                hot = tf.broadcast_to(self.one_hot, shape)
+                x = tf.concat([x, hot], axis=2)
+            y = (self.model(x, training=False) - self.y_offset) / self.y_scale
+            outputs.append(y)
+            window = tf.concat([window[:, :-1], self._row(y, met_day)], axis=1)
+        return tf.stack(outputs, axis=1)
+
+
+def _integrate(
+    rollout: _Rollout,
+    seed: np.ndarray,
+    met: np.ndarray,
+    seed_base: np.ndarray,
+    met_base: np.ndarray,
+    outputs: List[Tuple[int, int]],
+    alphas: np.ndarray,
+    batch_rows: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rata-rata gradien (per output) di titik base + alpha * (x - base).
+    Baris batch = (output, alpha); return (K, T, F) dan (K, H, 5).
+    """
+    n_out, n_alpha = len(outputs), len(alphas)
+    out_idx = np.repeat(np.arange(n_out), n_alpha)
+    alpha = np.tile(alphas, n_out).astype(np.float32)
+    days = np.array([h for h, _ in outputs])[out_idx]
+    cols = np.array([p for _, p in outputs])[out_idx]
+    d_seed, d_met = (seed - seed_base).astype(np.float32), (met - met_base).astype(np.float32)
+
+    grad_seed = np.zeros((n_out, *seed.shape))
+    grad_met = np.zeros((n_out, *met.shape))
+    for start in range(0, len(out_idx), batch_rows):
+        rows = slice(start, start + batch_rows)
+        a = alpha[rows][:, None, None]
+        seed_in = tf.constant(seed_base + a * d_seed, tf.float32)
+        met_in = tf.constant(met_base + a * d_met, tf.float32)
+        horizon = int(days[rows].max()) + 1
+        with span("attribution.gradient", rows=len(a), horizon=horizon):
+            with tf.GradientTape() as tape:
+                tape.watch([seed_in, met_in])
+                y = rollout(seed_in, met_in, horizon)
+                picked = tf.reduce_sum(
+                    tf.gather_nd(
+                        y, np.stack([np.arange(len(a)), days[rows], cols[rows]], axis=1)
+                    )
+                )
+            g_seed, g_met = tape.gradient(picked, [seed_in, met_in])
+        np.add.at(grad_seed, out_idx[rows], g_seed.numpy())
+        np.add.at(grad_met, out_idx[rows], g_met.numpy())
+    return grad_seed / n_alpha, grad_met / n_alpha
+
+
+def forecast_attributions(
+    df_meteorology: pd.DataFrame,
+    model_dir: str | Path | None = None,
+    targets: List[str] | None = None,
+    days: List[int] | None = None,
+    method: str = "integrated_gradients",
+    baseline: str = "min",
+    steps: int = 32,
+    station: str | None = None,
+    batch_rows: int = ATTRIBUTION_BATCH_ROWS,
+) -> Dict[str, Any]:
+    """
+    Atribusi per hari input x fitur untuk forecast 14 hari (cuaca minggu-1 + 7 hari
+    persistence, sama dengan predict_pollutants / predict_stations).
+    days: hari forecast 1-based (default semua); targets: polutan (default semua).
+    baseline "min": minimum data training untuk semua input; "persistence": seed tetap,
+    cuaca = baris terakhir seed window diulang (atribusi hanya pada cuaca).
+    """
+    if method not in ATTRIBUTION_METHODS:
+        raise ValueError(
+            f"Unknown method '{method}' (choose from {list(ATTRIBUTION_METHODS)})."
+        )
+    if baseline not in ATTRIBUTION_BASELINES:
+        raise ValueError(
+            f"Unknown baseline '{baseline}' (choose from {list(ATTRIBUTION_BASELINES)})."
+        )
+    model_dir = read_active_model_name() if model_dir is None else model_dir
+    model_dir = _resolve_model_dir(model_dir)
+    model, scaler_X, scaler_y, metadata = _load_model(model_dir)
+    time_step = int(metadata["time_step"])
+    feat_cols: List[str] = list(metadata["features"])
+    target_cols: List[str] = list(metadata["targets"])
+
+    # SEED WINDOW (T, F) + TANGGALNYA
+    station_pos = None
+    if is_station_model(metadata):
+        if station is None:
+            raise ValueError("Multi-station model: pass a station to explain.")
+        if station not in metadata["stations"]:
+            raise ValueError(f"Unknown station: '{station}'")
+        station_pos = metadata["stations"].index(station)
+        frame = station_seed_frame(model_dir)
+        seed_df = frame[frame[STATION_COL] == station][feat_cols].iloc[-time_step:]
+        if len(seed_df) < time_step:
+            raise ValueError(
+                f"Seed window for station '{station}' has fewer than {time_step} rows."
+            )
+    else:
+        if station is not None:
+            raise ValueError("Model is single-series; station is not supported.")
+        seed_df = load_seed_window(model_dir, feat_cols, time_step)
+    seed = seed_df[feat_cols].to_numpy(np.float64)
+    df_meteorology = df_meteorology.drop(columns=[STATION_COL], errors="ignore")
+    dates, met = _stations_meteorology(df_meteorology, [station or ""])
+    met = np.asarray(met[0], dtype=np.float64)
+    horizon = len(dates)
+
+    targets = target_cols if targets is None else list(dict.fromkeys(targets))
+    unknown = [t for t in targets if t not in target_cols]
+    if unknown:
+        raise ValueError(f"Unknown pollutants: {unknown} (model targets: {target_cols})")
+    days = list(range(1, horizon + 1)) if days is None else sorted(set(days))
+    if any(d < 1 or d > horizon for d in days):
+        raise ValueError(f"day must be between 1 and {horizon}.")
+
+    rollout = _Rollout(model, scaler_X, scaler_y, metadata, station_pos)
+    met_idx = [feat_cols.index(m) for m in meteorology]
+    if baseline == "min":
+        seed_base = np.broadcast_to(rollout.x_min, seed.shape).astype(np.float64)
+        met_base = np.broadcast_to(rollout.x_min[met_idx], met.shape).astype(np.float64)
+    else:
+        seed_base = seed
+        met_base = np.broadcast_to(seed[-1, met_idx], met.shape).astype(np.float64)
+
+    if method == "integrated_gradients":
+        # ? RIEMANN TITIK TENGAH: (k + 0.5) / steps
+        alphas = (np.arange(steps) + 0.5) / steps
+    else:
+        alphas = np.ones(1)
+    outputs = [(d - 1, target_cols.index(t)) for d in days for t in targets]
+    grad_seed, grad_met = _integrate(
+        rollout, seed, met, seed_base, met_base, outputs, alphas, batch_rows
+    )
+    attr_seed = grad_seed * (seed - seed_base)
+    attr_met = grad_met * (met - met_base)
+
+    # PREDIKSI DI INPUT DAN DI BASELINE (CEK KELENGKAPAN: SUM ATRIBUSI ~= SELISIHNYA)
+    ends = rollout(
+        tf.constant(np.stack([seed, seed_base]), tf.float32),
+        tf.constant(np.stack([met, met_base]), tf.float32),
+        max(days),
+    ).numpy()
+
+    input_dates = [d.strftime("%Y-%m-%d") for d in pd.DatetimeIndex(seed_df.index)]
+    input_dates += [d.strftime("%Y-%m-%d") for d in dates]
+    records = []
+    for k, (h, p) in enumerate(outputs):
+        grid: Dict[str, List[Optional[float]]] = {}
+        for j, col in enumerate(feat_cols):
+            future: List[Optional[float]]
+            if col in meteorology:
+                future = attr_met[k, :, meteorology.index(col)].tolist()
+            else:
+                # TARGET HARI FORECAST = PREDIKSI MODEL SENDIRI, BUKAN INPUT
+                future = [None] * horizon
+            grid[col] = attr_seed[k, :, j].tolist() + future
+        total = float(attr_seed[k].sum() + attr_met[k].sum())
+        delta = float(ends[0, h, p] - ends[1, h, p])
+        records.append(
+            {
+                "Tanggal": input_dates[time_step + h],
+                "day": h + 1,
+                "pollutant": target_cols[p],
+                "prediction": float(ends[0, h, p]),
+                "baseline_prediction": float(ends[1, h, p]),
+                "residual": delta - total,
+                "by_feature": {
+                    col: float(np.nansum(np.array(v, dtype=np.float64)))
+                    for col, v in grid.items()
+                },
+                "attributions": grid,
+            }
+        )
+
+    return {
+        "method": method,
+        "baseline": baseline,
+        "steps": len(alphas),
+        "station": station,
+        "features": feat_cols,
+        "input_dates": input_dates,
+        "seed_days": time_step,
+        "units": "pollutant units per input (sum ~= prediction - baseline_prediction)",
+        "attributions": records,
+    }
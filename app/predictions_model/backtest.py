@@ -0,0 +1,168 @@
+# predictions_model/backtest.py
+#
+# BACKTEST WALK-FORWARD: ROLLOUT 14 HARI (SAMA DENGAN predict_pollutants) DIULANG DARI
+# SETIAP TANGGAL ORIGIN DI PERIODE TEST (test_size terakhir, sama dengan split training).
+# - Semua origin (x semua stasiun untuk model multi-stasiun) dijalankan sekaligus di
+#   sumbu batch lewat rollout_batch: satu forward pass per hari horizon, bukan
+#   origin x horizon panggilan model.
+# - Window origin diambil dengan sliding_window_view (view, tanpa salin per origin).
+# - Cuaca masa depan = observasi (perfect prognosis), jadi error yang terukur adalah
+#   error model + akumulasi autoregresif, bukan error prakiraan cuaca.
+# - MAE / RMSE / MAPE per polutan per hari horizon dihitung tervektorisasi; MAPE
+#   berupa fraksi seperti mean_absolute_percentage_error di evaluation.json.
+# Hasil disimpan sebagai backtest.json di folder model (ditulis saat training, atau
+# dihitung ulang lewat POST /model/backtest) dan ikut dikirim oleh GET /model/evaluation.
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from predictions_model.predict import (
+    batch_transforms,
+    load_inference_runtime,
+    meteorology,
+    rollout_batch,
+)
+from predictions_model.stations import is_station_model
+
+BACKTEST_FILENAME = "backtest.json"
+BACKTEST_HORIZON = 14
+_METRICS = ("MAE", "RMSE", "MAPE")
+
+
+def origin_windows(
+    values: np.ndarray, time_step: int, horizon: int, first_origin: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    values (n, F) -> (window (O, time_step, F), masa depan (O, horizon, F), posisi origin).
+    Origin i = hari pertama yang diprediksi: window = values[i - time_step : i],
+    masa depan = values[i : i + horizon]. Hanya origin >= first_origin dengan
+    horizon lengkap.
+    """
+    span = time_step + horizon
+    first = max(first_origin, time_step)
+    if len(values) - first < horizon:
+        n_feat = values.shape[1]
+        return (
+            np.empty((0, time_step, n_feat)),
+            np.empty((0, horizon, n_feat)),
+            np.empty(0, dtype=np.int64),
+        )
+    # (n - span + 1, F, span) -> (O, span, F); baris ke-k = values[k : k + span]
+    blocks = sliding_window_view(values, span, axis=0).transpose(0, 2, 1)
+    blocks = blocks[first - time_step :]
+    origins = np.arange(first, first + len(blocks))
+    return blocks[:, :time_step], blocks[:, time_step:], origins
+
+
+def horizon_metrics(
+    pred: np.ndarray, actual: np.ndarray, target_cols: List[str]
+) -> Dict[str, Dict[str, List[float]]]:
+    """pred/actual (O, H, P) -> {polutan | Overall: {MAE|RMSE|MAPE: [H nilai]}}."""
+    err = pred - actual
+    eps = np.finfo(np.float64).eps
+    per_metric = {
+        "MAE": np.abs(err).mean(axis=0),
+        "RMSE": np.sqrt((err**2).mean(axis=0)),
+        "MAPE": (np.abs(err) / np.maximum(np.abs(actual), eps)).mean(axis=0),
+    }
+    out: Dict[str, Dict[str, List[float]]] = {
+        col: {m: per_metric[m][:, j].tolist() for m in _METRICS}
+        for j, col in enumerate(target_cols)
+    }
+    # OVERALL = RATA-RATA ANTAR POLUTAN, SAMA DENGAN _metrics_table
+    out["Overall"] = {m: per_metric[m].mean(axis=1).tolist() for m in _METRICS}
+    return out
+
+
+def backtest(
+    predict_fn: Callable,
+    scaler_X,
+    scaler_y,
+    metadata: Dict[str, Any],
+    frames: Dict[str, pd.DataFrame],
+    test_size: float = 0.2,
+    horizon: int = BACKTEST_HORIZON,
+) -> Dict[str, Any]:
+    """
+    frames: {stasiun: observasi terurut (index Tanggal, kolom fitur, sudah dipreprocess)};
+    untuk model satu deret cukup satu entri (kunci bebas).
+    """
+    t0 = time.perf_counter()
+    time_step = int(metadata["time_step"])
+    feat_cols: List[str] = list(metadata["features"])
+    target_cols: List[str] = list(metadata["targets"])
+    stations = list(metadata.get("stations") or [])
+    tgt_idx = [feat_cols.index(c) for c in target_cols]
+    met_idx = [feat_cols.index(m) for m in meteorology]
+
+    windows, futures, station_idx, origin_dates = [], [], [], []
+    for name, frame in frames.items():
+        values = frame[feat_cols].to_numpy(np.float64)
+        # SAMA DENGAN train_test_split(shuffle=False): ceil(n * test_size) BARIS TERAKHIR
+        first_origin = len(values) - int(np.ceil(len(values) * test_size))
+        window, future, origins = origin_windows(values, time_step, horizon, first_origin)
+        if not len(origins):
+            continue
+        windows.append(window)
+        futures.append(future)
+        origin_dates.append(frame.index[origins])
+        if stations:
+            station_idx.append(np.full(len(origins), stations.index(name)))
+    if not windows:
+        raise ValueError(
+            f"Test period is too short for a {horizon}-day backtest (time_step={time_step})."
+        )
+
+    window = np.concatenate(windows)
+    future = np.concatenate(futures)
+    idx = np.concatenate(station_idx) if stations else None
+    transform_x, inverse_y = batch_transforms(scaler_X, scaler_y, metadata, idx)
+    met = future[:, :, met_idx]
+    pred = rollout_batch(
+        predict_fn, transform_x, inverse_y, window, met, feat_cols, target_cols
+    )
+    actual = future[:, :, tgt_idx]
+
+    dates = origin_dates[0].append(origin_dates[1:])
+    result = {
+        "horizon_days": horizon,
+        "origins": int(len(window)),
+        "origin_range": [d.strftime("%Y-%m-%d") for d in (dates.min(), dates.max())],
+        "test_size": test_size,
+        "meteorology": "observed",
+        "metrics": horizon_metrics(pred, actual, target_cols),
+    }
+    if stations:
+        result["stations"] = {
+            name: horizon_metrics(pred[idx == i], actual[idx == i], target_cols)["Overall"]
+            for i, name in enumerate(stations)
+            if (idx == i).any()
+        }
+    result["seconds"] = time.perf_counter() - t0
+    result["generated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    return result
+
+
+def backtest_model(
+    model_dir: str | Path,
+    frames: Dict[str, pd.DataFrame],
+    test_size: float = 0.2,
+    horizon: int = BACKTEST_HORIZON,
+) -> Dict[str, Any]:
+    """backtest() dengan model tersimpan (runtime + backend inferensi yang dipakai server)."""
+    predict_fn, scaler_X, scaler_y, metadata = load_inference_runtime(model_dir)
+    # FRAME TANPA NAMA STASIUN ("") = DATASET SATU DERET
+    single_series = list(frames) == [""]
+    if is_station_model(metadata):
+        if single_series:
+            raise ValueError("Multi-station model needs a dataset with a Stasiun column.")
+        unknown = [name for name in frames if name not in metadata["stations"]]
+        if unknown:
+            raise ValueError(f"Stations not in model: {unknown}")
+    elif not single_series:
+        raise ValueError("Dataset has a Stasiun column but the model is single-series.")
+    return backtest(predict_fn, scaler_X, scaler_y, metadata, frames, test_size, horizon)
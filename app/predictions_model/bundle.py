@@ -0,0 +1,268 @@
+# predictions_model/bundle.py
+#
+# FORMAT BUNDLE INFERENSI (SATU FILE)
+# ZIP tanpa kompresi (.npz) berisi array .npy + manifest.json. Setiap member
+# disejajarkan 64 byte sehingga array bisa di-memory-map langsung dari file
+# bundle (np.load mengabaikan mmap_mode untuk .npz, jadi offset dihitung sendiri).
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
+from keras.models import model_from_json
+from sklearn.preprocessing import MinMaxScaler
+
+BUNDLE_FILENAME = "inference_bundle.npz"
+BUNDLE_FORMAT = "bilstm-inference-bundle"
+BUNDLE_VERSION = 1
+
+_MANIFEST_NAME = "manifest.json"
+_ALIGNMENT = 64
+_PAD_HEADER_ID = 0xA11E  # EXTRA FIELD KHUSUS UNTUK PADDING
+_LOCAL_HEADER_SIZE = 30
+
+
+class BundleError(ValueError):
+    pass
+
+
+def _npy_bytes(arr: np.ndarray) -> bytes:
+    buf = BytesIO()
+    np.lib.format.write_array(buf, np.ascontiguousarray(arr), allow_pickle=False)
+    return buf.getvalue()
+
+
+def _content_hash(members: Dict[str, bytes]) -> str:
+    h = hashlib.sha256()
+    for name in sorted(members):
+        h.update(name.encode("utf-8"))
+        h.update(struct.pack("<Q", len(members[name])))
+        h.update(members[name])
+    return h.hexdigest()
+
+
+def _scaler_arrays(prefix: str, scaler: MinMaxScaler) -> Dict[str, np.ndarray]:
+    return {
+        f"{prefix}_min": np.asarray(scaler.min_, dtype=np.float64),
+        f"{prefix}_scale": np.asarray(scaler.scale_, dtype=np.float64),
+        f"{prefix}_data_min": np.asarray(scaler.data_min_, dtype=np.float64),
+        f"{prefix}_data_max": np.asarray(scaler.data_max_, dtype=np.float64),
+    }
+
+
+def _write_aligned_zip(fp, members: Dict[str, bytes]) -> None:
+    with zipfile.ZipFile(fp, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, data in members.items():
+            info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_STORED
+            offset = fp.tell()
+            base = offset + _LOCAL_HEADER_SIZE + len(name.encode("utf-8")) + 4
+            pad = (-base) % _ALIGNMENT
+            info.extra = struct.pack("<HH", _PAD_HEADER_ID, pad) + b"\0" * pad
+            zf.writestr(info, data)
+
+
+def write_inference_bundle(
+    save_dir: str | Path,
+    model,
+    scaler_X: MinMaxScaler,
+    scaler_y: MinMaxScaler,
+    seed_window: pd.DataFrame,
+    metadata: dict,
+) -> str:
+    """Tulis bundle inferensi secara atomik; return content hash (sha256)."""
+    save_dir = Path(save_dir)
+    save_dir.mkdir(parents=True, exist_ok=True)
+
+    arrays: Dict[str, np.ndarray] = {}
+    weight_names: List[str] = []
+    for i, w in enumerate(model.get_weights()):
+        name = f"weight_{i:03d}"
+        arrays[name] = np.asarray(w, dtype=np.float32)
+        weight_names.append(name)
+    arrays.update(_scaler_arrays("scaler_X", scaler_X))
+    arrays.update(_scaler_arrays("scaler_y", scaler_y))
+
+    seed = seed_window.sort_index()
+    arrays["seed_values"] = seed.to_numpy(dtype=np.float64)
+    arrays["seed_index"] = pd.DatetimeIndex(seed.index).values.astype("datetime64[D]")
+
+    members = {f"{k}.npy": _npy_bytes(v) for k, v in arrays.items()}
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "metadata": metadata,
+        "model_config": model.to_json(),
+        "weights": weight_names,
+        "seed_columns": list(seed.columns),
+        "feature_range": {
+            "scaler_X": list(scaler_X.feature_range),
+            "scaler_y": list(scaler_y.feature_range),
+        },
+        "content_hash": _content_hash(members),
+    }
+    members = {
+        _MANIFEST_NAME: json.dumps(manifest, ensure_ascii=False).encode("utf-8"),
+        **members,
+    }
+
+    # TULIS KE FILE SEMENTARA DI FOLDER YANG SAMA LALU RENAME (ATOMIK)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=save_dir, prefix=f".{BUNDLE_FILENAME}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w+b") as fp:
+            _write_aligned_zip(fp, members)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, save_dir / BUNDLE_FILENAME)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    return manifest["content_hash"]
+
+
+def _member_offsets(path: Path) -> Dict[str, Tuple[int, int]]:
+    """Return {nama_member: (offset_data, ukuran)} dari local header ZIP."""
+    offsets: Dict[str, Tuple[int, int]] = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as fp:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise BundleError(f"Bundle member '{info.filename}' is compressed.")
+            fp.seek(info.header_offset)
+            header = fp.read(_LOCAL_HEADER_SIZE)
+            if header[:4] != b"PK\x03\x04":
+                raise BundleError(f"Corrupt local header for '{info.filename}'.")
+            name_len, extra_len = struct.unpack("<HH", header[26:30])
+            data_offset = info.header_offset + _LOCAL_HEADER_SIZE + name_len + extra_len
+            offsets[info.filename] = (data_offset, info.file_size)
+    return offsets
+
+
+def _mmap_npy(path: Path, offset: int) -> np.ndarray:
+    with open(path, "rb") as fp:
+        fp.seek(offset)
+        major, _ = np.lib.format.read_magic(fp)
+        if major == 1:
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(fp)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(fp)
+        data_offset = fp.tell()
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=data_offset,
+        shape=shape,
+        order="F" if fortran else "C",
+    )
+
+
+def read_inference_bundle(path: str | Path) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """Baca manifest dan semua array (read-only memmap, page dibagi antar proses)."""
+    path = Path(path)
+    if path.is_dir():
+        path = path / BUNDLE_FILENAME
+    if not path.exists():
+        raise FileNotFoundError(f"Inference bundle not found: {path}")
+
+    offsets = _member_offsets(path)
+    if _MANIFEST_NAME not in offsets:
+        raise BundleError(f"{path} has no {_MANIFEST_NAME}.")
+
+    with open(path, "rb") as fp:
+        off, size = offsets[_MANIFEST_NAME]
+        fp.seek(off)
+        manifest = json.loads(fp.read(size).decode("utf-8"))
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise BundleError(f"{path} is not a {BUNDLE_FORMAT}.")
+
+    arrays = {
+        name[: -len(".npy")]: _mmap_npy(path, off)
+        for name, (off, _) in offsets.items()
+        if name.endswith(".npy")
+    }
+    return manifest, arrays
+
+
+def verify_inference_bundle(path: str | Path) -> str:
+    """Hitung ulang content hash; raise BundleError jika tidak cocok."""
+    path = Path(path)
+    if path.is_dir():
+        path = path / BUNDLE_FILENAME
+    with zipfile.ZipFile(path) as zf:
+        manifest = json.loads(zf.read(_MANIFEST_NAME).decode("utf-8"))
+        members = {n: zf.read(n) for n in zf.namelist() if n != _MANIFEST_NAME}
+    actual = _content_hash(members)
+    if actual != manifest.get("content_hash"):
+        raise BundleError(
+            f"Content hash mismatch for {path}: "
+            f"expected {manifest.get('content_hash')}, got {actual}."
+        )
+    return actual
+
+
+def bundle_model(manifest: dict, arrays: Dict[str, np.ndarray]):
+    model = model_from_json(manifest["model_config"])
+    model.set_weights([arrays[name] for name in manifest["weights"]])
+    return model
+
+
+def _bundle_scaler(manifest: dict, arrays: Dict[str, np.ndarray], prefix: str):
+    feature_range = tuple(manifest["feature_range"][prefix])
+    scaler = MinMaxScaler(feature_range=feature_range)
+    scaler.min_ = np.array(arrays[f"{prefix}_min"])
+    scaler.scale_ = np.array(arrays[f"{prefix}_scale"])
+    scaler.data_min_ = np.array(arrays[f"{prefix}_data_min"])
+    scaler.data_max_ = np.array(arrays[f"{prefix}_data_max"])
+    scaler.data_range_ = scaler.data_max_ - scaler.data_min_
+    scaler.n_features_in_ = scaler.min_.shape[0]
+    scaler.n_samples_seen_ = 0
+    return scaler
+
+
+def bundle_scalers(manifest: dict, arrays: Dict[str, np.ndarray]):
+    return (
+        _bundle_scaler(manifest, arrays, "scaler_X"),
+        _bundle_scaler(manifest, arrays, "scaler_y"),
+    )
+
+
+def bundle_seed_window(manifest: dict, arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    index = pd.DatetimeIndex(np.asarray(arrays["seed_index"]), name="Tanggal")
+    return pd.DataFrame(
+        np.array(arrays["seed_values"]),
+        index=index,
+        columns=manifest["seed_columns"],
+    )
+
+
+# ? KONVERSI MODEL LAMA (FILE TERPISAH) KE BUNDLE:
+#   python -m predictions_model.bundle <model_dir> [<model_dir> ...]
+if __name__ == "__main__":
+    from predictions_model.predict import MODELS_ROOT, load_saved_model, load_seed_window
+
+    for arg in sys.argv[1:]:
+        model_dir = Path(arg) if Path(arg).is_absolute() else MODELS_ROOT / arg
+        model, scaler_X, scaler_y, metadata = load_saved_model(model_dir)
+        seed = load_seed_window(
+            model_dir, list(metadata["features"]), int(metadata["time_step"]), live=False
+        )
+        digest = write_inference_bundle(
+            model_dir, model, scaler_X, scaler_y, seed, metadata
+        )
+        print(f"{model_dir.name}: {BUNDLE_FILENAME} sha256={digest}")
@@ -1,6 +1,9 @@
 import base64
-import json
 import os
+import statistics
+import tempfile
+import time
+from contextlib import ExitStack
 from io import BytesIO
 from pathlib import Path
 
@@ -34,6 +37,21 @@ tf.random.set_seed(42)
 # ? https://github.com/microsoft/pylance-release/issues/5482
 from keras.models import Sequential
 
+from predictions_model.backtest import BACKTEST_FILENAME, backtest
+from predictions_model.bundle import write_inference_bundle
+from predictions_model.stations import (
+    STATION_COL,
+    STATION_SCALERS_FILENAME,
+    STATION_SEEDS_FILENAME,
+    StationScaler,
+    save_station_scalers,
+    split_stations,
+    station_one_hot,
+)
+from predictions_model.telemetry import TRAINING_REPORT_FILENAME, TrainingTelemetry
+from utils.model_catalog import register_model
+from utils.model_utils import REGISTRY_ORIGIN_FILENAME, _staged_model_dir, _write_json
+
 BASE_DIR = Path(__file__).resolve().parent
 
 poluttants = ["PM10", "SO2", "CO", "O3", "NO2"]
@@ -82,6 +100,36 @@ def build_model(
     return model
 
 
+PRECISION_VARIANTS = ("float16", "int8")
+
+
+def export_tflite(model, path, time_step, n_features, quantization=None):
+    # ? https://ai.google.dev/edge/litert/models/post_training_quantization
+    # ? BATCH DIKUNCI 1: TENSORLIST LSTM TIDAK BISA DI-LOWER KALAU BATCH DINAMIS
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive = keras.export.ExportArchive()
+        archive.track(model)
+        archive.add_endpoint(
+            "serve",
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec([1, time_step, n_features], tf.float32)],
+        )
+        archive.write_out(tmp_dir, verbose=False)
+        converter = tf.lite.TFLiteConverter.from_saved_model(tmp_dir)
+        if quantization in PRECISION_VARIANTS:
+            # INT8 = DYNAMIC-RANGE (BOBOT INT8, AKTIVASI FLOAT)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            if quantization == "float16":
+                converter.target_spec.supported_types = [tf.float16]
+        elif quantization is not None:
+            raise ValueError(f"Unknown quantization '{quantization}'.")
+        tflite_bytes = converter.convert()
+
+    with open(path, "wb") as f:
+        f.write(tflite_bytes)
+    return len(tflite_bytes)
+
+
 def evaluate_model(y_true, y_pred):
     mae = mean_absolute_error(y_true, y_pred)
     mape = mean_absolute_percentage_error(y_true, y_pred)
@@ -91,6 +139,56 @@ def evaluate_model(y_true, y_pred):
     return mae, mape, mse, rmse, r2
 
 
+def _metrics_table(ytrue, ypred, verbose=True):
+    metrics = {}
+    for i, col in enumerate(poluttants):
+        mae, mape, mse, rmse, r2 = evaluate_model(ytrue[:, i], ypred[:, i])
+        metrics[col] = {
+            "MAE": float(mae),
+            "MAPE": float(mape),
+            "MSE": float(mse),
+            "RMSE": float(rmse),
+            "R2": float(r2),
+        }
+        if verbose:
+            print(
+                f"{col:>5} | MAE={mae:.3f} | MAPE={mape:.2f}% | MSE={mse:.3f} | RMSE={rmse:.3f} | R²={r2:.3f}"
+            )
+
+    # OVERALL METRICS
+    metrics["Overall"] = {
+        k: float(np.mean([metrics[c][k] for c in poluttants]))
+        for k in ["MAE", "MAPE", "MSE", "RMSE", "R2"]
+    }
+    return metrics
+
+
+def evaluate_tflite(path, X, scaler_y, ytrue, latency_repeats=50):
+    """Evaluasi model TFLite (batch=1) pada test split + latency per sampel."""
+    interpreter = tf.lite.Interpreter(model_path=str(path))
+    interpreter.allocate_tensors()
+    inp = interpreter.get_input_details()[0]["index"]
+    out = interpreter.get_output_details()[0]["index"]
+
+    preds = []
+    for i in range(X.shape[0]):
+        interpreter.set_tensor(inp, X[i : i + 1].astype(np.float32))
+        interpreter.invoke()
+        preds.append(interpreter.get_tensor(out).copy())
+    y_pred = scaler_y.inverse_transform(np.concatenate(preds, axis=0))
+
+    timings = []
+    sample = X[:1].astype(np.float32)
+    for _ in range(latency_repeats):
+        t0 = time.perf_counter()
+        interpreter.set_tensor(inp, sample)
+        interpreter.invoke()
+        interpreter.get_tensor(out)
+        timings.append((time.perf_counter() - t0) * 1000.0)
+
+    return _metrics_table(ytrue, y_pred, verbose=False), statistics.median(timings)
+
+
 def train_model(
     df: pd.DataFrame,
     time_step=7,
@@ -103,9 +201,73 @@ def train_model(
     lstm_units=128,
     test_size=0.2,
     model_name="prediction_model",
+    precision_variants=(),
+    telemetry: TrainingTelemetry | None = None,
 ):
-    df = preprocess_data(df)
-    df_idx = df.set_index("Tanggal")
+    # TELEMETRI BISA DIBUAT OLEH PEMANGGIL (SUPAYA TAHAP FETCH IKUT TERCATAT)
+    with ExitStack() as stack:
+        if telemetry is None:
+            telemetry = stack.enter_context(TrainingTelemetry())
+        # DATA DENGAN KOLOM STASIUN -> SATU MODEL BERSAMA UNTUK SEMUA STASIUN
+        train = _train_station_model if STATION_COL in df.columns else _train_model
+        return train(
+            df,
+            telemetry,
+            time_step=time_step,
+            batch_size=batch_size,
+            epochs=epochs,
+            validation_split=validation_split,
+            patience=patience,
+            learning_rate=learning_rate,
+            dropout=dropout,
+            lstm_units=lstm_units,
+            test_size=test_size,
+            model_name=model_name,
+            precision_variants=precision_variants,
+        )
+
+
+def _run_backtest(telemetry, model, scaler_X, scaler_y, metadata, frames, test_size):
+    """Backtest walk-forward di periode test; None jika test split terlalu pendek."""
+    with telemetry.stage("backtest"):
+        try:
+            result = backtest(
+                lambda x: model.predict(x, batch_size=1024, verbose=0),
+                scaler_X,
+                scaler_y,
+                metadata,
+                frames,
+                test_size=test_size,
+            )
+        except ValueError as e:
+            print(f"Backtest skipped: {e}")
+            return None
+    overall = result["metrics"]["Overall"]
+    print(
+        f"Backtest | origins={result['origins']} | RMSE day1={overall['RMSE'][0]:.3f} "
+        f"day{result['horizon_days']}={overall['RMSE'][-1]:.3f} | {result['seconds']:.2f}s"
+    )
+    return result
+
+
+def _train_model(
+    df: pd.DataFrame,
+    telemetry: TrainingTelemetry,
+    time_step,
+    batch_size,
+    epochs,
+    validation_split,
+    patience,
+    learning_rate,
+    dropout,
+    lstm_units,
+    test_size,
+    model_name,
+    precision_variants,
+):
+    with telemetry.stage("preprocess"):
+        df = preprocess_data(df)
+        df_idx = df.set_index("Tanggal")
 
     features = poluttants + meteorology
     targets = poluttants
@@ -119,18 +281,20 @@ def train_model(
     )
 
     # NORMALIZATION
-    scaler_X = MinMaxScaler()
-    scaler_y = MinMaxScaler()
+    with telemetry.stage("scale"):
+        scaler_X = MinMaxScaler()
+        scaler_y = MinMaxScaler()
 
-    X_train_scaled = scaler_X.fit_transform(X_train)
-    X_test_scaled = scaler_X.transform(X_test)
+        X_train_scaled = scaler_X.fit_transform(X_train)
+        X_test_scaled = scaler_X.transform(X_test)
 
-    y_train_scaled = scaler_y.fit_transform(y_train)
-    y_test_scaled = scaler_y.transform(y_test)
+        y_train_scaled = scaler_y.fit_transform(y_train)
+        y_test_scaled = scaler_y.transform(y_test)
 
     # SEQUENCES
-    Xtr, ytr = make_sequences(X_train_scaled, y_train_scaled, time_step)
-    Xte, yte = make_sequences(X_test_scaled, y_test_scaled, time_step)
+    with telemetry.stage("sequence"):
+        Xtr, ytr = make_sequences(X_train_scaled, y_train_scaled, time_step)
+        Xte, yte = make_sequences(X_test_scaled, y_test_scaled, time_step)
 
     # MODEL
     model = build_model(
@@ -141,59 +305,51 @@ def train_model(
         lstm_units=lstm_units,
         learning_rate=learning_rate,
     )
+    # ? KERAS MEMOTONG VALIDATION SPLIT DI floor(n * (1 - split))
+    # ? keras/src/trainers/data_adapters/array_slicing.py (train_validation_split)
+    fit_samples = int(np.floor(len(Xtr) * (1.0 - validation_split)))
     es = EarlyStopping(monitor="val_loss", patience=patience, restore_best_weights=True)
-    model.fit(
-        Xtr,
-        ytr,
-        epochs=epochs,
-        batch_size=batch_size,
-        validation_split=validation_split,
-        callbacks=[es],
-        verbose=1,
-        shuffle=False,
-    )
-    prediction_results_n = model.predict(Xte, verbose=0)
-    prediction_result = scaler_y.inverse_transform(prediction_results_n)
-    ytrue = scaler_y.inverse_transform(yte)
-
-    # PRINT EVALUATION
-    metrics = {}
-    for i, col in enumerate(poluttants):
-        mae, mape, mse, rmse, r2 = evaluate_model(ytrue[:, i], prediction_result[:, i])
-        metrics[col] = {
-            "MAE": float(mae),
-            "MAPE": float(mape),
-            "MSE": float(mse),
-            "RMSE": float(rmse),
-            "R2": float(r2),
-        }
-        print(
-            f"{col:>5} | MAE={mae:.3f} | MAPE={mape:.2f}% | MSE={mse:.3f} | RMSE={rmse:.3f} | R²={r2:.3f}"
+    with telemetry.stage("fit"):
+        model.fit(
+            Xtr,
+            ytr,
+            epochs=epochs,
+            batch_size=batch_size,
+            validation_split=validation_split,
+            callbacks=[es, telemetry.callback(fit_samples, epochs, es)],
+            verbose=1,
+            shuffle=False,
         )
 
-    # OVERALL METRICS
-    metrics["Overall"] = {
-        k: float(np.mean([metrics[c][k] for c in poluttants]))
-        for k in ["MAE", "MAPE", "MSE", "RMSE", "R2"]
-    }
-
-    # SAVE MODEL
-    print("Saving model...")
-    SAVE_DIR = Path(BASE_DIR / "models" / model_name)
-    os.makedirs(SAVE_DIR, exist_ok=True)
-    print(SAVE_DIR)
-
-    model.save(SAVE_DIR / "bilstm_model.keras")
-    joblib.dump(scaler_X, SAVE_DIR / "scaler_X.joblib")
-    joblib.dump(scaler_y, SAVE_DIR / "scaler_y.joblib")
-    with open(SAVE_DIR / "metadata.json", "w") as f:
-        json.dump(
-            {"time_step": time_step, "features": features, "targets": poluttants}, f
-        )
+    with telemetry.stage("evaluate"):
+        prediction_results_n = model.predict(Xte, verbose=0)
+        prediction_result = scaler_y.inverse_transform(prediction_results_n)
+        ytrue = scaler_y.inverse_transform(yte)
+
+        # PRINT EVALUATION
+        metrics = _metrics_table(ytrue, prediction_result)
+
+    backtest_result = _run_backtest(
+        telemetry,
+        model,
+        scaler_X,
+        scaler_y,
+        {"time_step": time_step, "features": features, "targets": targets},
+        {"": df_idx[features]},
+        test_size,
+    )
 
-    with open(SAVE_DIR / "evaluation.json", "w", encoding="utf-8") as f:
-        json.dump(metrics, f, ensure_ascii=False, indent=2)
+    telemetry.info.update(
+        rows=len(df),
+        train_sequences=len(Xtr),
+        fit_samples=fit_samples,
+        test_sequences=len(Xte),
+        n_features=len(features),
+        best_epoch=(es.best_epoch + 1) if es.best is not None else None,
+        stopped_early=es.stopped_epoch > 0,
+    )
 
+    # SEED WINDOW (DICEK SEBELUM MENYIMPAN APAPUN)
     hist_feats = df_idx[features].copy()
     hist_feats = hist_feats.apply(pd.to_numeric, errors="coerce")
 
@@ -202,5 +358,306 @@ def train_model(
         bad_cols = seed_window.columns[seed_window.isna().any()].tolist()
         raise ValueError(f"Seed window contains NaNs. Affected columns: {bad_cols}")
 
-    seed_path_csv = SAVE_DIR / "seed_window.csv"
-    seed_window.to_csv(seed_path_csv, index=True)
+    # SAVE MODEL
+    print("Saving model...")
+    model_dir = Path(BASE_DIR / "models" / model_name)
+    print(model_dir)
+
+    metadata = {
+        "time_step": time_step,
+        "features": features,
+        "targets": poluttants,
+        "hyperparameters": {
+            "time_step": time_step,
+            "batch_size": batch_size,
+            "epochs": epochs,
+            "validation_split": validation_split,
+            "patience": patience,
+            "learning_rate": learning_rate,
+            "dropout": dropout,
+            "lstm_units": lstm_units,
+            "test_size": test_size,
+        },
+        "trained_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    # ARTEFAK DITULIS KE FOLDER STAGING, LALU DIPASANG SEKALIGUS SAAT BLOK SELESAI
+    with _staged_model_dir(model_dir) as SAVE_DIR:
+        # TRAINING LOKAL: WATCHER REGISTRY TIDAK MENGGANTI FOLDER INI SEBELUM DIPUBLISH
+        _write_json(SAVE_DIR / REGISTRY_ORIGIN_FILENAME, {"local_training": True})
+        with telemetry.stage("save"):
+            model.save(SAVE_DIR / "bilstm_model.keras")
+            joblib.dump(scaler_X, SAVE_DIR / "scaler_X.joblib")
+            joblib.dump(scaler_y, SAVE_DIR / "scaler_y.joblib")
+
+            seed_path_csv = SAVE_DIR / "seed_window.csv"
+            seed_window.to_csv(seed_path_csv, index=True)
+
+        with telemetry.stage("export"):
+            # TFLITE UNTUK BACKEND INFERENSI (OPSIONAL, GAGAL KONVERSI TIDAK MENGGAGALKAN
+            # TRAINING)
+            variants = {
+                "float32": {
+                    "file": "bilstm_model.keras",
+                    "size_bytes": (SAVE_DIR / "bilstm_model.keras").stat().st_size,
+                    "weights_bytes": int(sum(w.nbytes for w in model.get_weights())),
+                    "overall": metrics["Overall"],
+                }
+            }
+            try:
+                export_tflite(
+                    model, SAVE_DIR / "bilstm_model.tflite", time_step, len(features)
+                )
+                _, variants["float32"]["latency_ms"] = evaluate_tflite(
+                    SAVE_DIR / "bilstm_model.tflite", Xte, scaler_y, ytrue
+                )
+            except Exception as e:
+                print(f"TFLite export skipped: {e}")
+
+            # VARIAN PRESISI RENDAH, MASING-MASING DIEVALUASI PADA TEST SPLIT YANG SAMA
+            for variant in precision_variants:
+                file_name = f"bilstm_model_{variant}.tflite"
+                try:
+                    size = export_tflite(
+                        model, SAVE_DIR / file_name, time_step, len(features), variant
+                    )
+                    variant_metrics, latency_ms = evaluate_tflite(
+                        SAVE_DIR / file_name, Xte, scaler_y, ytrue
+                    )
+                except Exception as e:
+                    print(f"{variant} variant skipped: {e}")
+                    continue
+                overall = variant_metrics["Overall"]
+                metrics[f"Overall ({variant})"] = overall
+                variants[variant] = {
+                    "file": file_name,
+                    "size_bytes": size,
+                    "latency_ms": latency_ms,
+                    "overall": overall,
+                    "delta_vs_float32": {
+                        k: overall[k] - metrics["Overall"][k] for k in overall
+                    },
+                }
+                print(
+                    f"{variant:>7} | MAE={overall['MAE']:.3f} | RMSE={overall['RMSE']:.3f} | R²={overall['R2']:.3f} | {size / 1024:.1f} KiB | {latency_ms:.3f} ms"
+                )
+        metadata["variants"] = variants
+
+        with telemetry.stage("save"):
+            # _write_json: ATOMIK + MEMBUANG CACHE RESPONSE YANG BERGANTUNG PADA FILE INI
+            _write_json(SAVE_DIR / "metadata.json", metadata)
+            _write_json(SAVE_DIR / "evaluation.json", metrics)
+            if backtest_result is not None:
+                _write_json(SAVE_DIR / BACKTEST_FILENAME, backtest_result)
+
+            # BUNDLE INFERENSI DITULIS TERAKHIR (ATOMIK) SEBAGAI PENANDA MODEL LENGKAP
+            write_inference_bundle(SAVE_DIR, model, scaler_X, scaler_y, seed_window, metadata)
+
+        # LAPORAN TRAINING (BUKAN FILE WAJIB, JADI DITULIS SETELAH BUNDLE)
+        report = telemetry.report(model_name=model_name, batch_size=batch_size)
+        _write_json(SAVE_DIR / TRAINING_REPORT_FILENAME, report)
+    print(
+        f"Training finished in {report['wall_seconds']:.1f}s | epochs={report['epochs_run']} | peak RSS={report['peak_rss_bytes'] / 2**20:.0f} MiB"
+    )
+    register_model(model_dir)
+
+
+def _train_station_model(
+    df: pd.DataFrame,
+    telemetry: TrainingTelemetry,
+    time_step,
+    batch_size,
+    epochs,
+    validation_split,
+    patience,
+    learning_rate,
+    dropout,
+    lstm_units,
+    test_size,
+    model_name,
+    precision_variants,
+):
+    """
+    BiLSTM bersama untuk data multi-stasiun (lihat predictions_model/stations.py).
+    Split train/validasi/test kronologis per stasiun, scaler per stasiun, one-hot
+    stasiun sebagai input tambahan.
+    """
+    features = poluttants + meteorology
+    targets = poluttants
+
+    with telemetry.stage("preprocess"):
+        groups = {name: preprocess_data(g) for name, g in split_stations(df).items()}
+    if not groups:
+        raise ValueError(f"No station names found in column '{STATION_COL}'.")
+    stations = list(groups)
+    n_stations = len(stations)
+
+    splits = {
+        name: train_test_split(
+            g[features].values, g[targets].values, test_size=test_size, shuffle=False
+        )
+        for name, g in groups.items()
+    }
+
+    # NORMALIZATION PER STASIUN (FIT HANYA PADA TRAIN SPLIT)
+    with telemetry.stage("scale"):
+        scaler_X = StationScaler.fit([splits[name][0] for name in stations])
+        scaler_y = StationScaler.fit([splits[name][2] for name in stations])
+
+    # SEQUENCES: VALIDASI = EKOR TRAIN SPLIT TIAP STASIUN (validation_split PER STASIUN,
+    # BUKAN EKOR ARRAY GABUNGAN YANG HANYA BERISI STASIUN TERAKHIR)
+    fit_parts, val_parts, test_parts = [], [], []
+    with telemetry.stage("sequence"):
+        for i, name in enumerate(stations):
+            X_train, X_test, y_train, y_test = splits[name]
+            Xtr_s, ytr_s = make_sequences(
+                scaler_X.transform(X_train, i), scaler_y.transform(y_train, i), time_step
+            )
+            Xte_s, yte_s = make_sequences(
+                scaler_X.transform(X_test, i), scaler_y.transform(y_test, i), time_step
+            )
+            if len(Xtr_s) < 2:
+                raise ValueError(
+                    f"Station '{name}' has too few rows for time_step={time_step}."
+                )
+            n_fit = min(len(Xtr_s) - 1, int(np.ceil(len(Xtr_s) * (1.0 - validation_split))))
+            Xtr_s = station_one_hot(Xtr_s, i, n_stations)
+            fit_parts.append((Xtr_s[:n_fit], ytr_s[:n_fit]))
+            val_parts.append((Xtr_s[n_fit:], ytr_s[n_fit:]))
+            if len(Xte_s):
+                test_parts.append(
+                    (station_one_hot(Xte_s, i, n_stations), yte_s, np.full(len(Xte_s), i))
+                )
+        if not test_parts:
+            raise ValueError("Test split is empty for every station; lower time_step.")
+        Xfit, yfit = (np.concatenate(a) for a in zip(*fit_parts))
+        Xval, yval = (np.concatenate(a) for a in zip(*val_parts))
+        Xte, yte, ste = (np.concatenate(a) for a in zip(*test_parts))
+
+    model = build_model(
+        input_steps=time_step,
+        n_features=Xfit.shape[2],
+        n_targets=yfit.shape[1],
+        dropout=dropout,
+        lstm_units=lstm_units,
+        learning_rate=learning_rate,
+    )
+    es = EarlyStopping(monitor="val_loss", patience=patience, restore_best_weights=True)
+    with telemetry.stage("fit"):
+        # SHUFFLE: TANPA INI SATU EPOCH MELIHAT STASIUN SATU PER SATU SECARA BERURUTAN
+        model.fit(
+            Xfit,
+            yfit,
+            epochs=epochs,
+            batch_size=batch_size,
+            validation_data=(Xval, yval),
+            callbacks=[es, telemetry.callback(len(Xfit), epochs, es)],
+            verbose=1,
+            shuffle=True,
+        )
+
+    with telemetry.stage("evaluate"):
+        prediction_result = scaler_y.inverse_transform(model.predict(Xte, verbose=0), ste)
+        ytrue = scaler_y.inverse_transform(yte, ste)
+        metrics = _metrics_table(ytrue, prediction_result)
+        # PER STASIUN HANYA OVERALL (evaluation.json TETAP BERFORMAT PER POLUTAN)
+        station_metrics = {}
+        for i, name in enumerate(stations):
+            rows = ste == i
+            if rows.sum() > 1:
+                station_metrics[name] = _metrics_table(
+                    ytrue[rows], prediction_result[rows], verbose=False
+                )["Overall"]
+
+    backtest_result = _run_backtest(
+        telemetry,
+        model,
+        scaler_X,
+        scaler_y,
+        {
+            "time_step": time_step,
+            "features": features,
+            "targets": targets,
+            "stations": stations,
+        },
+        {name: g.set_index("Tanggal")[features] for name, g in groups.items()},
+        test_size,
+    )
+
+    telemetry.info.update(
+        rows=len(df),
+        stations=n_stations,
+        train_sequences=len(Xfit) + len(Xval),
+        fit_samples=len(Xfit),
+        test_sequences=len(Xte),
+        n_features=Xfit.shape[2],
+        best_epoch=(es.best_epoch + 1) if es.best is not None else None,
+        stopped_early=es.stopped_epoch > 0,
+    )
+
+    # SEED WINDOW PER STASIUN (FORMAT PANJANG, DICEK SEBELUM MENYIMPAN APAPUN)
+    seeds = []
+    for name, g in groups.items():
+        seed = g.set_index("Tanggal")[features].apply(pd.to_numeric, errors="coerce")
+        seed = seed.iloc[-time_step:]
+        if len(seed) < time_step or seed.isna().any().any():
+            raise ValueError(f"Seed window for station '{name}' is incomplete or has NaNs.")
+        seeds.append(seed.assign(**{STATION_COL: name}))
+    seed_windows = pd.concat(seeds)[[STATION_COL, *features]]
+
+    print("Saving model...")
+    model_dir = Path(BASE_DIR / "models" / model_name)
+    print(model_dir)
+
+    if precision_variants:
+        # TFLITE DIEKSPOR DENGAN BATCH=1, TIDAK COCOK DENGAN ROLLOUT BATCH SEMUA STASIUN
+        print("Precision variants skipped: not supported for multi-station models.")
+
+    metadata = {
+        "time_step": time_step,
+        "features": features,
+        "targets": poluttants,
+        "stations": stations,
+        "station_encoding": "one_hot",
+        "n_inputs": int(Xfit.shape[2]),
+        "station_metrics": station_metrics,
+        "hyperparameters": {
+            "time_step": time_step,
+            "batch_size": batch_size,
+            "epochs": epochs,
+            "validation_split": validation_split,
+            "patience": patience,
+            "learning_rate": learning_rate,
+            "dropout": dropout,
+            "lstm_units": lstm_units,
+            "test_size": test_size,
+        },
+        "trained_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    # FOLDER BARU DARI STAGING: ARTEFAK MODEL SATU-STASIUN LAMA TIDAK IKUT TERBAWA
+    with _staged_model_dir(model_dir) as SAVE_DIR:
+        # TRAINING LOKAL: WATCHER REGISTRY TIDAK MENGGANTI FOLDER INI SEBELUM DIPUBLISH
+        _write_json(SAVE_DIR / REGISTRY_ORIGIN_FILENAME, {"local_training": True})
+        with telemetry.stage("save"):
+            model.save(SAVE_DIR / "bilstm_model.keras")
+            save_station_scalers(SAVE_DIR / STATION_SCALERS_FILENAME, scaler_X, scaler_y)
+            seed_windows.to_csv(SAVE_DIR / STATION_SEEDS_FILENAME, index=True)
+            metadata["variants"] = {
+                "float32": {
+                    "file": "bilstm_model.keras",
+                    "size_bytes": (SAVE_DIR / "bilstm_model.keras").stat().st_size,
+                    "weights_bytes": int(sum(w.nbytes for w in model.get_weights())),
+                    "overall": metrics["Overall"],
+                }
+            }
+            # TANPA BUNDLE: FORMAT BUNDLE MENYIMPAN SCALER SKLEARN TUNGGAL
+            _write_json(SAVE_DIR / "evaluation.json", metrics)
+            _write_json(SAVE_DIR / "metadata.json", metadata)
+            if backtest_result is not None:
+                _write_json(SAVE_DIR / BACKTEST_FILENAME, backtest_result)
+
+        report = telemetry.report(model_name=model_name, batch_size=batch_size)
+        _write_json(SAVE_DIR / TRAINING_REPORT_FILENAME, report)
+    print(
+        f"Training finished in {report['wall_seconds']:.1f}s | stations={n_stations} | epochs={report['epochs_run']}"
+    )
+    register_model(model_dir)
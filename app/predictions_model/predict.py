@@ -1,16 +1,28 @@
 # predictions_model/predict.py
 import json
 import os
+import statistics
+import threading
+import time
+from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
 import joblib
 import numpy as np
 import pandas as pd
 
 os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
+import tensorflow as tf
 from keras.models import load_model
 
+# ? https://ai.google.dev/edge/litert/migration (tf.lite.Interpreter deprecated)
+try:
+    from ai_edge_litert.interpreter import Interpreter as TFLiteInterpreter
+except ImportError:
+    TFLiteInterpreter = tf.lite.Interpreter
+
 pollutants = ["PM10", "SO2", "CO", "O3", "NO2"]
 meteorology = [
     "Temperatur",
@@ -20,9 +32,29 @@ meteorology = [
     "Kecepatan Angin",
 ]
 
+from predictions_model.bundle import (
+    BUNDLE_FILENAME,
+    bundle_model,
+    bundle_scalers,
+    bundle_seed_window,
+    read_inference_bundle,
+)
+from predictions_model.stations import (
+    STATION_COL,
+    STATION_SCALERS_FILENAME,
+    is_station_model,
+    load_station_scalers,
+    load_station_seeds,
+    station_one_hot,
+)
+from utils.metrics import cache_event, stage_timer
+from utils.seed_windows import live_seed_window
+from utils.tracing import span
 from utils.predict_utils import (
+    INFERENCE_FILENAME,
     _ensure_datetime_index,
     _first_existing,
+    _inference_selection,
     _preprocess_history,
 )
 
@@ -50,14 +82,38 @@ def load_saved_model(model_dir: str | Path) -> Tuple[object, object, object, dic
     if not model_dir.is_absolute():
         model_dir = MODELS_ROOT / model_dir
 
+    # PRIORITASKAN BUNDLE (SATU FILE, MEMORY-MAPPED)
+    BUNDLE_PATH = model_dir / BUNDLE_FILENAME
+    if BUNDLE_PATH.exists():
+        manifest, arrays = read_inference_bundle(BUNDLE_PATH)
+        model = bundle_model(manifest, arrays)
+        scaler_X, scaler_y = bundle_scalers(manifest, arrays)
+        metadata = manifest["metadata"]
+        # METADATA.JSON BISA BERUBAH SETELAH TRAINING (MIS. PILIHAN BACKEND)
+        METADATA_PATH = model_dir / "metadata.json"
+        if METADATA_PATH.exists():
+            with open(METADATA_PATH, "r") as f:
+                metadata = json.load(f)
+        return model, scaler_X, scaler_y, metadata
+
     MODEL_PATH = model_dir / "bilstm_model.keras"
+    METADATA_PATH = model_dir / "metadata.json"
+
+    # MODEL MULTI-STASIUN: SCALER PER STASIUN (predictions_model/stations.py)
+    STATION_SCALERS_PATH = model_dir / STATION_SCALERS_FILENAME
+    if STATION_SCALERS_PATH.exists() and METADATA_PATH.exists():
+        with open(METADATA_PATH, "r") as f:
+            metadata = json.load(f)
+        if is_station_model(metadata):
+            scaler_X, scaler_y = load_station_scalers(STATION_SCALERS_PATH)
+            return load_model(MODEL_PATH), scaler_X, scaler_y, metadata
+
     SCALER_X_PATH = _first_existing(
         model_dir / "scaler_X.joblib", model_dir / "scaler_x.joblib"
     )
     SCALER_Y_PATH = _first_existing(
         model_dir / "scaler_Y.joblib", model_dir / "scaler_y.joblib"
     )
-    METADATA_PATH = model_dir / "metadata.json"
 
     if not MODEL_PATH.exists():
         raise FileNotFoundError(f"Model file not found: {MODEL_PATH}")
@@ -73,17 +129,227 @@ def load_saved_model(model_dir: str | Path) -> Tuple[object, object, object, dic
     return model, scaler_X, scaler_y, metadata
 
 
+# BACKEND INFERENSI
+# Setiap factory menerima (model, model_dir, input_shape) dan mengembalikan
+# fungsi x -> y (np.ndarray float32, batch pertama) untuk satu langkah prediksi.
+TFLITE_FILENAME = "bilstm_model.tflite"
+DEFAULT_BACKEND = "keras_predict"
+
+
+def _backend_keras_predict(model, model_dir: Path, input_shape) -> Callable:
+    return lambda x: model.predict(x, verbose=0)
+
+
+def _backend_direct(model, model_dir: Path, input_shape) -> Callable:
+    return lambda x: model(x, training=False).numpy()
+
+
+def _signature(input_shape) -> List[tf.TensorSpec]:
+    return [tf.TensorSpec([None, *input_shape[1:]], tf.float32)]
+
+
+def _backend_tf_function(model, model_dir: Path, input_shape) -> Callable:
+    fn = tf.function(
+        lambda x: model(x, training=False), input_signature=_signature(input_shape)
+    )
+    return lambda x: fn(tf.convert_to_tensor(x, dtype=tf.float32)).numpy()
+
+
+def _backend_xla(model, model_dir: Path, input_shape) -> Callable:
+    fn = tf.function(
+        lambda x: model(x, training=False),
+        input_signature=_signature(input_shape),
+        jit_compile=True,
+    )
+    return lambda x: fn(tf.convert_to_tensor(x, dtype=tf.float32)).numpy()
+
+
+def _backend_tflite(
+    model, model_dir: Path, input_shape, filename: str = TFLITE_FILENAME
+) -> Callable:
+    path = Path(model_dir) / filename
+    if not path.exists():
+        raise FileNotFoundError(f"TFLite model not found: {path}")
+    interpreter = TFLiteInterpreter(model_path=str(path))
+    interpreter.allocate_tensors()
+    inp = interpreter.get_input_details()[0]["index"]
+    out = interpreter.get_output_details()[0]["index"]
+    lock = threading.Lock()
+
+    # MODEL TFLITE DIEKSPOR DENGAN BATCH=1, JADI BATCH > 1 DIJALANKAN PER SAMPEL
+    def run(x):
+        x = np.asarray(x, dtype=np.float32)
+        rows = []
+        with lock:
+            for i in range(x.shape[0]):
+                interpreter.set_tensor(inp, x[i : i + 1])
+                interpreter.invoke()
+                rows.append(interpreter.get_tensor(out).copy())
+        return np.concatenate(rows, axis=0)
+
+    return run
+
+
+INFERENCE_BACKENDS: Dict[str, Callable] = {
+    "keras_predict": _backend_keras_predict,
+    "direct": _backend_direct,
+    "tf_function": _backend_tf_function,
+    "xla": _backend_xla,
+    "tflite": _backend_tflite,
+    # VARIAN PRESISI RENDAH (DIBUAT OLEH train_model(precision_variants=...))
+    "tflite_float16": partial(_backend_tflite, filename="bilstm_model_float16.tflite"),
+    "tflite_int8": partial(_backend_tflite, filename="bilstm_model_int8.tflite"),
+}
+# HASILNYA BERBEDA DARI FLOAT32, JADI HANYA BISA DIPILIH LEWAT OVERRIDE ADMIN
+REDUCED_PRECISION_BACKENDS = {"tflite_float16", "tflite_int8"}
+
+
+def _resolve_model_dir(model_dir: str | Path) -> Path:
+    model_dir = Path(model_dir)
+    return model_dir if model_dir.is_absolute() else MODELS_ROOT / model_dir
+
+
+def _runtime_signature(model_dir: Path) -> tuple:
+    sig = []
+    for name in (BUNDLE_FILENAME, "bilstm_model.keras", "metadata.json", INFERENCE_FILENAME):
+        p = model_dir / name
+        sig.append(p.stat().st_mtime_ns if p.exists() else None)
+    return tuple(sig)
+
+
+def model_signature(model_dir: str | Path) -> tuple:
+    """mtime file model + inference.json; berubah setiap kali model ditulis ulang."""
+    return _runtime_signature(_resolve_model_dir(model_dir))
+
+
+_RUNTIME_CACHE: Dict[Path, tuple] = {}
+_RUNTIME_LOCK = threading.Lock()
+
+
+def load_inference_runtime(model_dir: str | Path) -> Tuple[Callable, object, object, dict]:
+    """
+    Model + scaler + metadata yang sudah siap pakai, di-cache per folder model.
+    Cache otomatis invalid jika bundle/model/metadata berubah (mtime).
+    Backend diambil dari inference.json (model lama: metadata["inference"]),
+    default keras_predict.
+    """
+    model_dir = _resolve_model_dir(model_dir)
+    signature = _runtime_signature(model_dir)
+    with _RUNTIME_LOCK:
+        cached = _RUNTIME_CACHE.get(model_dir)
+        if cached is not None and cached[0] == signature:
+            cache_event("inference_runtime", hit=True)
+            return cached[1]
+        cache_event("inference_runtime", hit=False)
+
+        with stage_timer("model_load"):
+            model, scaler_X, scaler_y, metadata = load_saved_model(model_dir)
+        # MODEL MULTI-STASIUN: INPUT = FITUR + ONE-HOT STASIUN (metadata["n_inputs"])
+        n_inputs = int(metadata.get("n_inputs", len(metadata["features"])))
+        input_shape = (1, int(metadata["time_step"]), n_inputs)
+        backend = _inference_selection(model_dir, metadata).get("backend", DEFAULT_BACKEND)
+        try:
+            predict_fn = INFERENCE_BACKENDS[backend](model, model_dir, input_shape)
+        except Exception as e:
+            print(f"Backend '{backend}' unavailable ({e}); using {DEFAULT_BACKEND}.")
+            predict_fn = INFERENCE_BACKENDS[DEFAULT_BACKEND](
+                model, model_dir, input_shape
+            )
+
+        runtime = (predict_fn, scaler_X, scaler_y, metadata)
+        _RUNTIME_CACHE[model_dir] = (signature, runtime)
+        return runtime
+
+
+def benchmark_inference_backends(
+    model_dir: str | Path,
+    repeats: int = 30,
+    warmup: int = 3,
+    rtol: float = 1e-3,
+    atol: float = 1e-4,
+) -> dict:
+    """
+    Micro-benchmark semua backend dengan input berbentuk window asli model.
+    Backend hanya boleh dipilih jika outputnya cocok dengan model(x) langsung.
+    """
+    model_dir = _resolve_model_dir(model_dir)
+    model, scaler_X, _, metadata = load_saved_model(model_dir)
+    time_step = int(metadata["time_step"])
+    feat_cols = list(metadata["features"])
+
+    if is_station_model(metadata):
+        # MODEL MULTI-STASIUN: BATCH SEMUA STASIUN, BENTUK INPUT YANG BENAR-BENAR DILAYANI
+        stations = list(metadata["stations"])
+        idx = np.arange(len(stations))
+        window = load_station_seeds(model_dir, stations, feat_cols, time_step)
+        x = station_one_hot(scaler_X.transform(window, idx), idx, len(stations))
+        x = x.astype(np.float32)
+    else:
+        window = load_seed_window(model_dir, feat_cols, time_step)
+        x = scaler_X.transform(window[feat_cols].values)[np.newaxis, :, :].astype(
+            np.float32
+        )
+    reference = model(x, training=False).numpy()
+
+    results: Dict[str, dict] = {}
+    for name, factory in INFERENCE_BACKENDS.items():
+        try:
+            fn = factory(model, model_dir, x.shape)
+            for _ in range(warmup):
+                out = fn(x)
+            matches = bool(np.allclose(out, reference, rtol=rtol, atol=atol))
+            timings = []
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                fn(x)
+                timings.append((time.perf_counter() - t0) * 1000.0)
+            results[name] = {
+                "median_ms": statistics.median(timings),
+                "p95_ms": float(np.percentile(timings, 95)),
+                "max_abs_diff": float(np.max(np.abs(out - reference))),
+                "matches": matches,
+            }
+        except Exception as e:
+            results[name] = {"error": str(e), "matches": False}
+
+    candidates = [
+        n
+        for n, r in results.items()
+        if r.get("matches") and n not in REDUCED_PRECISION_BACKENDS
+    ]
+    best = min(candidates, key=lambda n: results[n]["median_ms"], default=None)
+    return {
+        "backend": best or DEFAULT_BACKEND,
+        "selected_by": "benchmark",
+        "selected_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "input_shape": list(x.shape),
+        "benchmark": results,
+    }
+
+
 # SEED WINDOWS KALAU TIDAK DIBERIKAN DATA POLUTAN
 def load_seed_window(
-    model_dir: str | Path, feat_cols: List[str], time_step: int
+    model_dir: str | Path, feat_cols: List[str], time_step: int, live: bool = True
 ) -> pd.DataFrame:
+    # OBSERVASI TERBARU DARI DREMIO (utils/seed_windows.py) JIKA TERSEDIA,
+    # SELAIN ITU SEED WINDOW STATIS HASIL TRAINING
+    if live:
+        window = live_seed_window(
+            feat_cols, [c for c in feat_cols if c in pollutants], time_step
+        )
+        if window is not None:
+            return window
+
     model_dir = (
         Path(model_dir) if Path(model_dir).is_absolute() else MODELS_ROOT / model_dir
     )
 
+    bundle = model_dir / BUNDLE_FILENAME
     csv = model_dir / "seed_window.csv"
 
-    if csv.exists():
+    if bundle.exists():
+        df = bundle_seed_window(*read_inference_bundle(bundle))
+    elif csv.exists():
         df = pd.read_csv(csv)
         if "Tanggal" in df.columns:
             df["Tanggal"] = pd.to_datetime(df["Tanggal"])
@@ -108,7 +374,7 @@ def predict_future_pollutants(
     model_dir: str | Path,
 ) -> pd.DataFrame:
 
-    model, scaler_X, scaler_y, metadata = load_saved_model(model_dir)
+    predict_fn, scaler_X, scaler_y, metadata = load_inference_runtime(model_dir)
     time_step: int = int(metadata["time_step"])
     feat_cols: List[str] = list(metadata["features"])
     target_cols: List[str] = list(metadata["targets"])
@@ -123,7 +389,8 @@ def predict_future_pollutants(
             raise ValueError(
                 f"df_hist is missing required feature columns: {missing_hist}"
             )
-        hist_feats = _preprocess_history(df_hist, feat_cols, target_cols)
+        with stage_timer("preprocess_history"):
+            hist_feats = _preprocess_history(df_hist, feat_cols, target_cols)
         window = hist_feats.iloc[-time_step:].copy(deep=True)
     else:
         # KALAU TIDAK ADA HISTORY PAKE SEED WINDOW
@@ -145,70 +412,75 @@ def predict_future_pollutants(
 
     preds_out: List[tuple] = []
 
-    for dt, row in df_meteorology.iterrows():
-        new_row = pd.Series(index=feat_cols, dtype=float)
-
-        # MASUKIN METEOROLOGI
-        for m in meteorology:
-            val = row[m]
-            if pd.isna(val):
-                raise ValueError(
-                    f"Future meteorology has NaN/invalid value on {pd.to_datetime(dt).date()} for '{m}'."
+    for step, (dt, row) in enumerate(df_meteorology.iterrows()):
+        # SATU SPAN PER LANGKAH ROLLOUT
+        with span("rollout.step", step=step, date=str(pd.to_datetime(dt).date())):
+            new_row = pd.Series(index=feat_cols, dtype=float)
+
+            # MASUKIN METEOROLOGI
+            for m in meteorology:
+                val = row[m]
+                if pd.isna(val):
+                    raise ValueError(
+                        f"Future meteorology has NaN/invalid value on {pd.to_datetime(dt).date()} for '{m}'."
+                    )
+                new_row[m] = float(val)
+
+            # PLACEHOLDER UNTUK PREDIKSI
+            for prediction in target_cols:
+                new_row[prediction] = np.nan
+
+            new_row_df = pd.DataFrame([new_row], index=[pd.to_datetime(dt)])
+            next_window_uns = (
+                pd.concat(
+                    [
+                        pd.DataFrame(window.values, columns=feat_cols, index=window.index),
+                        new_row_df,
+                    ],
+                    axis=0,
                 )
-            new_row[m] = float(val)
-
-        # PLACEHOLDER UNTUK PREDIKSI
-        for prediction in target_cols:
-            new_row[prediction] = np.nan
-
-        new_row_df = pd.DataFrame([new_row], index=[pd.to_datetime(dt)])
-        next_window_uns = (
-            pd.concat(
-                [
-                    pd.DataFrame(window.values, columns=feat_cols, index=window.index),
-                    new_row_df,
-                ],
-                axis=0,
+                .iloc[-time_step:]
+                .copy(deep=True)
             )
-            .iloc[-time_step:]
-            .copy(deep=True)
-        )
 
-        if next_window_uns.iloc[:-1].isna().any().any():
-            next_window_uns.iloc[:-1] = next_window_uns.iloc[:-1].ffill().bfill()
-
-        prev_vals = next_window_uns.iloc[-2][target_cols].to_numpy(dtype=float)
-        col_idx = [next_window_uns.columns.get_loc(c) for c in target_cols]
-        next_window_uns.iloc[-1, col_idx] = prev_vals
-
-        if next_window_uns.isna().any().any():
-            bad = next_window_uns.isna()
-            bad_locs = []
-            for r in range(bad.shape[0]):
-                cols = bad.columns[bad.iloc[r]].tolist()
-                if cols:
-                    bad_locs.append(f"{next_window_uns.index[r]} -> {cols}")
-            raise ValueError("NaNs remain before scaling: " + "; ".join(bad_locs))
-
-        # SCALE
-        X_step_scaled = scaler_X.transform(next_window_uns.values)[np.newaxis, :, :]
-        y_next_scaled = model.predict(X_step_scaled, verbose=0)
-        y_next = scaler_y.inverse_transform(y_next_scaled)[0]
-
-        # SIMPAN HASIL PREDIKSI
-        preds_out.append(
-            (pd.to_datetime(dt), dict(zip(target_cols, map(float, y_next))))
-        )
+            if next_window_uns.iloc[:-1].isna().any().any():
+                next_window_uns.iloc[:-1] = next_window_uns.iloc[:-1].ffill().bfill()
+
+            prev_vals = next_window_uns.iloc[-2][target_cols].to_numpy(dtype=float)
+            col_idx = [next_window_uns.columns.get_loc(c) for c in target_cols]
+            next_window_uns.iloc[-1, col_idx] = prev_vals
+
+            if next_window_uns.isna().any().any():
+                bad = next_window_uns.isna()
+                bad_locs = []
+                for r in range(bad.shape[0]):
+                    cols = bad.columns[bad.iloc[r]].tolist()
+                    if cols:
+                        bad_locs.append(f"{next_window_uns.index[r]} -> {cols}")
+                raise ValueError("NaNs remain before scaling: " + "; ".join(bad_locs))
+
+            # SCALE
+            with stage_timer("scale"):
+                X_step_scaled = scaler_X.transform(next_window_uns.values)[np.newaxis, :, :]
+            with stage_timer("model_predict"):
+                y_next_scaled = predict_fn(X_step_scaled.astype(np.float32))
+            with stage_timer("inverse_scale"):
+                y_next = scaler_y.inverse_transform(y_next_scaled)[0]
+
+            # SIMPAN HASIL PREDIKSI
+            preds_out.append(
+                (pd.to_datetime(dt), dict(zip(target_cols, map(float, y_next))))
+            )
 
-        final_next_row = new_row.copy()
-        for ip, prediction in enumerate(target_cols):
-            final_next_row[prediction] = float(y_next[ip])
+            final_next_row = new_row.copy()
+            for ip, prediction in enumerate(target_cols):
+                final_next_row[prediction] = float(y_next[ip])
 
-        window = (
-            pd.concat([window, final_next_row.to_frame().T], axis=0)
-            .iloc[-time_step:]
-            .copy(deep=True)
-        )
+            window = (
+                pd.concat([window, final_next_row.to_frame().T], axis=0)
+                .iloc[-time_step:]
+                .copy(deep=True)
+            )
 
     # Build output
     if not preds_out:
@@ -267,12 +539,27 @@ def extend_meteorology(
     return ext.reset_index()
 
 
+def persistence_meteorology(df_seed: pd.DataFrame, days: int = 7) -> pd.DataFrame:
+    """
+    Cuaca minggu-1 tanpa input user: `days` hari terakhir dari seed window
+    diulang mulai hari setelah observasi terakhir (format sama dengan create_meteorology_df).
+    """
+    seed = _ensure_datetime_index(df_seed).sort_index()
+    last = seed[meteorology].iloc[-days:]
+    if len(last) < days:
+        raise ValueError(f"Seed window has {len(last)} rows, need {days} for meteorology.")
+    tanggal = pd.date_range(seed.index.max() + pd.Timedelta(days=1), periods=days, freq="D")
+    df = last.reset_index(drop=True)
+    df.insert(0, "Tanggal", tanggal)
+    return df
+
+
 def prepare_history_from_user(
     history_df: pd.DataFrame,
     model_dir: str | Path,
 ) -> pd.DataFrame:
 
-    _, _, _, metadata = load_saved_model(model_dir)
+    _, _, _, metadata = load_inference_runtime(model_dir)
     features_cols = list(metadata["features"])
     target_cols = list(metadata["targets"])
     time_step = int(metadata["time_step"])
@@ -309,7 +596,7 @@ def predict_next_week(
     df_future_met_week1: pd.DataFrame,
 ) -> pd.DataFrame:
 
-    _, _, _, metadata = load_saved_model(model_dir)
+    _, _, _, metadata = load_inference_runtime(model_dir)
     features_cols = list(metadata["features"])
     target_cols = list(metadata["targets"])
     time_step = int(metadata["time_step"])
@@ -339,11 +626,14 @@ def predict_pollutants(
 
     # ? DEFAULT MODEL
     model_dir = read_active_model_name() if model_dir is None else model_dir
+    if is_station_model(load_inference_runtime(model_dir)[3]):
+        raise ValueError("Model is multi-station; use /model/predict/stations.")
 
     # CEK APAKAH ADA HISTORY
     df_history = None
     if df_history_from_user is not None:
-        df_history = prepare_history_from_user(df_history_from_user, model_dir)
+        with stage_timer("prepare_history"):
+            df_history = prepare_history_from_user(df_history_from_user, model_dir)
 
     input_prediction = predict_future_pollutants(
         df_hist=df_history,
@@ -358,7 +648,7 @@ def predict_pollutants(
             df_future_met_week1=df_meteorology,
         )
     else:
-        _, _, _, metadata = load_saved_model(model_dir)
+        _, _, _, metadata = load_inference_runtime(model_dir)
         feat_cols = list(metadata["features"])
         target_cols = list(metadata["targets"])
         w1_met = _ensure_datetime_index(df_meteorology)
@@ -384,6 +674,256 @@ def predict_pollutants(
     return input_prediction, future_prediction, predictions
 
 
+# =========================
+# MULTI-STASIUN (BATCH)
+# =========================
+def _stations_meteorology(
+    df_meteorology: pd.DataFrame, stations: List[str], extra_days: int = 7
+) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+    """
+    (tanggal, cuaca (S, H, 5)): minggu-1 dari df_meteorology (sama untuk semua stasiun,
+    atau per stasiun jika ada kolom Stasiun) + extra_days hari baris terakhir diulang
+    (sama seperti extend_meteorology).
+    """
+    df = _ensure_datetime_index(df_meteorology)
+    missing = [m for m in meteorology if m not in df.columns]
+    if missing:
+        raise ValueError(f"df_meteorology missing required columns: {missing}")
+    values = df[meteorology].apply(pd.to_numeric, errors="coerce")
+
+    if STATION_COL in df.columns:
+        names = df[STATION_COL].astype(str).str.strip().to_numpy()
+        dates = pd.DatetimeIndex(df.index.unique().sort_values())
+        met = np.empty((len(stations), len(dates), len(meteorology)))
+        for i, name in enumerate(stations):
+            rows = values[names == name]
+            if not rows.index.equals(dates):
+                raise ValueError(
+                    f"Meteorology for station '{name}' must cover every date "
+                    f"{dates.min().date()}..{dates.max().date()} exactly once."
+                )
+            met[i] = rows.to_numpy()
+    else:
+        dates = pd.DatetimeIndex(values.index)
+        met = np.broadcast_to(values.to_numpy(), (len(stations), *values.shape))
+
+    if np.isnan(met).any():
+        raise ValueError("Future meteorology has NaN/invalid values.")
+    ext_dates = pd.date_range(dates.max() + pd.Timedelta(days=1), periods=extra_days, freq="D")
+    met = np.concatenate([met, np.repeat(met[:, -1:], extra_days, axis=1)], axis=1)
+    return dates.append(ext_dates), met
+
+
+def rollout_steps(
+    predict_fn: Callable,
+    transform_x: Callable[[np.ndarray], np.ndarray],
+    inverse_y: Callable[[np.ndarray], np.ndarray],
+    window: np.ndarray,
+    met: np.ndarray,
+    feat_cols: List[str],
+    target_cols: List[str],
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Rollout autoregresif banyak deret sekaligus: window (B, time_step, F) dan cuaca
+    (B, H, 5); yield (langkah, prediksi (B, target)) begitu langkah selesai.
+    Satu forward pass (batch B) per langkah; logika per langkah sama dengan
+    predict_future_pollutants (placeholder target = hari sebelumnya).
+    transform_x: window mentah -> input model (scaling, one-hot);
+    inverse_y: output model -> nilai asli.
+    """
+    met_idx = [feat_cols.index(m) for m in meteorology]
+    tgt_idx = [feat_cols.index(c) for c in target_cols]
+    n, horizon = window.shape[0], met.shape[1]
+
+    for step in range(horizon):
+        with span("rollout.step", step=step, batch=n):
+            new_row = np.empty((n, 1, window.shape[2]))
+            new_row[:, 0, met_idx] = met[:, step]
+            new_row[:, 0, tgt_idx] = window[:, -1, tgt_idx]
+            window = np.concatenate([window[:, 1:], new_row], axis=1)
+
+            with stage_timer("scale"):
+                X_step = transform_x(window)
+            with stage_timer("model_predict"):
+                y_scaled = predict_fn(X_step.astype(np.float32))
+            with stage_timer("inverse_scale"):
+                y_next = inverse_y(np.asarray(y_scaled))
+
+            window[:, -1, tgt_idx] = y_next
+        yield step, y_next
+
+
+def rollout_batch(
+    predict_fn: Callable,
+    transform_x: Callable[[np.ndarray], np.ndarray],
+    inverse_y: Callable[[np.ndarray], np.ndarray],
+    window: np.ndarray,
+    met: np.ndarray,
+    feat_cols: List[str],
+    target_cols: List[str],
+) -> np.ndarray:
+    """rollout_steps dikumpulkan -> (B, H, target). Dipakai predict_stations dan backtest."""
+    preds = np.empty((window.shape[0], met.shape[1], len(target_cols)))
+    for step, y_next in rollout_steps(
+        predict_fn, transform_x, inverse_y, window, met, feat_cols, target_cols
+    ):
+        preds[:, step] = y_next
+    return preds
+
+
+def batch_transforms(scaler_X, scaler_y, metadata: dict, station_idx=None):
+    """
+    (transform_x, inverse_y) untuk rollout_batch: scaler sklearn (model satu deret)
+    atau StationScaler + one-hot (model multi-stasiun, station_idx per baris batch).
+    """
+    if is_station_model(metadata):
+        n_stations = len(metadata["stations"])
+
+        def transform_x(window):
+            scaled = scaler_X.transform(window, station_idx)
+            return station_one_hot(scaled, station_idx, n_stations)
+
+        return transform_x, lambda y: scaler_y.inverse_transform(y, station_idx)
+
+    def transform_x(window):
+        return scaler_X.transform(window.reshape(-1, window.shape[2])).reshape(window.shape)
+
+    return transform_x, scaler_y.inverse_transform
+
+
+def _stations_rollout(
+    df_meteorology: pd.DataFrame,
+    model_dir: str | Path | None,
+    stations: List[str] | None,
+):
+    """Input rollout_steps untuk model multi-stasiun (validasi dilakukan di sini)."""
+    model_dir = read_active_model_name() if model_dir is None else model_dir
+    predict_fn, scaler_X, scaler_y, metadata = load_inference_runtime(model_dir)
+    if not is_station_model(metadata):
+        raise ValueError("Model is not a multi-station model; use predict_pollutants.")
+    time_step = int(metadata["time_step"])
+    feat_cols: List[str] = list(metadata["features"])
+    target_cols: List[str] = list(metadata["targets"])
+    all_stations: List[str] = list(metadata["stations"])
+
+    position = {name: i for i, name in enumerate(all_stations)}
+    selected = all_stations if stations is None else list(dict.fromkeys(stations))
+    unknown = [name for name in selected if name not in position]
+    if unknown:
+        raise ValueError(f"Unknown stations: {unknown}")
+    station_idx = np.array([position[name] for name in selected], dtype=np.int64)
+
+    with stage_timer("load_seed_window"):
+        window = load_station_seeds(
+            _resolve_model_dir(model_dir), selected, feat_cols, time_step
+        )
+    dates, met = _stations_meteorology(df_meteorology, selected)
+    transform_x, inverse_y = batch_transforms(scaler_X, scaler_y, metadata, station_idx)
+    args = (predict_fn, transform_x, inverse_y, window, met, feat_cols, target_cols)
+    return args, dates, selected
+
+
+def predict_stations(
+    df_meteorology: pd.DataFrame,
+    model_dir: str | Path | None = None,
+    stations: List[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Forecast 14 hari (cuaca minggu-1 + 7 hari persistence) untuk semua stasiun model
+    multi-stasiun (atau subset `stations`) dalam satu rollout batch.
+    Return format panjang: Tanggal, Stasiun, target.
+    """
+    args, dates, selected = _stations_rollout(df_meteorology, model_dir, stations)
+    target_cols = args[-1]
+    preds = rollout_batch(*args)
+
+    n, horizon = preds.shape[:2]
+    out = pd.DataFrame(preds.reshape(n * horizon, -1), columns=target_cols)
+    out.insert(0, STATION_COL, np.repeat(np.array(selected, dtype=object), horizon))
+    out.insert(0, "Tanggal", np.tile(dates.to_numpy(), n))
+    return out
+
+
+# =========================
+# STREAMING (NDJSON)
+# =========================
+# Generator per hari forecast: setup + validasi dijalankan saat fungsi dipanggil (error
+# muncul sebelum response dimulai), rollout berjalan saat generator diiterasi. Tidak
+# ada hasil yang dikumpulkan, jadi memori tetap (window + satu langkah) berapa pun
+# panjang horizon / jumlah stasiun.
+def stream_pollutants(
+    df_meteorology: pd.DataFrame,
+    model_dir: str | Path | None = None,
+    df_history_from_user: pd.DataFrame | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Forecast 14 hari yang sama dengan predict_pollutants sebagai satu rollout
+    kontinu; yield DataFrame satu baris (Tanggal, target) per hari.
+    """
+    model_dir = read_active_model_name() if model_dir is None else model_dir
+    predict_fn, scaler_X, scaler_y, metadata = load_inference_runtime(model_dir)
+    if is_station_model(metadata):
+        raise ValueError("Model is multi-station; use /model/predict/stations.")
+    time_step = int(metadata["time_step"])
+    feat_cols: List[str] = list(metadata["features"])
+    target_cols: List[str] = list(metadata["targets"])
+
+    if df_history_from_user is not None:
+        with stage_timer("prepare_history"):
+            df_history = prepare_history_from_user(df_history_from_user, model_dir)
+            window = _preprocess_history(df_history, feat_cols, target_cols)
+    else:
+        window = load_seed_window(model_dir, feat_cols, time_step)
+    window = window.iloc[-time_step:]
+    if window.isna().any().any():
+        bad_cols = window.columns[window.isna().any()].tolist()
+        raise ValueError(
+            "Initial window contains NaNs. Fix your seed_window or supply history. "
+            f"Affected columns: {bad_cols}"
+        )
+
+    # MINGGU-2 = BARIS TERAKHIR MINGGU-1 DIULANG (SAMA DENGAN extend_meteorology)
+    dates, met = _stations_meteorology(df_meteorology, [""])
+    transform_x, inverse_y = batch_transforms(scaler_X, scaler_y, metadata)
+    steps = rollout_steps(
+        predict_fn,
+        transform_x,
+        inverse_y,
+        window[feat_cols].to_numpy(np.float64)[np.newaxis],
+        np.asarray(met),
+        feat_cols,
+        target_cols,
+    )
+
+    def days():
+        for step, y_next in steps:
+            day = pd.DataFrame(y_next, columns=target_cols)
+            day.insert(0, "Tanggal", dates[step])
+            yield day
+
+    return days()
+
+
+def stream_stations(
+    df_meteorology: pd.DataFrame,
+    model_dir: str | Path | None = None,
+    stations: List[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """predict_stations per hari: yield DataFrame (Tanggal, Stasiun, target) S baris."""
+    args, dates, selected = _stations_rollout(df_meteorology, model_dir, stations)
+    target_cols = args[-1]
+    names = np.array(selected, dtype=object)
+
+    def days():
+        for step, y_next in rollout_steps(*args):
+            day = pd.DataFrame(y_next, columns=target_cols)
+            day.insert(0, STATION_COL, names)
+            day.insert(0, "Tanggal", dates[step])
+            yield day
+
+    return days()
+
+
 # ? TEST
 # future_dates = pd.date_range("2025-10-20", periods=7, freq="D")
 # df_future_met = make_future_met_df(
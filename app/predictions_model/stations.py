@@ -0,0 +1,134 @@
+# predictions_model/stations.py
+#
+# MODEL MULTI-STASIUN: SATU BiLSTM DIPAKAI BERSAMA OLEH SEMUA STASIUN.
+# - Data latih format panjang (Tanggal, Stasiun, 10 kolom); preprocessing dan split
+#   train/test kronologis dilakukan per stasiun (predictions_model/model.py).
+# - Scaling MinMax per stasiun (level polutan antar stasiun bisa sangat berbeda),
+#   disimpan sebagai array bertumpuk (S, F) supaya transform bisa tervektorisasi.
+# - Identitas stasiun = one-hot (S kolom) yang ditambahkan ke setiap langkah input,
+#   jadi input model (time_step, F + S).
+# - Inferensi: semua stasiun di-rollout sekaligus dengan input (S, time_step, F + S),
+#   satu forward pass per langkah (predictions_model/predict.py: predict_stations).
+# Modul ini sengaja tidak mengimpor model.py / predict.py (dipakai keduanya).
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.data_validation import DATE_COL, STATION_COL
+
+STATION_SCALERS_FILENAME = "station_scalers.npz"
+STATION_SEEDS_FILENAME = "seed_windows.csv"
+
+
+class StationScaler:
+    """
+    MinMaxScaler per stasiun: data_min / data_range berbentuk (S, F).
+    `stations` di transform/inverse_transform: indeks stasiun (int) untuk seluruh x,
+    atau array (n,) untuk x berbentuk (n, ..., F).
+    """
+
+    def __init__(self, data_min: np.ndarray, data_range: np.ndarray):
+        self.data_min = np.asarray(data_min, dtype=np.float64)
+        self.data_range = np.asarray(data_range, dtype=np.float64)
+
+    @classmethod
+    def fit(cls, blocks: Sequence[np.ndarray]) -> "StationScaler":
+        data_min = np.stack([np.nanmin(b, axis=0) for b in blocks])
+        data_range = np.stack([np.nanmax(b, axis=0) for b in blocks]) - data_min
+        # SAMA SEPERTI MinMaxScaler: KOLOM KONSTAN TIDAK DIBAGI NOL
+        data_range[data_range == 0.0] = 1.0
+        return cls(data_min, data_range)
+
+    @property
+    def n_stations(self) -> int:
+        return self.data_min.shape[0]
+
+    def _params(self, stations, ndim: int):
+        lo, span = self.data_min[stations], self.data_range[stations]
+        if np.ndim(stations) == 0:
+            return lo, span
+        shape = (lo.shape[0], *([1] * (ndim - 2)), lo.shape[1])
+        return lo.reshape(shape), span.reshape(shape)
+
+    def transform(self, x: np.ndarray, stations) -> np.ndarray:
+        lo, span = self._params(stations, np.ndim(x))
+        return (x - lo) / span
+
+    def inverse_transform(self, x: np.ndarray, stations) -> np.ndarray:
+        lo, span = self._params(stations, np.ndim(x))
+        return x * span + lo
+
+    @classmethod
+    def load(cls, path: Path, prefix: str) -> "StationScaler":
+        with np.load(path) as data:
+            return cls(data[f"{prefix}_min"], data[f"{prefix}_range"])
+
+
+def save_station_scalers(
+    path: Path, scaler_X: StationScaler, scaler_y: StationScaler
+) -> None:
+    """Satu file .npz untuk scaler fitur (x_*) dan target (y_*)."""
+    np.savez(
+        path,
+        x_min=scaler_X.data_min,
+        x_range=scaler_X.data_range,
+        y_min=scaler_y.data_min,
+        y_range=scaler_y.data_range,
+    )
+
+
+def load_station_scalers(path: Path):
+    return StationScaler.load(path, "x"), StationScaler.load(path, "y")
+
+
+def is_station_model(metadata: dict) -> bool:
+    return bool(metadata.get("stations"))
+
+
+def station_one_hot(x: np.ndarray, stations, n_stations: int) -> np.ndarray:
+    """x (n, T, F) + one-hot stasiun di setiap langkah -> (n, T, F + S)."""
+    n, steps = x.shape[0], x.shape[1]
+    one_hot = np.zeros((n, steps, n_stations), dtype=x.dtype)
+    one_hot[np.arange(n), :, np.broadcast_to(stations, (n,))] = 1.0
+    return np.concatenate([x, one_hot], axis=2)
+
+
+def split_stations(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """{stasiun: baris stasiun tersebut tanpa kolom Stasiun}, urut nama stasiun."""
+    names = df[STATION_COL].astype(str).str.strip()
+    df = df.drop(columns=[STATION_COL])
+    return {
+        name: group
+        for name, group in df.groupby(names.to_numpy(), sort=True)
+        if name != ""
+    }
+
+
+def station_seed_frame(model_dir: Path) -> pd.DataFrame:
+    """Seed window semua stasiun dalam format panjang (index Tanggal + kolom Stasiun)."""
+    df = pd.read_csv(Path(model_dir) / STATION_SEEDS_FILENAME)
+    df[DATE_COL] = pd.to_datetime(df[DATE_COL])
+    df[STATION_COL] = df[STATION_COL].astype(str)
+    return df.sort_values([STATION_COL, DATE_COL]).set_index(DATE_COL)
+
+
+def load_station_seeds(
+    model_dir: Path, stations: List[str], feat_cols: List[str], time_step: int
+) -> np.ndarray:
+    """Seed window semua stasiun sebagai array (S, time_step, F), urutan = stations."""
+    df = station_seed_frame(model_dir)
+    missing = [c for c in feat_cols if c not in df.columns]
+    if missing:
+        raise ValueError(f"Station seed windows missing feature columns: {missing}")
+    groups = dict(tuple(df.groupby(STATION_COL, sort=False)))
+    windows = []
+    for name in stations:
+        rows = groups.get(name)
+        if rows is None or len(rows) < time_step:
+            raise ValueError(
+                f"Seed window for station '{name}' has fewer than {time_step} rows."
+            )
+        windows.append(rows[feat_cols].to_numpy(np.float64)[-time_step:])
+    return np.stack(windows)
@@ -0,0 +1,197 @@
+# predictions_model/telemetry.py
+#
+# TELEMETRI TRAINING: WAKTU PER TAHAP, RSS PUNCAK, DAN STATISTIK PER EPOCH.
+# Hasilnya disimpan sebagai training_report.json di folder model. Jika on_event
+# diberikan, setiap transisi tahap dan akhir epoch juga dikirim sebagai event
+# (dipakai untuk streaming progres lewat SSE).
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+import keras
+
+from utils.metrics import process_rss_bytes, stage_timer
+
+TRAINING_REPORT_FILENAME = "training_report.json"
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+class _RssSampler:
+    """Thread yang mencatat RSS tertinggi selama training berjalan."""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = process_rss_bytes()
+        self.stage_peak = self.peak
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def sample(self) -> int:
+        rss = process_rss_bytes()
+        self.peak = max(self.peak, rss)
+        self.stage_peak = max(self.stage_peak, rss)
+        return rss
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class TrainingTelemetry:
+    """
+    Dipakai sebagai context manager di sekitar satu run training:
+
+        with TrainingTelemetry() as telemetry:
+            with telemetry.stage("fetch"):
+                ...
+    """
+
+    def __init__(self, on_event: Optional[Callable[..., None]] = None):
+        self.on_event = on_event
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.epochs: List[Dict[str, Any]] = []
+        self.info: Dict[str, Any] = {}
+        self.started_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._t0 = time.perf_counter()
+        self._sampler: Optional[_RssSampler] = None
+
+    def __enter__(self) -> "TrainingTelemetry":
+        self._sampler = _RssSampler()
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._sampler is not None:
+            self._sampler.stop()
+
+    def emit(self, event_type: str, **data) -> None:
+        if self.on_event is not None:
+            self.on_event(event_type, **data)
+
+    @contextmanager
+    def stage(self, name: str):
+        self.emit("stage", stage=name, status="started")
+        sampler = self._sampler
+        rss_start = sampler.sample() if sampler else process_rss_bytes()
+        if sampler:
+            sampler.stage_peak = rss_start
+        t0 = time.perf_counter()
+        try:
+            # IKUT DICATAT DI /metrics SEBAGAI train_<tahap>
+            with stage_timer(f"train_{name}"):
+                yield
+        finally:
+            seconds = time.perf_counter() - t0
+            rss_end = sampler.sample() if sampler else process_rss_bytes()
+            rss_peak = sampler.stage_peak if sampler else max(rss_start, rss_end)
+            # TAHAP YANG DIPANGGIL BERKALI-KALI DIAKUMULASI
+            prev = self.stages.get(name)
+            self.stages[name] = {
+                "seconds": seconds + (prev["seconds"] if prev else 0.0),
+                "rss_start_bytes": prev["rss_start_bytes"] if prev else rss_start,
+                "rss_end_bytes": rss_end,
+                "rss_peak_bytes": max(rss_peak, prev["rss_peak_bytes"] if prev else 0),
+            }
+            self.emit("stage", stage=name, status="finished", seconds=seconds)
+
+    def callback(
+        self,
+        train_samples: int,
+        epochs: Optional[int] = None,
+        early_stopping: Optional[keras.callbacks.EarlyStopping] = None,
+    ) -> "EpochTelemetry":
+        return EpochTelemetry(self, train_samples, epochs, early_stopping)
+
+    def report(self, **extra) -> Dict[str, Any]:
+        fitted = [e for e in self.epochs if e.get("samples_per_sec")]
+        peak = self._sampler.peak if self._sampler else process_rss_bytes()
+        return {
+            "started_at": self.started_at,
+            "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "wall_seconds": time.perf_counter() - self._t0,
+            "peak_rss_bytes": max(
+                [peak] + [s["rss_peak_bytes"] for s in self.stages.values()]
+            ),
+            **self.info,
+            **extra,
+            "epochs_run": len(self.epochs),
+            "mean_epoch_seconds": (
+                sum(e["seconds"] for e in self.epochs) / len(self.epochs)
+                if self.epochs
+                else None
+            ),
+            "mean_samples_per_sec": (
+                sum(e["samples_per_sec"] for e in fitted) / len(fitted) if fitted else None
+            ),
+            "stages": self.stages,
+            "epochs": self.epochs,
+        }
+
+
+class EpochTelemetry(keras.callbacks.Callback):
+    """
+    Catat loss, val_loss, durasi, dan throughput (sampel/detik) tiap epoch.
+    Harus diletakkan SETELAH EarlyStopping di daftar callbacks supaya status
+    early stopping yang dikirim sudah diperbarui untuk epoch ini.
+    """
+
+    def __init__(
+        self,
+        telemetry: TrainingTelemetry,
+        train_samples: int,
+        epochs: Optional[int] = None,
+        early_stopping: Optional[keras.callbacks.EarlyStopping] = None,
+    ):
+        super().__init__()
+        self.telemetry = telemetry
+        self.train_samples = train_samples
+        self.epochs = epochs
+        self.early_stopping = early_stopping
+        self._t0 = 0.0
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._t0 = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        seconds = time.perf_counter() - self._t0
+        logs = logs or {}
+        record = {
+            "epoch": epoch + 1,
+            "loss": float(logs["loss"]) if "loss" in logs else None,
+            "val_loss": float(logs["val_loss"]) if "val_loss" in logs else None,
+            "seconds": seconds,
+            "samples_per_sec": self.train_samples / seconds if seconds > 0 else None,
+        }
+        self.telemetry.epochs.append(record)
+        if self.telemetry.on_event is None:
+            return
+
+        # ETA = RATA-RATA DURASI EPOCH x SISA EPOCH (BATAS ATAS, EARLY STOP BISA LEBIH CEPAT)
+        done = self.telemetry.epochs
+        mean_seconds = sum(e["seconds"] for e in done) / len(done)
+        remaining = (self.epochs - (epoch + 1)) if self.epochs else None
+        es = self.early_stopping
+        early_stop = None
+        if es is not None:
+            early_stop = {
+                "wait": int(es.wait),
+                "patience": int(es.patience),
+                "best": float(es.best) if es.best is not None else None,
+                "best_epoch": (es.best_epoch + 1) if es.best is not None else None,
+            }
+        self.telemetry.emit(
+            "epoch",
+            **record,
+            epochs=self.epochs,
+            eta_seconds=mean_seconds * remaining if remaining is not None else None,
+            early_stop=early_stop,
+            stopping=bool(getattr(self.model, "stop_training", False)),
+        )
@@ -1,12 +1,15 @@
 # FS
-import base64
+import contextvars
 import io
 import json
 import os
 import tempfile
+import threading
 import time
+from contextlib import AsyncExitStack
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 
 import pandas as pd
 
@@ -14,33 +17,127 @@ import pandas as pd
 from dotenv import load_dotenv
 
 # FASTAPI
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import JSONResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import (
+    FileResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 
 # MINIO
 from minio import Minio
 from minio.error import S3Error
 
 # DREMIO
-from pyarrow import flight
-from pyarrow.flight import FlightCallOptions, FlightClient, FlightDescriptor
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pyarrow.flight import FlightClient
+from pydantic import (
+    BaseModel,
+    Field,
+    ValidationError,
+    field_validator,
+    model_validator,
+)
 from urllib3.exceptions import MaxRetryError
 
-from predictions_model.model import train_model
-from predictions_model.predict import create_meteorology_df, predict_pollutants
-from utils.auth import admin_required
-from utils.data_validation import validate_data
+from predictions_model.attribution import (
+    ATTRIBUTION_BASELINES,
+    ATTRIBUTION_METHODS,
+    forecast_attributions,
+)
+from predictions_model.backtest import BACKTEST_FILENAME, BACKTEST_HORIZON, backtest_model
+from predictions_model.model import PRECISION_VARIANTS, preprocess_data, train_model
+from predictions_model.telemetry import TRAINING_REPORT_FILENAME, TrainingTelemetry
+from predictions_model.predict import (
+    INFERENCE_BACKENDS,
+    benchmark_inference_backends,
+    create_meteorology_df,
+    predict_pollutants,
+    predict_stations,
+    stream_pollutants,
+    stream_stations,
+)
+from predictions_model.stations import is_station_model, split_stations
+from utils.admission import BATCH, INFERENCE_ADMISSION, INTERACTIVE, AdmissionRejected
+from utils.auth import admin_optional, admin_required
+from utils.dremio import (
+    DREMIO_ENDPOINT,
+    dremio_headers,
+    flight_do_get,
+    flight_get_info,
+)
+from utils.data_validation import (
+    STATION_COL,
+    XlsxChunkWriter,
+    _detect_header_and_delimiter,
+    validate_csv_stream,
+    validate_data,
+)
+from utils.ispu import ISPU_POLLUTANTS, records_with_ispu, with_ispu
+from utils.metrics import stage_timer
+from utils.forecast_scheduler import (
+    STANDARD_FORECAST,
+    STANDARD_FORECAST_PATH,
+    current_standard_forecast,
+    refresh_standard_forecast,
+    request_refresh,
+)
+from utils.seed_windows import SEED_WINDOWS
+from utils.forecast_store import (
+    PREDICTION_RESULTS_PATH,
+    append_forecast,
+    get_forecast,
+    get_materialized,
+    latest_forecast,
+    list_materialized,
+    mark_snapshot_written,
+    query_forecasts,
+    request_hash,
+)
+from utils.response_cache import cached_json_response, invalidate_path
+from utils.profiling import list_profiles, profile_path, run_profiled
+from utils import wire_formats
+from utils.tracing import span
+from utils.training_jobs import (
+    TrainingJob,
+    TrainingRejected,
+    claim_model,
+    create_job,
+    format_sse,
+    get_job,
+    list_jobs,
+    release_model,
+    training_slot,
+)
+from utils.model_catalog import get_model_record, query_models, register_model
+from utils.model_registry import (
+    MODEL_REGISTRY_ENABLED,
+    publish_model,
+    set_active_pointer,
+)
 from utils.model_utils import (
     MODEL_INFO_PATH,
     _active_model_name,
     _collect_model_entry,
+    _detach_model_dir,
     _ensure_model_exists,
-    _list_trained_models,
     _read_json,
     _required_files_present,
     _write_json,
 )
+from utils.predict_utils import INFERENCE_FILENAME, _inference_selection
 
 load_dotenv()
 
@@ -49,9 +146,8 @@ MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
 MINIO_DATALAKE_BUCKET = os.getenv("MINIO_DATALAKE_BUCKET")
 
-DREMIO_ENDPOINT = os.getenv("DREMIO_ENDPOINT")
-DREMIO_USERNAME = os.getenv("DREMIO_USERNAME")
-DREMIO_PASSWORD = os.getenv("DREMIO_PASSWORD")
+# XLSX HASIL KONVERSI DISIMPAN DI MEMORI SAMPAI UKURAN INI, SELEBIHNYA DI DISK
+XLSX_SPOOL_MAX_BYTES = int(os.getenv("XLSX_SPOOL_MAX_BYTES", 16 * 1024 * 1024))
 
 
 def minio_client() -> Minio:
@@ -73,14 +169,27 @@ async def retrain_model(file: UploadFile = File(...)):
     validate_data(file)
 
     # UPLOAD DATA KE MINIO
+    output = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_BYTES)
     try:
         #! AUTOPROMOTION IN DREMIO IS NOT HANDLING CSV WELL, SO WE NEED TO CONVERT THIS INTO XLSX
-        # CONVERT TO XLSX IN MEMORY
+        # VALIDASI PER CHUNK + KONVERSI KE XLSX DALAM SATU KALI PARSE
         file.file.seek(0)
-        df = pd.read_csv(file.file)
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False)
+        writer = XlsxChunkWriter()
+        with stage_timer("ingest_csv_validate"):
+            try:
+                report = validate_csv_stream(file.file, sink=writer.write)
+            except ValueError as e:
+                writer.discard()
+                raise HTTPException(status_code=400, detail=str(e))
+        if not report["valid"]:
+            writer.discard()
+            raise HTTPException(
+                status_code=400,
+                detail={"message": "CSV validation failed.", **report},
+            )
+        with stage_timer("ingest_xlsx_encode"):
+            writer.save(output)
+        xlsx_size = output.tell()
         output.seek(0)
 
         # NAMA FILE
@@ -89,25 +198,25 @@ async def retrain_model(file: UploadFile = File(...)):
 
         client = minio_client()
         bucket = MINIO_DATALAKE_BUCKET
-        client.put_object(
-            bucket_name=bucket,
-            object_name=f"raw/{xlsx_filename}",
-            data=output,
-            length=output.getbuffer().nbytes,
-            part_size=10 * 1024 * 1024,
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+        with stage_timer("ingest_minio_put"), span(
+            "minio.put_object", kind="client", bucket=bucket, object=f"raw/{xlsx_filename}"
+        ):
+            client.put_object(
+                bucket_name=bucket,
+                object_name=f"raw/{xlsx_filename}",
+                data=output,
+                length=xlsx_size,
+                part_size=10 * 1024 * 1024,
+                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
         print(f"File {xlsx_filename} uploaded to Minio")
 
         # KONVERSI DATA DARI MINIO KE DREMIO
-        basic_token = base64.b64encode(
-            f"{DREMIO_USERNAME}:{DREMIO_PASSWORD}".encode("utf-8")
-        ).decode("utf-8")
-        headers = [(b"authorization", f"Basic {basic_token}".encode("utf-8"))]
-
+        headers = dremio_headers()
         flight_client = FlightClient(DREMIO_ENDPOINT)
-        options = flight.FlightCallOptions(headers=headers)
 
+        # DATA MULTI-STASIUN: KOLOM L = STASIUN (LIHAT XlsxChunkWriter)
+        station_select = f",\n        L AS {STATION_COL}" if report["stations"] else ""
         create_query = f"""CREATE TABLE Minio."{base_name}" AS
         SELECT TO_DATE(A, 'YYYY-MM-DD', 1) AS Tanggal,
         CONVERT_TO_FLOAT(B, 1, 1, 0) AS PM10,
@@ -119,34 +228,42 @@ async def retrain_model(file: UploadFile = File(...)):
         CONVERT_TO_FLOAT(H, 1, 1, 0) AS Kelembapan,
         CONVERT_TO_FLOAT(I, 1, 1, 0) AS "Curah Hujan",
         CONVERT_TO_FLOAT(J, 1, 1, 0) AS "Penyinaran Matahari",
-        CONVERT_TO_FLOAT(K, 1, 1, 0) AS "Kecepatan Angin"
+        CONVERT_TO_FLOAT(K, 1, 1, 0) AS "Kecepatan Angin"{station_select}
         FROM MinIO.raw."{xlsx_filename}" AS "placeholder.xlsx"
         WHERE TANGGAL IS NOT NULL;
         """
         # KONVERSI TABLE KE ICEBERG
         print("Running CTAS...")
-        create_descriptor = FlightDescriptor.for_command(create_query.encode())
-        create_flight_info = flight_client.get_flight_info(create_descriptor, options)
-        create_reader = flight_client.do_get(
-            create_flight_info.endpoints[0].ticket, options
-        )
+        with stage_timer("ingest_flight_ctas"):
+            create_flight_info = flight_get_info(flight_client, create_query, headers)
+            create_reader = flight_do_get(
+                flight_client, create_flight_info, headers, read=False
+            )
 
-        for _ in range(10):
-            try:
-                probe = FlightDescriptor.for_command(
-                    f'SELECT * FROM Minio."{base_name}" LIMIT 1'.encode("utf-8")
-                )
-                info = flight_client.get_flight_info(probe, options)
-                if info.endpoints:
-                    break
-            except Exception:
-                time.sleep(0.5)
+        with stage_timer("ingest_probe_loop"):
+            for _ in range(10):
+                try:
+                    info = flight_get_info(
+                        flight_client,
+                        f'SELECT * FROM Minio."{base_name}" LIMIT 1',
+                        headers,
+                    )
+                    if info.endpoints:
+                        break
+                except Exception:
+                    time.sleep(0.5)
+
+        # OBSERVASI BARU: SEED WINDOW + FORECAST STANDAR DICEK ULANG DI LATAR BELAKANG
+        request_refresh("observations_changed")
 
         return {
             "message": "Data uploaded successfully",
             "base_name": base_name,
+            "validation": report,
         }
 
+    except HTTPException:
+        raise
     except (S3Error, ConnectionRefusedError, TimeoutError, MaxRetryError) as e:
         raise HTTPException(
             status_code=503,
@@ -154,6 +271,8 @@ async def retrain_model(file: UploadFile = File(...)):
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        output.close()
 
 
 class TrainRequest(BaseModel):
@@ -170,6 +289,19 @@ from pydantic import BaseModel, field_validator
 class TrainRequest(BaseModel):
     base_name: str
     model_name: Optional[str] = None
+    precision_variants: List[str] = Field(
+        default_factory=list,
+        description=f"Reduced-precision variants to build: {list(PRECISION_VARIANTS)}",
+    )
+
+    @field_validator("precision_variants")
+    def validate_precision_variants(cls, v):
+        unknown = [p for p in v if p not in PRECISION_VARIANTS]
+        if unknown:
+            raise ValueError(
+                f"precision_variants tidak dikenal: {unknown} (pilihan: {list(PRECISION_VARIANTS)})"
+            )
+        return v
 
     @field_validator("model_name")
     def validate_model_name(cls, v):
@@ -183,46 +315,198 @@ class TrainRequest(BaseModel):
 
 
 @router.post("/train", tags=["model"], dependencies=[Depends(admin_required)])
-async def model_train_using_cache(payload: TrainRequest):
+async def model_train_using_cache(payload: TrainRequest, profile: bool = False):
+    model_name = payload.model_name or payload.base_name
+    try:
+        claim_model(model_name, "train")
+    except TrainingRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    try:
+        # TIDAK MENUNGGU SLOT: REQUEST SINKRON LANGSUNG 429 JIKA SEMUA SLOT TERPAKAI
+        with training_slot(wait=False):
+            # TRAINING BERAT DI THREADPOOL AGAR EVENT LOOP TETAP MELAYANI REQUEST LAIN
+            if profile:
+                result, profile_id = await run_in_threadpool(
+                    run_profiled, "train", _train_from_cache, payload
+                )
+                return {**result, "profile_id": profile_id}
+            return await run_in_threadpool(_train_from_cache, payload)
+    except TrainingRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    finally:
+        release_model(model_name)
+
+
+# ? TRAINING DI LATAR BELAKANG, PROGRES DIIKUTI LEWAT SSE (BISA BANYAK SUBSCRIBER)
+@router.post(
+    "/train/jobs",
+    tags=["model"],
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admin_required)],
+)
+async def model_train_job(payload: TrainRequest, request: Request):
+    try:
+        # 409 JIKA model_name SEDANG DILATIH, 429 JIKA ANTREAN JOB PENUH
+        job = create_job(payload.model_dump(), payload.model_name or payload.base_name)
+    except TrainingRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    # CONTEXT DISALIN SUPAYA SPAN TRAINING TETAP MASUK KE TRACE REQUEST INI
+    threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(_run_training_job, job, payload),
+        name=f"train-{job.id}",
+        daemon=True,
+    ).start()
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "events_url": request.url_for(
+            "model_train_job_events", job_id=job.id
+        ).path,
+    }
+
+
+def _run_training_job(job: TrainingJob, payload: TrainRequest) -> None:
+    model_name = payload.model_name or payload.base_name
+    job.publish("queued", params=job.params)
+    try:
+        # MENUNGGU GILIRAN (TRAINING_CONCURRENCY), STATUS TETAP "queued"
+        with training_slot(), span("training_job", job_id=job.id, model_name=model_name):
+            result = _train_from_cache(payload, job)
+    except HTTPException as e:
+        job.publish("failed", detail=e.detail)
+    except Exception as e:
+        job.publish("failed", detail=str(e))
+    else:
+        job.publish("done", result=result)
+    finally:
+        release_model(model_name)
+
+
+@router.get("/train/jobs", tags=["model"], dependencies=[Depends(admin_required)])
+async def model_train_jobs():
+    return {"jobs": list_jobs()}
+
+
+def _get_job_or_404(job_id: str) -> TrainingJob:
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Training job "{job_id}" not found.',
+        )
+    return job
+
+
+@router.get(
+    "/train/jobs/{job_id}", tags=["model"], dependencies=[Depends(admin_required)]
+)
+async def model_train_job_status(job_id: str):
+    return _get_job_or_404(job_id).summary()
+
+
+@router.get(
+    "/train/jobs/{job_id}/events",
+    tags=["model"],
+    dependencies=[Depends(admin_required)],
+)
+async def model_train_job_events(job_id: str, request: Request):
+    job = _get_job_or_404(job_id)
+    # RECONNECT: LANJUTKAN SETELAH EVENT TERAKHIR YANG SUDAH DITERIMA
+    try:
+        after = int(request.headers.get("last-event-id", -1))
+    except ValueError:
+        after = -1
+
+    async def stream():
+        async for event in job.subscribe(after):
+            if await request.is_disconnected():
+                break
+            yield format_sse(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _train_from_cache(
+    payload: TrainRequest, job: Optional[TrainingJob] = None
+) -> Dict[str, Any]:
     try:
         base_name = payload.base_name
         model_name = payload.model_name or base_name
 
-        basic_token = base64.b64encode(
-            f"{DREMIO_USERNAME}:{DREMIO_PASSWORD}".encode("utf-8")
-        ).decode("utf-8")
-        headers = [(b"authorization", f"Basic {basic_token}".encode("utf-8"))]
-
-        flihgt_client = FlightClient(DREMIO_ENDPOINT)
-        options = flight.FlightCallOptions(headers=headers)
+        headers = dremio_headers()
+        flight_client = FlightClient(DREMIO_ENDPOINT)
 
         select_query = f'SELECT * FROM Minio."{base_name}"'
-        select_descriptor = FlightDescriptor.for_command(select_query.encode())
-        select_flight_info = flight_client.get_flight_info(select_descriptor, options)
-        select_reader = flight_client.do_get(
-            select_flight_info.endpoints[0].ticket, options
-        )
-        select_table = select_reader.read_all()
+        on_event = job.publish if job is not None else None
+        with TrainingTelemetry(on_event=on_event) as telemetry:
+            with telemetry.stage("fetch"):
+                select_flight_info = flight_get_info(flight_client, select_query, headers)
+                select_df = flight_do_get(
+                    flight_client, select_flight_info, headers
+                ).to_pandas()
+
+            train_model(
+                select_df,
+                model_name=model_name,
+                precision_variants=tuple(payload.precision_variants),
+                telemetry=telemetry,
+            )
 
-        train_model(select_table.to_pandas(), model_name=model_name)
+        # PUBLISH KE REGISTRY SUPAYA NODE LAIN BISA MENARIK MODEL INI
+        version = None
+        if MODEL_REGISTRY_ENABLED:
+            version = publish_model(minio_client(), model_name)["version"]
 
         return {
             "message": "Model Train Successfully",
             "base_name": base_name,
             "model_name": model_name,
+            "version": version,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/list", tags=["model"], dependencies=[Depends(admin_required)])
-async def model_list():
+async def model_list(
+    page: int = Query(1, ge=1),
+    page_size: Optional[int] = Query(None, ge=1, le=1000),
+    sort_by: str = Query("created_at", description="name, created_at, or e.g. Overall.RMSE / PM10.MAE"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    created_from: Optional[str] = Query(None, description="YYYY-MM-DD"),
+    created_to: Optional[str] = Query(None, description="YYYY-MM-DD"),
+    param: List[str] = Query(
+        [], description="Hyperparameter filter 'key=value', e.g. lstm_units=128"
+    ),
+):
     try:
-        models = _list_trained_models()
-        active = _active_model_name()
-        return {"active": active, "models": models}
+        params = dict(p.split("=", 1) for p in param)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="param must be formatted as key=value.",
+        )
+    try:
+        result = query_models(
+            page=page,
+            page_size=page_size,
+            sort_by=sort_by,
+            order=order,
+            created_from=created_from,
+            created_to=created_to,
+            params=params,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    active = _active_model_name()
+    return {"active": active, **result}
 
 
 @router.patch("/active", tags=["model"], dependencies=[Depends(admin_required)])
@@ -234,16 +518,91 @@ async def set_active_model(payload: Dict[str, str]):
             detail='Body must include {"active": "<model_folder_name>"}',
         )
 
-    _ensure_model_exists(new_active)
+    backend = (payload.get("backend") or "auto").strip()
+    if backend != "auto" and backend not in INFERENCE_BACKENDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown backend '{backend}'. Use 'auto' or one of {list(INFERENCE_BACKENDS)}.",
+        )
+
+    model_dir = _ensure_model_exists(new_active)
+
+    metadata = _read_json(model_dir / "metadata.json") or {}
+    # FRONT-END (HOME/VIEW) HANYA MEMANGGIL /predict, JADI MODEL MULTI-STASIUN HARUS
+    # DIAKTIFKAN SECARA EKSPLISIT ({"allow_stations": "true"})
+    allow_stations = (payload.get("allow_stations") or "").lower() in ("1", "true", "yes")
+    if is_station_model(metadata) and not allow_stations:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f'Model "{new_active}" is multi-station; the public page only uses '
+                '/model/predict. Send {"allow_stations": "true"} to activate it anyway.'
+            ),
+        )
+
+    # PILIH BACKEND INFERENSI: BENCHMARK OTOMATIS ATAU OVERRIDE ADMIN
+    # DISIMPAN DI inference.json, BUKAN metadata.json, SUPAYA VERSI MODEL DI REGISTRY TETAP
+    previous = _inference_selection(model_dir, metadata)
+    if backend == "auto":
+        try:
+            inference = await run_in_threadpool(benchmark_inference_backends, model_dir)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Backend benchmark failed: {e}"
+            )
+    else:
+        inference = {
+            **previous,
+            "backend": backend,
+            "selected_by": "admin",
+            "selected_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+    _write_json(model_dir / INFERENCE_FILENAME, inference)
+    register_model(model_dir)
 
     to_write = {"active": new_active}
-    _write_json(MODEL_INFO_PATH, to_write)
 
-    return {"message": "Active model updated.", "active": new_active}
+    # SEBARKAN KE SEMUA NODE LEWAT POINTER DI OBJECT STORE
+    if MODEL_REGISTRY_ENABLED:
+        try:
+            client = minio_client()
+            manifest = await run_in_threadpool(publish_model, client, model_dir)
+            version = manifest["version"]
+            pointer = await run_in_threadpool(
+                set_active_pointer, client, new_active, version, inference
+            )
+        except (S3Error, ConnectionRefusedError, TimeoutError, MaxRetryError) as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Model registry is not available (Check if MinIO is running): {e}",
+            )
+        to_write.update(version=version, generation=pointer["generation"])
+
+    _write_json(MODEL_INFO_PATH, to_write)
+    # FORECAST STANDAR DIHITUNG ULANG DENGAN MODEL BARU (DI LATAR BELAKANG)
+    request_refresh("model_changed")
+
+    response = {
+        "message": "Active model updated.",
+        "active": new_active,
+        "version": to_write.get("version"),
+        "backend": inference["backend"],
+        "selected_by": inference["selected_by"],
+    }
+    if is_station_model(metadata):
+        response["warning"] = (
+            "Multi-station model: /model/predict returns 400; use /model/predict/stations."
+        )
+    return response
 
 
 @router.get("/evaluation", tags=["model"], dependencies=[Depends(admin_required)])
-async def model_evaluation_active():
+async def model_evaluation_active(request: Request):
+    # DISAJIKAN DARI CACHE (ETAG + 304); DIBANGUN ULANG SAAT FILE MODEL/INFO BERUBAH
+    return cached_json_response(request, "evaluation", _build_evaluation)
+
+
+def _build_evaluation():
     active = _active_model_name()
     if not active:
         raise HTTPException(
@@ -252,8 +611,9 @@ async def model_evaluation_active():
         )
 
     model_dir = _ensure_model_exists(active)
-    metadata = _read_json(model_dir / "metadata.json")
-    evaluation = _read_json(model_dir / "evaluation.json")
+    record = get_model_record(active) or {}
+    metadata = record.get("metadata")
+    evaluation = record.get("evaluation")
 
     if metadata is None:
         raise HTTPException(
@@ -266,14 +626,483 @@ async def model_evaluation_active():
             detail=f'evaluation.json not found for model "{active}".',
         )
 
-    return {"active": active, "metadata": metadata, "evaluation": evaluation}
+    body = {
+        "active": active,
+        "metadata": metadata,
+        "evaluation": evaluation,
+        "training_report": record.get("training_report"),
+        # ERROR PER HARI HORIZON (BACKTEST WALK-FORWARD), None UNTUK MODEL LAMA
+        "backtest": _read_json(model_dir / BACKTEST_FILENAME),
+    }
+    deps = [
+        MODEL_INFO_PATH,
+        model_dir / "metadata.json",
+        model_dir / "evaluation.json",
+        model_dir / TRAINING_REPORT_FILENAME,
+        model_dir / BACKTEST_FILENAME,
+    ]
+    return body, deps, None
+
+
+class BacktestRequest(BaseModel):
+    base_name: str
+    model_name: Optional[str] = None
+    horizon: int = Field(BACKTEST_HORIZON, ge=1, le=60)
+    test_size: float = Field(0.2, gt=0.0, lt=1.0)
+
+
+# ? HITUNG ULANG BACKTEST MODEL (DEFAULT: MODEL AKTIF) PADA DATASET DI DREMIO
+@router.post("/backtest", tags=["model"], dependencies=[Depends(admin_required)])
+async def model_backtest(payload: BacktestRequest):
+    model_name = payload.model_name or _active_model_name()
+    if not model_name:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No active model set in model_information.json.",
+        )
+    model_dir = _ensure_model_exists(model_name)
+    try:
+        headers = dremio_headers()
+        flight_client = FlightClient(DREMIO_ENDPOINT)
+        select_query = f'SELECT * FROM Minio."{payload.base_name}"'
+        with stage_timer("backtest_fetch"):
+            info = await run_in_threadpool(flight_get_info, flight_client, select_query, headers)
+            table = await run_in_threadpool(flight_do_get, flight_client, info, headers)
+        result = await run_in_threadpool(
+            _backtest_frames, model_dir, table.to_pandas(), payload
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    _write_json(_detach_model_dir(model_dir) / BACKTEST_FILENAME, result)
+    return {
+        "model_name": model_name,
+        "base_name": payload.base_name,
+        "backtest": result,
+    }
+
+
+def _backtest_frames(model_dir: Path, df: pd.DataFrame, payload: BacktestRequest):
+    if STATION_COL in df.columns:
+        frames = {
+            name: preprocess_data(g).set_index("Tanggal")
+            for name, g in split_stations(df).items()
+        }
+    else:
+        frames = {"": preprocess_data(df).set_index("Tanggal")}
+    with stage_timer("backtest_rollout"):
+        return backtest_model(model_dir, frames, payload.test_size, payload.horizon)
+
+
+from utils.user_input_utils import (
+    PredictRequest,
+    _history_from_columns,
+    _history_to_dataframe,
+    _week1_from_columns,
+)
+
+def _inline_schema(model: type[BaseModel]) -> Dict[str, Any]:
+    """model_json_schema() dengan $defs di-inline (openapi_extra tidak mendaftarkan komponen)."""
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref", "")
+            if ref.startswith("#/$defs/"):
+                return resolve(defs[ref.rsplit("/", 1)[-1]])
+            return {k: resolve(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [resolve(v) for v in node]
+        return node
+
+    return resolve(schema)
+
+
+# ? https://fastapi.tiangolo.com/advanced/path-operation-advanced-configuration/#custom-openapi-path-operation-schema
+_PREDICT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            wire_formats.JSON: {"schema": _inline_schema(PredictRequest)},
+            wire_formats.COLUMNAR_JSON: {"schema": _inline_schema(PredictRequest)},
+            wire_formats.ARROW_STREAM: {
+                "schema": {"type": "string", "format": "binary"},
+                "description": "IPC stream cuaca minggu-1, opsional diikuti IPC stream riwayat.",
+            },
+        },
+    },
+    "responses": {
+        "200": {
+            "content": {
+                wire_formats.COLUMNAR_JSON: {},
+                wire_formats.ARROW_STREAM: {},
+                wire_formats.NDJSON: {},
+            }
+        }
+    },
+}
+
+# ? https://github.com/ndjson/ndjson-spec
+_STREAM_QUERY_DESCRIPTION = (
+    "Kirim hasil sebagai NDJSON, satu baris per hari forecast begitu langkah rollout "
+    "selesai (sama dengan Accept: application/x-ndjson)"
+)
+_STREAM_MEDIA_TYPES = (*wire_formats.MEDIA_TYPES, wire_formats.NDJSON)
+
+
+_ISPU_QUERY_DESCRIPTION = "Tambahkan kolom ISPU: AQI, Dominant, Category, <polutan>_AQI"
+
+
+@router.post("/predict", tags=["model"], openapi_extra=_PREDICT_OPENAPI)
+async def model_predict(
+    request: Request,
+    profile: bool = False,
+    ispu: bool = Query(False, description=_ISPU_QUERY_DESCRIPTION),
+    stream: bool = Query(False, description=_STREAM_QUERY_DESCRIPTION),
+    admin: Optional[Dict[str, Any]] = Depends(admin_optional),
+):
+    """
+    Content-Type (request) dan Accept (response): application/json (default),
+    application/vnd.airquality.columnar+json, atau application/vnd.apache.arrow.stream.
+    Accept: application/x-ndjson (atau ?stream=true) = response streaming per hari.
+    """
+    if profile and admin is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Profiling is admin only"
+        )
+    media_type = wire_formats.negotiate(request.headers.get("accept"), _STREAM_MEDIA_TYPES)
+    stream = stream or media_type == wire_formats.NDJSON
+    if stream and profile:
+        raise HTTPException(
+            status_code=400, detail="Profiling is not supported for streaming responses."
+        )
+    df_future_met, df_hist_user, req_hash = await _read_predict_inputs(request)
+    # ROLLOUT DARI RIWAYAT USER = LANE BATCH (PRIORITAS RENDAH), KECUALI ADMIN
+    lane = BATCH if df_hist_user is not None and admin is None else INTERACTIVE
+    if stream:
+        meta = {"model_name": _active_model_name(), "request_hash": req_hash}
+        return await _ndjson_response(
+            lane,
+            lambda: _predict_stream(
+                stream_pollutants, df_future_met, df_history_from_user=df_hist_user
+            ),
+            meta,
+            ispu,
+        )
+    try:
+        async with INFERENCE_ADMISSION.slot(lane):
+            # DI THREADPOOL SUPAYA EVENT LOOP TETAP MELAYANI REQUEST LAIN
+            if profile:
+                preds_all, profile_id = await run_in_threadpool(
+                    run_profiled, "predict", _predict_frame, df_future_met, df_hist_user
+                )
+            else:
+                preds_all = await run_in_threadpool(
+                    _predict_frame, df_future_met, df_hist_user
+                )
+                profile_id = None
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+    if ispu:
+        with stage_timer("ispu"):
+            preds_all = with_ispu(preds_all)
+
+    # request_hash & model_name ikut dikirim balik saat PATCH /predict/result
+    meta = {"model_name": _active_model_name(), "request_hash": req_hash}
+    with stage_timer("serialize", format=media_type):
+        if media_type == wire_formats.JSON:
+            records = preds_all.reset_index().to_dict(orient="records")
+            result = {"predictions": records, **meta}
+            return {**result, "profile_id": profile_id} if profile_id else result
+        return _frame_response(preds_all.reset_index(), media_type, meta, profile_id)
+
+
+@router.post("/predict/stations", tags=["model"], openapi_extra=_PREDICT_OPENAPI)
+async def model_predict_stations(
+    request: Request,
+    station: Optional[List[str]] = Query(
+        None, description="Subset stasiun (boleh diulang); default semua stasiun model"
+    ),
+    ispu: bool = Query(False, description=_ISPU_QUERY_DESCRIPTION),
+    stream: bool = Query(False, description=_STREAM_QUERY_DESCRIPTION),
+):
+    """
+    Forecast 14 hari untuk semua stasiun model aktif multi-stasiun, dari cuaca
+    minggu-1 yang sama, dalam satu rollout batch (satu forward pass per hari).
+    Body dan format response sama dengan /predict (tanpa history); hasil dalam
+    format panjang dengan kolom Stasiun. Streaming: satu baris NDJSON per stasiun,
+    dikirim per hari forecast.
+    """
+    media_type = wire_formats.negotiate(request.headers.get("accept"), _STREAM_MEDIA_TYPES)
+    df_future_met, df_hist_user, req_hash = await _read_predict_inputs(request)
+    if df_hist_user is not None:
+        raise HTTPException(
+            status_code=400, detail="History is not supported for multi-station forecasts."
+        )
+    if stream or media_type == wire_formats.NDJSON:
+        meta = {"model_name": _active_model_name(), "request_hash": req_hash}
+        return await _ndjson_response(
+            BATCH,
+            lambda: _predict_stream(stream_stations, df_future_met, stations=station),
+            meta,
+            ispu,
+        )
+    try:
+        # SATU REQUEST = ROLLOUT SEMUA STASIUN, JADI SELALU LANE BATCH
+        async with INFERENCE_ADMISSION.slot(BATCH):
+            preds = await run_in_threadpool(_predict_stations_frame, df_future_met, station)
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+    if ispu:
+        with stage_timer("ispu"):
+            preds = with_ispu(preds)
+
+    meta = {
+        "model_name": _active_model_name(),
+        "request_hash": req_hash,
+        "stations": int(preds[STATION_COL].nunique()),
+    }
+    with stage_timer("serialize", format=media_type):
+        if media_type == wire_formats.JSON:
+            return {"predictions": wire_formats.frame_to_records(preds), **meta}
+        return _frame_response(preds, media_type, meta)
+
+
+def _predict_stations_frame(
+    df_future_met: pd.DataFrame, stations: Optional[List[str]]
+) -> pd.DataFrame:
+    try:
+        return predict_stations(df_meteorology=df_future_met, stations=stations)
+    except ValueError as e:
+        # MODEL AKTIF BUKAN MULTI-STASIUN / STASIUN TIDAK DIKENAL / CUACA TIDAK VALID
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model prediction failed: {e}")
+
 
+@router.post(
+    "/predict/attribution",
+    tags=["model"],
+    openapi_extra={"requestBody": _PREDICT_OPENAPI["requestBody"]},
+)
+async def model_predict_attribution(
+    request: Request,
+    pollutant: Optional[List[str]] = Query(
+        None, description="Polutan yang dijelaskan (boleh diulang); default semua"
+    ),
+    day: Optional[List[int]] = Query(
+        None, description="Hari forecast 1-14 (boleh diulang); default semua"
+    ),
+    method: str = Query("integrated_gradients", description=f"{list(ATTRIBUTION_METHODS)}"),
+    baseline: str = Query("min", description=f"{list(ATTRIBUTION_BASELINES)}"),
+    steps: int = Query(32, ge=1, le=256, description="Titik interpolasi integrated gradients"),
+    station: Optional[str] = Query(None, description="Wajib untuk model multi-stasiun"),
+):
+    """
+    Atribusi per hari input x fitur (satuan polutan) untuk forecast 14 hari model aktif
+    dari cuaca minggu-1 yang sama dengan body /predict (tanpa history).
+    """
+    df_future_met, df_hist_user, req_hash = await _read_predict_inputs(request)
+    if df_hist_user is not None:
+        raise HTTPException(
+            status_code=400, detail="History is not supported for attributions."
+        )
+    try:
+        # BANYAK ROLLOUT + BACKWARD PASS, JADI LANE BATCH
+        async with INFERENCE_ADMISSION.slot(BATCH):
+            with stage_timer("attribution"):
+                result = await run_in_threadpool(
+                    _attribution_result,
+                    df_future_met,
+                    pollutant=pollutant,
+                    days=day,
+                    method=method,
+                    baseline=baseline,
+                    steps=steps,
+                    station=station,
+                )
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+    return {**result, "model_name": _active_model_name(), "request_hash": req_hash}
 
-from utils.user_input_utils import PredictRequest, _history_to_dataframe
+
+def _attribution_result(df_future_met: pd.DataFrame, pollutant, **kwargs) -> Dict[str, Any]:
+    try:
+        return forecast_attributions(df_future_met, targets=pollutant, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Attribution failed: {e}")
+
+
+def _predict_stream(stream_fn: Callable, *args, **kwargs) -> Iterator[pd.DataFrame]:
+    try:
+        return stream_fn(*args, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model prediction failed: {e}")
+
+
+async def _ndjson_response(
+    lane: str,
+    start: Callable[[], Iterator[pd.DataFrame]],
+    meta: Dict[str, Any],
+    ispu: bool = False,
+) -> StreamingResponse:
+    """
+    Response NDJSON dari generator per hari (stream_pollutants / stream_stations).
+    Slot admission diambil sebelum response dimulai (429/503 tetap bisa dikirim) dan
+    dipegang sampai stream selesai atau klien putus.
+    """
+    slot = AsyncExitStack()
+    try:
+        await slot.enter_async_context(INFERENCE_ADMISSION.slot(lane))
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+    try:
+        # SETUP + VALIDASI DI SINI, SUPAYA ERROR INPUT MASIH JADI 400/500 BIASA
+        days = await run_in_threadpool(start)
+    except BaseException:
+        await slot.aclose()
+        raise
+
+    async def lines():
+        try:
+            async for day in iterate_in_threadpool(days):
+                if ispu:
+                    day = with_ispu(day)
+                yield wire_formats.ndjson_lines(wire_formats.frame_to_records(day))
+        except Exception as e:
+            # STATUS 200 SUDAH TERKIRIM: ERROR DIKIRIM SEBAGAI BARIS TERAKHIR
+            yield wire_formats.ndjson_lines([{"error": f"Model prediction failed: {e}"}])
+        finally:
+            await slot.aclose()
+
+    headers = {
+        f"X-{k.replace('_', '-').title()}": str(v) for k, v in meta.items() if v is not None
+    }
+    headers.update({"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    return StreamingResponse(lines(), media_type=wire_formats.NDJSON, headers=headers)
+
+
+def _admission_error(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=e.status_code,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+async def _read_predict_inputs(request: Request):
+    """Return (cuaca minggu-1, riwayat atau None, request_hash) dari body sesuai Content-Type."""
+    content_type = wire_formats.media_type_of(request.headers.get("content-type"))
+    if content_type not in wire_formats.MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported Content-Type '{content_type}'. Use one of {list(wire_formats.MEDIA_TYPES)}.",
+        )
+    raw = await request.body()
+
+    if content_type == wire_formats.JSON:
+        try:
+            body = PredictRequest.model_validate_json(raw)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=jsonable_encoder(e.errors(include_url=False)),
+            )
+        df_future_met, df_hist_user = _predict_inputs(body)
+        return df_future_met, df_hist_user, _predict_inputs_hash(df_future_met, df_hist_user)
+
+    with stage_timer("deserialize", format=content_type):
+        try:
+            if content_type == wire_formats.ARROW_STREAM:
+                tables = wire_formats.read_arrow_tables(raw)
+                if len(tables) > 2:
+                    raise ValueError("Expected at most 2 IPC streams (week1, history).")
+                week1 = wire_formats.table_to_columns(tables[0])
+                history = (
+                    wire_formats.table_to_columns(tables[1]) if len(tables) > 1 else None
+                )
+            else:
+                payload = wire_formats.loads(raw)
+                if not isinstance(payload, dict):
+                    raise ValueError("Body must be a JSON object.")
+                week1, history = payload, payload.get("history")
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid request body: {e}")
+
+        try:
+            df_future_met = _week1_from_columns(week1)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid week-1 meteorology: {e}")
+        df_hist_user = None
+        if history is not None:
+            try:
+                df_hist_user = _history_from_columns(history)
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"Invalid history payload: {e}")
+    return df_future_met, df_hist_user, _predict_inputs_hash(df_future_met, df_hist_user)
+
+
+def _canonical_columns(df: pd.DataFrame) -> Dict[str, List[Any]]:
+    return {
+        col: (
+            df[col].dt.strftime("%Y-%m-%dT%H:%M:%S").tolist()
+            if col == "Tanggal"
+            else df[col].astype("float64").tolist()
+        )
+        for col in sorted(df.columns)
+    }
+
+
+def _predict_inputs_hash(
+    df_future_met: pd.DataFrame, df_hist_user: Optional[pd.DataFrame]
+) -> str:
+    """
+    request_hash dari frame yang sudah diparse, bukan dari byte body: JSON, columnar JSON,
+    dan Arrow (atau spasi berbeda) untuk input yang sama menghasilkan hash yang sama.
+    """
+    return request_hash(
+        {
+            "week1": _canonical_columns(df_future_met),
+            "history": None if df_hist_user is None else _canonical_columns(df_hist_user),
+        }
+    )
+
+
+def _frame_response(
+    df: pd.DataFrame,
+    media_type: str,
+    meta: Dict[str, Any],
+    profile_id: Optional[str] = None,
+    key: str = "predictions",
+) -> Response:
+    """DataFrame -> response columnar JSON / Arrow IPC (meta juga dikirim sebagai header)."""
+    headers = {
+        f"X-{k.replace('_', '-').title()}": str(v) for k, v in meta.items() if v is not None
+    }
+    if profile_id:
+        headers["X-Profile-Id"] = profile_id
+    if media_type == wire_formats.ARROW_STREAM:
+        content = wire_formats.write_arrow(df, meta)
+    else:
+        extra = {"profile_id": profile_id} if profile_id else {}
+        content = wire_formats.dumps(
+            {key: wire_formats.frame_to_columns(df), **meta, **extra}
+        )
+    return Response(content, media_type=media_type, headers=headers)
 
 
-@router.post("/predict", tags=["model"])
-async def model_predict(body: PredictRequest):
+def _predict_inputs(body: PredictRequest):
     try:
         df_future_met = create_meteorology_df(
             tanggal=pd.to_datetime(body.tanggal),
@@ -292,23 +1121,52 @@ async def model_predict(body: PredictRequest):
             df_hist_user = _history_to_dataframe(body.history)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid history payload: {e}")
+    return df_future_met, df_hist_user
+
 
+def _predict_frame(
+    df_future_met: pd.DataFrame, df_hist_user: Optional[pd.DataFrame]
+) -> pd.DataFrame:
     try:
         _, _, preds_all = predict_pollutants(
             df_meteorology=df_future_met,
             df_history_from_user=df_hist_user,
         )
+    except ValueError as e:
+        # MODEL AKTIF MULTI-STASIUN / INPUT TIDAK VALID, SAMA DENGAN _predict_stream
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Model prediction failed: {e}")
+    return preds_all
 
-    return {
-        "predictions": preds_all.reset_index().to_dict(orient="records"),
-    }
+
+@router.get("/profiles", tags=["model"], dependencies=[Depends(admin_required)])
+async def model_profiles():
+    """Profil request terakhir (rolling), diurutkan dari yang paling lambat."""
+    return {"profiles": list_profiles()}
+
+
+@router.get(
+    "/profiles/{profile_id}", tags=["model"], dependencies=[Depends(admin_required)]
+)
+async def model_profile_download(profile_id: str, format: str = "json"):
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    if format == "collapsed":
+        # ? FORMAT COLLAPSED STACKS: https://www.speedscope.app/
+        collapsed = _load_json_file(path).get("collapsed", "")
+        return PlainTextResponse(
+            collapsed,
+            headers={
+                "Content-Disposition": f'attachment; filename="{path.stem}.collapsed.txt"'
+            },
+        )
+    return FileResponse(path, media_type="application/json", filename=path.name)
 
 
 PREDICTIONS_BASE = Path(__file__).resolve().parents[1] / "predictions_model"
 MODELS_BASE = PREDICTIONS_BASE / "models"
-PREDICTION_RESULTS_PATH = MODELS_BASE / "prediction_result.json"
 
 
 def _ensure_dirs() -> None:
@@ -324,9 +1182,11 @@ def _atomic_write_json(path: Path, data: Dict[str, Any]) -> None:
         json.dump(data, tmp, ensure_ascii=False, indent=2)
         tmp_path = Path(tmp.name)
     os.replace(tmp_path, path)
+    invalidate_path(path)
 
 
-def _read_json(path: Path) -> Dict[str, Any]:
+def _load_json_file(path: Path) -> Dict[str, Any]:
+    """Seperti _read_json (utils.model_utils), tapi error jika file tidak ada/rusak."""
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -362,33 +1222,290 @@ async def save_predict_result(payload: Dict[str, Any]):
         # Store whatever object was sent (must be a dict per signature)
         to_store = payload
 
+    # SIMPAN KE RIWAYAT (APPEND-ONLY) + SNAPSHOT TERBARU
     try:
+        record = append_forecast(
+            to_store,
+            model_name=payload.get("model_name") or _active_model_name(),
+            req_hash=payload.get("request_hash"),
+        )
         _atomic_write_json(PREDICTION_RESULTS_PATH, to_store)
+        mark_snapshot_written()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save results: {e}")
 
-    count = None
-    preds = to_store.get("predictions")
-    if isinstance(preds, list):
-        count = len(preds)
-
     return {
         "status": "ok",
-        "saved_items": count,
+        "saved_items": record["n_items"],
+        "forecast_id": record["id"],
+        "issued_at": record["issued_at"],
+        "request_hash": record["request_hash"],
         "path": str(PREDICTION_RESULTS_PATH),
     }
 
 
 @router.get("/predict/result", tags=["model"])
-async def get_predict_result():
-    """Fetch the latest stored prediction results."""
-    if not PREDICTION_RESULTS_PATH.exists():
-        raise HTTPException(status_code=404, detail="No prediction results found.")
+async def get_predict_result(
+    request: Request, ispu: bool = Query(False, description=_ISPU_QUERY_DESCRIPTION)
+):
+    """Fetch the latest stored prediction results (served from memory, ETag/304)."""
+    if ispu:
+        return cached_json_response(
+            request, "predict_result:ispu", _build_predict_result_ispu
+        )
+    return cached_json_response(request, "predict_result", _build_predict_result)
+
+
+def _payload_with_ispu(payload: Any) -> Any:
+    # PAYLOAD TERSIMPAN TIDAK DIUBAH; KOLOM ISPU DIHITUNG SAAT DIBACA
+    if isinstance(payload, dict) and isinstance(payload.get("predictions"), list):
+        return {**payload, "predictions": records_with_ispu(payload["predictions"])}
+    return payload
+
+
+def _build_predict_result_ispu():
+    payload, paths, headers = _build_predict_result()
+    return _payload_with_ispu(payload), paths, headers
+
 
+def _build_predict_result():
     try:
-        data = _read_json(PREDICTION_RESULTS_PATH)
+        record = latest_forecast()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read results: {e}")
+    if record is None:
+        raise HTTPException(status_code=404, detail="No prediction results found.")
 
-    # Return as-is; FastAPI will serialize the dict
-    return JSONResponse(content=data)
+    headers = {"X-Forecast-Id": str(record["id"]), "X-Issued-At": record["issued_at"]}
+    return record["payload"], [PREDICTION_RESULTS_PATH], headers
+
+
+@router.get("/predict/history", tags=["model"])
+async def get_predict_history(
+    request: Request,
+    issue_from: Optional[str] = Query(None, description="YYYY-MM-DD"),
+    issue_to: Optional[str] = Query(None, description="YYYY-MM-DD"),
+    target_from: Optional[str] = Query(None, description="YYYY-MM-DD"),
+    target_to: Optional[str] = Query(None, description="YYYY-MM-DD"),
+    pollutant: List[str] = Query([], description="e.g. pollutant=PM10&pollutant=O3"),
+    station: List[str] = Query([], description="Forecast multi-stasiun, e.g. station=DKI1"),
+    model_name: Optional[str] = None,
+    limit: int = Query(30, ge=1, le=1000),
+    ispu: bool = Query(False, description=_ISPU_QUERY_DESCRIPTION),
+):
+    """
+    Riwayat forecast tersimpan, terbaru lebih dulu. Dengan Accept columnar JSON /
+    Arrow, hasilnya satu tabel panjang (satu baris per forecast x tanggal target).
+    """
+    for value in (issue_from, issue_to, target_from, target_to):
+        if value is not None:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid date '{value}', expected YYYY-MM-DD.",
+                )
+    try:
+        forecasts = await run_in_threadpool(
+            query_forecasts,
+            issue_from=issue_from,
+            issue_to=issue_to,
+            target_from=target_from,
+            target_to=target_to,
+            pollutants=pollutant or None,
+            model_name=model_name,
+            limit=limit,
+            stations=station or None,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to query history: {e}")
+
+    media_type = wire_formats.negotiate(request.headers.get("accept"))
+    if media_type != wire_formats.JSON:
+        df = _history_frame(forecasts)
+        if ispu:
+            df = with_ispu(df)
+        with stage_timer("serialize", format=media_type):
+            return _frame_response(df, media_type, {"count": len(forecasts)}, key="rows")
+    if ispu:
+        for forecast in forecasts:
+            forecast["predictions"] = records_with_ispu(forecast["predictions"])
+    return {"count": len(forecasts), "forecasts": forecasts}
+
+
+_HISTORY_COLUMNS = ["forecast_id", "issued_at", "model_name", "Tanggal"]
+
+
+def _history_frame(forecasts: List[Dict[str, Any]]) -> pd.DataFrame:
+    rows = [
+        {
+            "forecast_id": f["id"],
+            "issued_at": f["issued_at"],
+            "model_name": f["model_name"],
+            **row,
+        }
+        for f in forecasts
+        for row in f["predictions"]
+    ]
+    df = pd.DataFrame(rows or None, columns=None if rows else _HISTORY_COLUMNS)
+    df["Tanggal"] = pd.to_datetime(df["Tanggal"])
+    df["issued_at"] = pd.to_datetime(df["issued_at"])
+    return df
+
+
+@router.get("/predict/history/{forecast_id}", tags=["model"])
+async def get_predict_history_item(
+    forecast_id: int, ispu: bool = Query(False, description=_ISPU_QUERY_DESCRIPTION)
+):
+    record = await run_in_threadpool(get_forecast, forecast_id)
+    if record is None:
+        raise HTTPException(
+            status_code=404, detail=f"Forecast {forecast_id} not found."
+        )
+    if ispu:
+        record["payload"] = _payload_with_ispu(record["payload"])
+    return record
+
+
+# =========================
+# FORECAST STANDAR (TERJADWAL)
+# =========================
+@router.get("/forecast/standard", tags=["model"])
+async def get_standard_forecast(
+    request: Request, ispu: bool = Query(False, description=_ISPU_QUERY_DESCRIPTION)
+):
+    """Forecast 14 hari yang dihitung scheduler (dari memori, ETag/304)."""
+    if ispu:
+        return cached_json_response(
+            request, "forecast:standard:ispu", _build_standard_forecast_ispu
+        )
+    return cached_json_response(request, "forecast:standard", _build_standard_forecast)
+
+
+def _build_standard_forecast():
+    try:
+        payload = current_standard_forecast()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read forecast: {e}")
+    if payload is None:
+        raise HTTPException(
+            status_code=404, detail="Standard forecast has not been materialized yet."
+        )
+    headers = {
+        "X-Forecast-Version": str(payload["version"]),
+        "X-Materialized-At": payload["materialized_at"],
+    }
+    return payload, [STANDARD_FORECAST_PATH], headers
+
+
+def _build_standard_forecast_ispu():
+    payload, paths, headers = _build_standard_forecast()
+    return _payload_with_ispu(payload), paths, headers
+
+
+@router.get("/forecast/standard/versions", tags=["model"])
+async def get_standard_forecast_versions(limit: int = Query(30, ge=1, le=1000)):
+    versions = await run_in_threadpool(list_materialized, STANDARD_FORECAST, limit)
+    return {"count": len(versions), "versions": versions}
+
+
+@router.get("/forecast/standard/versions/{version}", tags=["model"])
+async def get_standard_forecast_version(
+    version: int, ispu: bool = Query(False, description=_ISPU_QUERY_DESCRIPTION)
+):
+    record = await run_in_threadpool(get_materialized, STANDARD_FORECAST, version)
+    if record is None:
+        raise HTTPException(
+            status_code=404, detail=f"Standard forecast version {version} not found."
+        )
+    if ispu:
+        record["payload"] = _payload_with_ispu(record["payload"])
+    return record
+
+
+@router.get("/seed-window", tags=["model"], dependencies=[Depends(admin_required)])
+async def seed_window_status():
+    """Status seed window dari Dremio (watermark, jumlah baris, window per set fitur)."""
+    if SEED_WINDOWS is None:
+        return {"enabled": False}
+    return {"enabled": True, **SEED_WINDOWS.status()}
+
+
+@router.post(
+    "/forecast/standard/refresh", tags=["model"], dependencies=[Depends(admin_required)]
+)
+async def refresh_standard_forecast_now(force: bool = False):
+    """Hitung ulang sekarang; tanpa force, dilewati jika input tidak berubah."""
+    try:
+        return await run_in_threadpool(refresh_standard_forecast, "manual", force)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Forecast refresh failed: {e}")
+
+
+# =========================
+# ISPU MASSAL
+# =========================
+CSV = "text/csv"
+
+
+@router.post("/ispu", tags=["model"])
+async def ispu_bulk(request: Request):
+    """
+    Konversi tabel observasi (kolom PM10, SO2, CO, O3, NO2; boleh sebagian) ke ISPU
+    dalam satu pass vektor. Body: application/json (list baris, {"rows": [...]}, atau
+    {kolom: [nilai...]}), columnar JSON, Arrow IPC stream, atau text/csv. Kolom lain
+    (mis. Tanggal) ikut dikembalikan; format response mengikuti header Accept.
+    """
+    content_type = wire_formats.media_type_of(request.headers.get("content-type"))
+    if content_type not in (*wire_formats.MEDIA_TYPES, CSV):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported Content-Type '{content_type}'. Use one of {[*wire_formats.MEDIA_TYPES, CSV]}.",
+        )
+    raw = await request.body()
+    with stage_timer("deserialize", format=content_type):
+        try:
+            df = await run_in_threadpool(_observations_frame, raw, content_type)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid observation table: {e}")
+    if not any(p in df.columns for p in ISPU_POLLUTANTS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Table has none of the ISPU pollutant columns {list(ISPU_POLLUTANTS)}.",
+        )
+    with stage_timer("ispu"):
+        result = await run_in_threadpool(with_ispu, df)
+
+    media_type = wire_formats.negotiate(request.headers.get("accept"))
+    with stage_timer("serialize", format=media_type):
+        if media_type == wire_formats.JSON:
+            content = await run_in_threadpool(
+                lambda: wire_formats.dumps(
+                    {"count": len(result), "rows": wire_formats.frame_to_records(result)}
+                )
+            )
+            return Response(content, media_type=wire_formats.JSON)
+        return _frame_response(result, media_type, {"count": len(result)}, key="rows")
+
+
+def _observations_frame(raw: bytes, content_type: str) -> pd.DataFrame:
+    if content_type == wire_formats.ARROW_STREAM:
+        tables = wire_formats.read_arrow_tables(raw)
+        return pd.concat([t.to_pandas() for t in tables], ignore_index=True)
+    if content_type == CSV:
+        _, delimiter = _detect_header_and_delimiter(
+            raw[: 64 * 1024].decode("utf-8-sig", errors="replace")
+        )
+        return pd.read_csv(io.BytesIO(raw), sep=delimiter, encoding="utf-8-sig")
+
+    payload = wire_formats.loads(raw)
+    if isinstance(payload, dict) and isinstance(payload.get("rows"), list):
+        payload = payload["rows"]
+    if isinstance(payload, list):
+        return pd.DataFrame.from_records(payload)
+    if isinstance(payload, dict):
+        return pd.DataFrame(payload)
+    raise ValueError("Body must be a list of rows or an object of columns.")
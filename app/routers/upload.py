@@ -1,12 +1,30 @@
+import asyncio
 import os
+from typing import List, Optional
 
 from dotenv import load_dotenv
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from minio import Minio
 from minio.error import S3Error
+from pydantic import BaseModel, Field
 from urllib3.exceptions import MaxRetryError
 
 from utils.auth import admin_required
+from utils.metrics import stage_timer
+from utils.tracing import span
+from utils.uploads import (
+    MAX_PARTS,
+    MIN_PART_SIZE,
+    UPLOAD_MAX_PART_SIZE,
+    UPLOAD_PART_SIZE,
+    ChecksumMismatch,
+    complete_upload,
+    list_uploaded_parts,
+    put_parallel,
+    run_io,
+    sha256_of_object,
+    upload_part,
+)
 
 load_dotenv()
 
@@ -27,39 +45,236 @@ def minio_client() -> Minio:
     )
 
 
-# ? REF: https://fastapi.tiangolo.com/tutorial/request-files/
+def _upload_error(e: Exception) -> HTTPException:
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, ChecksumMismatch):
+        return HTTPException(status_code=400, detail=f"Checksum mismatch: {e}")
+    if isinstance(e, S3Error):
+        return HTTPException(status_code=400, detail=f"MinIO error: {e.code}: {e.message}")
+    if isinstance(e, (ConnectionRefusedError, TimeoutError, MaxRetryError)):
+        return HTTPException(status_code=503, detail="MinIO is not reachable from the app")
+    return HTTPException(status_code=500, detail=str(e))
+
+
+# ? REF: https://fastapi.tiangolo.com/tutorial/request-files/#multiple-file-uploads
 @router.post("/", tags=["upload"])
-async def upload_data(file: UploadFile = File(...)):
-    try:
-        client = minio_client()
-        bucket = MINIO_STORAGE_BUCKET
-        file_name = file.filename
-        client.put_object(
-            bucket_name=bucket,
-            object_name=file_name,
-            data=file.file,
-            length=-1,  # File size not known
-            part_size=10 * 1024 * 1024,
-            content_type=file.content_type or "application/octet-stream",
+async def upload_data(
+    file: List[UploadFile] = File(...),
+    sha256: List[str] = Form([], description="Opsional, sha256 hex per file (urutan sama)"),
+):
+    """
+    Satu atau beberapa file (field "file" diulang). Setiap file dikirim paralel per
+    part di thread pool I/O, semua file juga berjalan bersamaan.
+    """
+    if sha256 and len(sha256) != len(file):
+        raise HTTPException(
+            status_code=400, detail="sha256 must have one entry per file."
         )
-        return {"message": "Uploaded successfully", "bucket": bucket, "name": file_name}
-    except S3Error as e:
+    bucket = MINIO_STORAGE_BUCKET
+    client = minio_client()
+
+    async def one(i: int, upload: UploadFile):
+        return await put_parallel(
+            client,
+            bucket,
+            upload.filename,
+            upload.file,
+            content_type=upload.content_type or "application/octet-stream",
+            expected_sha256=sha256[i] if sha256 else None,
+        )
+
+    with stage_timer("upload_minio_put"):
+        results = await asyncio.gather(
+            *(one(i, f) for i, f in enumerate(file)), return_exceptions=True
+        )
+
+    failed = [(f, r) for f, r in zip(file, results) if isinstance(r, BaseException)]
+    if failed:
+        error = _upload_error(failed[0][1])
+        if len(file) == 1:
+            raise error
         raise HTTPException(
-            status_code=400, detail=f"MinIO error: {e.code}: {e.message}"
+            status_code=error.status_code,
+            detail={
+                "message": f"{len(failed)} of {len(file)} files failed.",
+                "files": [
+                    {"name": f.filename, "error": _upload_error(r).detail}
+                    if isinstance(r, BaseException)
+                    else r
+                    for f, r in zip(file, results)
+                ],
+            },
         )
-    except (ConnectionRefusedError, TimeoutError, MaxRetryError) as e:
+    return {
+        "message": "Uploaded successfully",
+        "bucket": bucket,
+        "name": results[0]["name"],
+        "files": results,
+    }
+
+
+# =========================
+# UPLOAD RESUMABLE (MULTIPART)
+# =========================
+# Klien: init -> PUT tiap part (boleh paralel, boleh diulang) -> complete.
+# Jika koneksi putus, GET /multipart/{upload_id} memberi daftar part yang sudah
+# diterima sehingga hanya part yang hilang yang dikirim ulang. State disimpan di
+# MinIO (bukan di memori app), jadi part boleh masuk ke worker mana pun.
+class MultipartInit(BaseModel):
+    object_name: str = Field(..., min_length=1, max_length=1024)
+    content_type: str = "application/octet-stream"
+
+
+class CompletedPart(BaseModel):
+    part_number: int = Field(..., ge=1, le=MAX_PARTS)
+    etag: str
+
+
+class MultipartComplete(BaseModel):
+    object_name: str
+    parts: Optional[List[CompletedPart]] = Field(
+        default=None, description="Kosong = pakai semua part yang sudah diterima MinIO"
+    )
+    sha256: Optional[str] = Field(
+        default=None, description="Jika diisi, objek dibaca ulang dan dicek sha256-nya"
+    )
+
+
+@router.post("/multipart", tags=["upload"])
+async def multipart_init(payload: MultipartInit):
+    try:
+        with span("minio.create_multipart_upload", kind="client", object=payload.object_name):
+            upload_id = await run_io(
+                minio_client()._create_multipart_upload,
+                MINIO_STORAGE_BUCKET,
+                payload.object_name,
+                {"Content-Type": payload.content_type},
+            )
+    except Exception as e:
+        raise _upload_error(e)
+    return {
+        "upload_id": upload_id,
+        "bucket": MINIO_STORAGE_BUCKET,
+        "object_name": payload.object_name,
+        "part_size": UPLOAD_PART_SIZE,
+        "min_part_size": MIN_PART_SIZE,
+        "max_part_size": UPLOAD_MAX_PART_SIZE,
+    }
+
+
+@router.get("/multipart/{upload_id}", tags=["upload"])
+async def multipart_status(upload_id: str, object_name: str):
+    try:
+        parts = await run_io(
+            list_uploaded_parts, minio_client(), MINIO_STORAGE_BUCKET, object_name, upload_id
+        )
+    except Exception as e:
+        raise _upload_error(e)
+    return {
+        "upload_id": upload_id,
+        "object_name": object_name,
+        "parts": parts,
+        "uploaded_bytes": sum(p["size"] or 0 for p in parts),
+    }
+
+
+@router.put("/multipart/{upload_id}/{part_number}", tags=["upload"])
+async def multipart_upload_part(
+    upload_id: str,
+    part_number: int,
+    object_name: str,
+    request: Request,
+):
+    """Body = isi part (mentah). Header Content-MD5 (base64) opsional, dicek sebelum dikirim."""
+    if not 1 <= part_number <= MAX_PARTS:
+        raise HTTPException(status_code=400, detail=f"part_number must be 1..{MAX_PARTS}.")
+    length = int(request.headers.get("content-length") or 0)
+    if length > UPLOAD_MAX_PART_SIZE:
         raise HTTPException(
-            status_code=503, detail="MinIO is not reachable from the app"
+            status_code=413, detail=f"Part larger than {UPLOAD_MAX_PART_SIZE} bytes."
+        )
+    data = await request.body()
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty part.")
+    try:
+        part = await run_io(
+            upload_part,
+            minio_client(),
+            MINIO_STORAGE_BUCKET,
+            object_name,
+            upload_id,
+            part_number,
+            data,
+            request.headers.get("content-md5"),
         )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise _upload_error(e)
+    return {
+        "part_number": part_number,
+        "etag": part["etag"],
+        "size": part["size"],
+        "md5": part["md5"].hex(),
+    }
+
+
+@router.post("/multipart/{upload_id}/complete", tags=["upload"])
+async def multipart_complete(upload_id: str, payload: MultipartComplete):
+    client = minio_client()
+    bucket = MINIO_STORAGE_BUCKET
+    try:
+        if payload.parts is None:
+            uploaded = await run_io(
+                list_uploaded_parts, client, bucket, payload.object_name, upload_id
+            )
+            parts = [(p["part_number"], p["etag"]) for p in uploaded]
+        else:
+            parts = [(p.part_number, p.etag) for p in payload.parts]
+        if not parts:
+            raise HTTPException(status_code=400, detail="No parts uploaded.")
+        # ETag PART = md5 HEX, JADI ETag GABUNGAN BISA DIVERIFIKASI
+        part_md5s = [bytes.fromhex(etag.strip('"')) for _, etag in sorted(parts)]
+        etag = await run_io(
+            complete_upload, client, bucket, payload.object_name, upload_id, parts, part_md5s
+        )
+        sha = None
+        if payload.sha256:
+            sha = await run_io(sha256_of_object, client, bucket, payload.object_name)
+            if sha != payload.sha256.strip().lower():
+                await run_io(client.remove_object, bucket, payload.object_name)
+                raise ChecksumMismatch(f"sha256 {sha} != expected {payload.sha256}.")
+    except Exception as e:
+        raise _upload_error(e)
+    return {
+        "message": "Uploaded successfully",
+        "bucket": bucket,
+        "name": payload.object_name,
+        "etag": etag,
+        "parts": len(parts),
+        "sha256": sha,
+    }
+
+
+@router.delete("/multipart/{upload_id}", tags=["upload"])
+async def multipart_abort(upload_id: str, object_name: str):
+    try:
+        await run_io(
+            minio_client()._abort_multipart_upload,
+            MINIO_STORAGE_BUCKET,
+            object_name,
+            upload_id,
+        )
+    except Exception as e:
+        raise _upload_error(e)
+    return {"message": "Upload aborted", "upload_id": upload_id}
 
 
 @router.get("/list", tags=["upload"])
 async def bucket_list():
     try:
         client = minio_client()
-        buckets = client.list_buckets()
+        with span("minio.list_buckets", kind="client"):
+            buckets = await run_io(client.list_buckets)
         return {
             "buckets": [
                 {
@@ -0,0 +1,248 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from fastapi import status
+
+from utils.metrics import counter, gauge, histogram
+
+# ADMISSION CONTROL UNTUK INFERENSI (CPU-BOUND, SATU RUNTIME TENSORFLOW)
+# - Maksimal INFERENCE_CONCURRENCY rollout berjalan bersamaan (di threadpool, bukan di
+#   event loop, jadi endpoint admin/training tetap responsif).
+# - Sisanya menunggu di antrean per lane dengan batas panjang dan deadline.
+#   Lane "interactive" selalu dilayani lebih dulu; lane "batch" (rollout dengan riwayat
+#   dari user) dibatasi INFERENCE_BATCH_CONCURRENCY slot supaya tidak memonopoli.
+# - Antrean penuh -> 429, tidak mungkin/tidak sempat mulai sebelum deadline -> 503.
+#   Keduanya dengan Retry-After dari estimasi waktu layanan (EWMA).
+# ? https://sre.google/sre-book/handling-overload/
+INFERENCE_CONCURRENCY = int(os.getenv("INFERENCE_CONCURRENCY", 2))
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", 32))
+INFERENCE_QUEUE_TIMEOUT_MS = float(os.getenv("INFERENCE_QUEUE_TIMEOUT_MS", 5000))
+INFERENCE_BATCH_CONCURRENCY = int(
+    os.getenv("INFERENCE_BATCH_CONCURRENCY", max(1, INFERENCE_CONCURRENCY - 1))
+)
+INFERENCE_BATCH_QUEUE_SIZE = int(os.getenv("INFERENCE_BATCH_QUEUE_SIZE", 8))
+INFERENCE_BATCH_QUEUE_TIMEOUT_MS = float(
+    os.getenv("INFERENCE_BATCH_QUEUE_TIMEOUT_MS", 15000)
+)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+QUEUE_DEPTH = gauge("app_admission_queue_depth", "Requests waiting for an inference slot.")
+IN_FLIGHT = gauge("app_admission_in_flight", "Inference requests holding a slot.")
+REJECTIONS = counter(
+    "app_admission_rejections_total", "Inference requests shed by admission control."
+)
+WAIT_SECONDS = histogram(
+    "app_admission_wait_seconds", "Time spent waiting for an inference slot."
+)
+
+_EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, lane: str, reason: str, retry_after: int):
+        super().__init__(f"Inference {lane} lane {reason}; retry after {retry_after}s")
+        self.status_code = status_code
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Lane:
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, timeout_ms: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout_ms / 1000.0
+        self.in_flight = 0
+        # (event loop waiter, future): DIBANGUNKAN DI LOOP-NYA SENDIRI
+        self.waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+
+class AdmissionController:
+    def __init__(self, limit: int, lanes: Dict[str, Tuple[int, int, float]]):
+        """lanes: {nama: (max_concurrency, max_queue, timeout_ms)}, urutan dict = prioritas."""
+        self.limit = max(1, limit)
+        self.lanes = {
+            name: _Lane(name, max(1, min(c, self.limit)), q, t)
+            for name, (c, q, t) in lanes.items()
+        }
+        self.in_flight = 0
+        # ESTIMASI LAMA SATU ROLLOUT PER LANE (DETIK), UNTUK Retry-After & SHEDDING AWAL
+        self._service_time: Dict[str, Optional[float]] = {name: None for name in lanes}
+        self._lock = threading.Lock()
+        for name in lanes:
+            QUEUE_DEPTH.set(0, lane=name)
+            IN_FLIGHT.set(0, lane=name)
+
+    # =========================
+    # ESTIMASI
+    # =========================
+    def _estimated_wait(self, lane: _Lane, position: int) -> float:
+        """Perkiraan kasar waktu tunggu jika masuk antrean di posisi ini."""
+        service = self._service_time[lane.name]
+        if service is None:
+            return 0.0
+        # LANE PRIORITAS LEBIH TINGGI IKUT DIHITUNG KARENA DILAYANI LEBIH DULU
+        ahead = position
+        for other in self._lanes_before(lane):
+            ahead += len(other.waiters)
+        return service * (ahead + 1) / lane.max_concurrency
+
+    def _lanes_before(self, lane: _Lane):
+        for other in self.lanes.values():
+            if other is lane:
+                return
+            yield other
+
+    def _retry_after(self, lane: _Lane) -> int:
+        estimate = self._estimated_wait(lane, len(lane.waiters))
+        return max(1, math.ceil(min(estimate, 300.0)))
+
+    def _reject(self, lane: _Lane, status_code: int, reason: str) -> AdmissionRejected:
+        REJECTIONS.inc(lane=lane.name, reason=reason)
+        return AdmissionRejected(status_code, lane.name, reason, self._retry_after(lane))
+
+    # =========================
+    # SLOT
+    # =========================
+    def _can_run(self, lane: _Lane) -> bool:
+        return self.in_flight < self.limit and lane.in_flight < lane.max_concurrency
+
+    def _grant(self, lane: _Lane) -> None:
+        self.in_flight += 1
+        lane.in_flight += 1
+        IN_FLIGHT.set(lane.in_flight, lane=lane.name)
+
+    def _dispatch(self) -> None:
+        """Serahkan slot kosong ke waiter, lane prioritas tertinggi lebih dulu (di bawah lock)."""
+        for lane in self.lanes.values():
+            while lane.waiters and self._can_run(lane):
+                loop, future = lane.waiters.popleft()
+                self._grant(lane)
+                try:
+                    loop.call_soon_threadsafe(_resolve, future)
+                except RuntimeError:
+                    # EVENT LOOP WAITER SUDAH DITUTUP: KEMBALIKAN SLOT
+                    self.in_flight -= 1
+                    lane.in_flight -= 1
+            QUEUE_DEPTH.set(len(lane.waiters), lane=lane.name)
+            IN_FLIGHT.set(lane.in_flight, lane=lane.name)
+
+    def _release(self, lane: _Lane, service_seconds: Optional[float]) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            lane.in_flight -= 1
+            if service_seconds is not None:
+                previous = self._service_time[lane.name]
+                self._service_time[lane.name] = (
+                    service_seconds
+                    if previous is None
+                    else previous + _EWMA_ALPHA * (service_seconds - previous)
+                )
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, lane_name: str = INTERACTIVE) -> AsyncIterator[float]:
+        """
+        Tunggu slot inferensi; yield lama menunggu (detik). Melempar AdmissionRejected
+        jika antrean penuh atau deadline terlewati sebelum mendapat slot.
+        """
+        lane = self.lanes[lane_name]
+        t0 = time.perf_counter()
+        future = None
+        with self._lock:
+            if (
+                self._can_run(lane)
+                and not lane.waiters
+                and not any(other.waiters for other in self._lanes_before(lane))
+            ):
+                self._grant(lane)
+            elif len(lane.waiters) >= lane.max_queue:
+                raise self._reject(lane, status.HTTP_429_TOO_MANY_REQUESTS, "queue_full")
+            elif self._estimated_wait(lane, len(lane.waiters)) > lane.timeout:
+                # SHEDDING AWAL: PASTI TIDAK SEMPAT MULAI SEBELUM DEADLINE
+                raise self._reject(lane, status.HTTP_503_SERVICE_UNAVAILABLE, "overloaded")
+            else:
+                loop = asyncio.get_running_loop()
+                future = loop.create_future()
+                lane.waiters.append((loop, future))
+                QUEUE_DEPTH.set(len(lane.waiters), lane=lane.name)
+
+        if future is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout=lane.timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                with self._lock:
+                    granted = not _withdraw(lane, future)
+                    QUEUE_DEPTH.set(len(lane.waiters), lane=lane.name)
+                if isinstance(e, asyncio.CancelledError):
+                    # CLIENT PUTUS SAAT MENUNGGU
+                    if granted:
+                        self._release(lane, None)
+                    raise
+                if not granted:
+                    WAIT_SECONDS.observe(
+                        time.perf_counter() - t0, lane=lane.name, outcome="timeout"
+                    )
+                    raise self._reject(lane, status.HTTP_503_SERVICE_UNAVAILABLE, "deadline")
+                # SLOT DIBERIKAN BERSAMAAN DENGAN TIMEOUT: TETAP DIPAKAI
+
+        waited = time.perf_counter() - t0
+        WAIT_SECONDS.observe(waited, lane=lane.name, outcome="admitted")
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield waited
+            failed = False
+        finally:
+            # ROLLOUT YANG GAGAL TIDAK DIPAKAI UNTUK ESTIMASI
+            self._release(lane, None if failed else time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "in_flight": lane.in_flight,
+                    "queued": len(lane.waiters),
+                    "max_concurrency": lane.max_concurrency,
+                    "max_queue": lane.max_queue,
+                    "timeout_s": lane.timeout,
+                    "service_time_s": self._service_time[name],
+                }
+                for name, lane in self.lanes.items()
+            }
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _withdraw(lane: _Lane, future: asyncio.Future) -> bool:
+    """Hapus waiter dari antrean; False jika sudah terlanjur diberi slot."""
+    for item in lane.waiters:
+        if item[1] is future:
+            lane.waiters.remove(item)
+            return True
+    return False
+
+
+INFERENCE_ADMISSION = AdmissionController(
+    INFERENCE_CONCURRENCY,
+    {
+        INTERACTIVE: (INFERENCE_CONCURRENCY, INFERENCE_QUEUE_SIZE, INFERENCE_QUEUE_TIMEOUT_MS),
+        BATCH: (
+            INFERENCE_BATCH_CONCURRENCY,
+            INFERENCE_BATCH_QUEUE_SIZE,
+            INFERENCE_BATCH_QUEUE_TIMEOUT_MS,
+        ),
+    },
+)
@@ -16,6 +16,7 @@ JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_EXPIRES_MIN = int(os.getenv("JWT_EXPIRES_MIN", 60))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 
 def _verify_admin_credentials(username: str, password: str) -> bool:
@@ -47,3 +48,18 @@ def admin_required(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
     if data.get("role") != "admin" or not data.get("sub"):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
     return {"username": data["sub"], "role": "admin"}
+
+
+def admin_optional(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+) -> Optional[Dict[str, Any]]:
+    """
+    Untuk endpoint publik dengan opsi khusus admin; None jika tanpa token atau token
+    tidak valid / bukan admin (request publik tidak boleh gagal karena token basi).
+    """
+    if not token:
+        return None
+    try:
+        return admin_required(token)
+    except HTTPException:
+        return None
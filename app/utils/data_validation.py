@@ -1,7 +1,17 @@
 import csv
-from typing import List
+import os
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
 from fastapi import HTTPException, UploadFile, status
+from openpyxl import Workbook
+
+load_dotenv()
+
+CSV_CHUNK_ROWS = int(os.getenv("CSV_CHUNK_ROWS", 50_000))
+CSV_MAX_ERRORS = int(os.getenv("CSV_MAX_ERRORS", 100))
 
 REQUIRED_COLS: List[str] = [
     "PM10",
@@ -86,3 +96,328 @@ def validate_data(upload: UploadFile, required_cols: List[str] = REQUIRED_COLS)
                 "found": header,
             },
         )
+
+
+# =========================
+# VALIDASI STREAMING (PER CHUNK)
+# =========================
+# File dibaca sekali, per CSV_CHUNK_ROWS baris, dan setiap chunk yang sudah
+# dinormalisasi langsung diteruskan ke sink (mis. XlsxChunkWriter). Antar chunk
+# hanya tanggal valid terakhir (per stasiun) yang dibawa, jadi memori tidak
+# tergantung ukuran file.
+DATE_COL = "Tanggal"
+# KOLOM STASIUN OPSIONAL: DATA MULTI-STASIUN DALAM FORMAT PANJANG (SATU BARIS PER
+# STASIUN PER HARI). URUTAN TANGGAL, DUPLIKAT, DAN CELAH DICEK PER STASIUN.
+STATION_COL = "Stasiun"
+
+# URUTAN KOLOM A..K YANG DIBACA CTAS DREMIO (+ L = STATION_COL JIKA ADA)
+INGEST_COLUMNS: List[str] = [DATE_COL, *REQUIRED_COLS]
+
+# BATAS WAJAR PER KOLOM (INKLUSIF). POLUTAN: 2x BATAS ATAS ISPU (ug/m3),
+# sehingga kode "data tidak ada" seperti 8888/9999 tetap tertangkap.
+VALUE_RANGES: Dict[str, Tuple[float, float]] = {
+    "PM10": (0, 1000),
+    "SO2": (0, 2400),
+    "CO": (0, 90000),
+    "O3": (0, 2000),
+    "NO2": (0, 6000),
+    "Temperatur": (-10, 50),
+    "Kelembapan": (0, 100),
+    "Curah Hujan": (0, 1000),
+    "Penyinaran Matahari": (0, 24),
+    "Kecepatan Angin": (0, 100),
+}
+
+
+def _fmt_date(value: Optional[pd.Timestamp]) -> Optional[str]:
+    return value.strftime("%Y-%m-%d") if value is not None else None
+
+
+class _Report:
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.rows = 0
+        self.chunks = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.error_counts: Dict[str, int] = {}
+        self.missing_values: Dict[str, int] = {c: 0 for c in REQUIRED_COLS}
+        self.gaps: List[Dict[str, Any]] = []
+        self.missing_days = 0
+        self.first_date: Optional[pd.Timestamp] = None
+        self.last_date: Optional[pd.Timestamp] = None
+        # TANGGAL TERAKHIR PER STASIUN (HANYA UNTUK DATA MULTI-STASIUN)
+        self.stations: Dict[str, _DateState] = {}
+
+    def add(self, mask: np.ndarray, row0, column: str, kind: str, values) -> None:
+        """
+        Catat semua baris di mask; hanya max_errors pertama yang disimpan detailnya.
+        row0: offset baris chunk, atau array offset per baris (subset per stasiun).
+        """
+        count = int(mask.sum())
+        if not count:
+            return
+        key = f"{column}:{kind}"
+        self.error_counts[key] = self.error_counts.get(key, 0) + count
+        room = self.max_errors - len(self.errors)
+        if room <= 0:
+            return
+        for i in np.flatnonzero(mask)[:room]:
+            value = values[i]
+            self.errors.append(
+                {
+                    "row": int(row0[i] if isinstance(row0, np.ndarray) else row0 + i) + 1,
+                    "column": column,
+                    "error": kind,
+                    "value": None if pd.isna(value) else value,
+                }
+            )
+
+    def as_dict(self) -> Dict[str, Any]:
+        error_count = sum(self.error_counts.values())
+        return {
+            "valid": error_count == 0 and self.rows > 0,
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "error_count": error_count,
+            "error_counts": self.error_counts,
+            "errors": sorted(self.errors, key=lambda e: e["row"]),
+            "errors_truncated": error_count > len(self.errors),
+            "missing_values": {c: n for c, n in self.missing_values.items() if n},
+            "missing_days": self.missing_days,
+            "gaps": self.gaps,
+            "date_range": {
+                "first": _fmt_date(self.first_date),
+                "last": _fmt_date(self.last_date),
+            },
+            "stations": {
+                name: {
+                    "first": _fmt_date(state.first_date),
+                    "last": _fmt_date(state.last_date),
+                }
+                for name, state in self.stations.items()
+            },
+        }
+
+
+class _DateState:
+    def __init__(self):
+        self.first_date: Optional[pd.Timestamp] = None
+        self.last_date: Optional[pd.Timestamp] = None
+
+
+def _clean(name: str) -> str:
+    return name.strip().lstrip("\ufeff").strip()
+
+
+def _resolve_columns(header: List[str]) -> Dict[str, str]:
+    """Nama kolom kanonik -> nama kolom di CSV (case/spasi diabaikan)."""
+    by_lower = {_clean(h).lower(): _clean(h) for h in header}
+    mapping = {c: by_lower[c.lower()] for c in REQUIRED_COLS if c.lower() in by_lower}
+    if STATION_COL.lower() in by_lower:
+        mapping[STATION_COL] = by_lower[STATION_COL.lower()]
+    if DATE_COL.lower() in by_lower:
+        mapping[DATE_COL] = by_lower[DATE_COL.lower()]
+    else:
+        # SAMA SEPERTI CTAS: KOLOM PERTAMA DIANGGAP TANGGAL
+        others = [_clean(h) for h in header if _clean(h) not in mapping.values()]
+        if others:
+            mapping[DATE_COL] = others[0]
+    return mapping
+
+
+def _check_dates(
+    report: _Report,
+    raw: pd.Series,
+    row0,
+    state: Optional[_DateState] = None,
+    station: Optional[str] = None,
+) -> pd.Series:
+    """state: tanggal terakhir pembanding (default: report, data satu stasiun)."""
+    state = report if state is None else state
+    dates = pd.to_datetime(raw, format="%Y-%m-%d", errors="coerce")
+    values = raw.to_numpy()
+    report.add(dates.isna().to_numpy(), row0, DATE_COL, "invalid_date", values)
+
+    valid = dates.notna().to_numpy()
+    if not valid.any():
+        return dates
+    days = dates[valid].to_numpy().astype("datetime64[D]").astype(np.int64)
+    # PEMBANDING = TANGGAL TERBESAR SEBELUMNYA, SUPAYA SATU BARIS MUNDUR
+    # TIDAK MEMBUAT CELAH PALSU PADA BARIS BERIKUTNYA
+    start = (
+        np.datetime64(state.last_date, "D").astype(np.int64)
+        if state.last_date is not None
+        else days[0] - 1
+    )
+    prev = np.maximum.accumulate(np.concatenate([[start], days]))[:-1]
+    step = days - prev
+
+    # KEMBALIKAN MASK (HANYA BARIS BERTANGGAL VALID) KE POSISI BARIS CHUNK
+    def at_rows(mask: np.ndarray) -> np.ndarray:
+        full = np.zeros(len(raw), dtype=bool)
+        full[np.flatnonzero(valid)[mask]] = True
+        return full
+
+    report.add(at_rows(step == 0), row0, DATE_COL, "duplicate_date", values)
+    report.add(at_rows(step < 0), row0, DATE_COL, "date_not_increasing", values)
+    gap_idx = np.flatnonzero(step > 1)
+    report.missing_days += int((step[gap_idx] - 1).sum())
+    for i in gap_idx[: max(0, report.max_errors - len(report.gaps))]:
+        gap = {
+            "after": str(np.datetime64(int(prev[i]), "D")),
+            "before": str(np.datetime64(int(days[i]), "D")),
+            "missing_days": int(step[i] - 1),
+        }
+        report.gaps.append(gap if station is None else {STATION_COL: station, **gap})
+
+    first, last = dates[valid].iloc[0], dates[valid].max()
+    if state.first_date is None:
+        state.first_date = first
+    state.last_date = last if state.last_date is None else max(state.last_date, last)
+    if state is not report:
+        # RENTANG TANGGAL LAPORAN = GABUNGAN SEMUA STASIUN
+        report.first_date = min(first, report.first_date or first)
+        report.last_date = max(last, report.last_date or last)
+    return dates
+
+
+def _check_station_dates(
+    report: _Report, stations: pd.Series, raw: pd.Series, row0: int
+) -> pd.Series:
+    """_check_dates per stasiun; nomor baris error tetap nomor baris di file."""
+    blank = stations.eq("").to_numpy()
+    report.add(blank, row0, STATION_COL, "missing_station", stations.to_numpy())
+    dates = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+    positions = np.arange(len(raw))
+    for station, idx in stations.groupby(stations.to_numpy(), sort=False).indices.items():
+        if station == "":
+            continue
+        state = report.stations.setdefault(station, _DateState())
+        checked = _check_dates(report, raw.iloc[idx], row0 + positions[idx], state, station)
+        dates.iloc[idx] = checked.to_numpy()
+    return dates
+
+
+def _check_numbers(
+    report: _Report, column: str, raw: pd.Series, row0: int, decimal_comma: bool
+) -> np.ndarray:
+    text = raw.str.strip()
+    blank = (text.isna() | text.eq("")).to_numpy()
+    if decimal_comma:
+        text = text.str.replace(",", ".", regex=False)
+    values = pd.to_numeric(text, errors="coerce").to_numpy(dtype="float64")
+    report.missing_values[column] += int(blank.sum())
+    report.add(np.isnan(values) & ~blank, row0, column, "not_a_number", raw.to_numpy())
+    lo, hi = VALUE_RANGES.get(column, (-np.inf, np.inf))
+    with np.errstate(invalid="ignore"):
+        out = (values < lo) | (values > hi)
+    report.add(out, row0, column, f"out_of_range[{lo},{hi}]", raw.to_numpy())
+    return values
+
+
+def validate_csv_stream(
+    fileobj: IO[bytes],
+    sink: Optional[Callable[[pd.DataFrame], None]] = None,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    max_errors: int = CSV_MAX_ERRORS,
+) -> Dict[str, Any]:
+    """
+    Validasi CSV per chunk: tipe angka, format tanggal YYYY-MM-DD, urutan tanggal
+    naik, duplikat, hari yang hilang, dan rentang nilai (per stasiun jika ada kolom
+    STATION_COL). Setiap chunk yang sudah dinormalisasi (kolom INGEST_COLUMNS
+    [+ STATION_COL], Tanggal datetime, angka float) dikirim ke sink.
+    Return laporan; laporan["valid"] False jika ada error. "row" di daftar error
+    adalah nomor baris data (1 = baris pertama setelah header).
+    """
+    pos = fileobj.tell()
+    text = fileobj.read(4096).decode("utf-8", errors="ignore")
+    fileobj.seek(pos)
+    header, delimiter = _detect_header_and_delimiter(text)
+    mapping = _resolve_columns(header)
+    missing = [c for c in INGEST_COLUMNS if c not in mapping]
+    if missing:
+        raise ValueError(f"CSV is missing columns {missing}.")
+
+    has_station = STATION_COL in mapping
+    columns = INGEST_COLUMNS + ([STATION_COL] if has_station else [])
+    report = _Report(max_errors)
+    wanted = set(mapping.values())
+    reader = pd.read_csv(
+        fileobj,
+        sep=delimiter,
+        dtype=str,
+        usecols=lambda c: _clean(c) in wanted,
+        keep_default_na=False,
+        comment="#",
+        encoding="utf-8-sig",
+        chunksize=chunk_rows,
+    )
+    with reader:
+        for chunk in reader:
+            chunk.columns = [_clean(c) for c in chunk.columns]
+            row0 = report.rows
+            dates = chunk[mapping[DATE_COL]].str.strip()
+            if has_station:
+                stations = chunk[mapping[STATION_COL]].str.strip()
+                normalized = {DATE_COL: _check_station_dates(report, stations, dates, row0)}
+            else:
+                normalized = {DATE_COL: _check_dates(report, dates, row0)}
+            for column in REQUIRED_COLS:
+                normalized[column] = _check_numbers(
+                    report, column, chunk[mapping[column]], row0, delimiter != ","
+                )
+            if has_station:
+                normalized[STATION_COL] = stations.to_numpy()
+            report.rows += len(chunk)
+            report.chunks += 1
+            if sink is not None:
+                sink(pd.DataFrame(normalized, columns=columns))
+    return report.as_dict()
+
+
+# =========================
+# WRITER XLSX (INGESTION)
+# =========================
+class XlsxChunkWriter:
+    """
+    Workbook openpyxl mode write-only: baris langsung ditulis ke file sementara,
+    tidak disimpan sebagai objek cell di memori.
+    ? https://openpyxl.readthedocs.io/en/stable/optimized.html#write-only-mode
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None):
+        """columns None: diambil dari chunk pertama (INGEST_COLUMNS [+ STATION_COL])."""
+        self.columns = columns
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        if columns is not None:
+            self.sheet.append(columns)
+        self.rows = 0
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            self.sheet.append(self.columns)
+        cells = []
+        for column in self.columns:
+            series = chunk[column]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                # CTAS MEMBACA TANGGAL SEBAGAI TEKS YYYY-MM-DD
+                text = series.dt.strftime("%Y-%m-%d")
+                cells.append(text.where(series.notna(), None).tolist())
+            else:
+                cells.append(series.astype(object).where(series.notna(), None).tolist())
+        for row in zip(*cells):
+            self.sheet.append(row)
+        self.rows += len(chunk)
+
+    def save(self, fileobj: IO[bytes]) -> None:
+        self.workbook.save(fileobj)
+
+    def discard(self) -> None:
+        """Buang workbook yang tidak jadi disimpan (hapus file sementara openpyxl)."""
+        if self.sheet.closed:
+            return
+        self.sheet.close()
+        if self.sheet._writer is not None:
+            self.sheet._writer.cleanup()
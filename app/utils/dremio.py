@@ -0,0 +1,60 @@
+import base64
+import os
+from typing import List
+
+import pyarrow as pa
+from dotenv import load_dotenv
+from pyarrow.flight import FlightCallOptions, FlightClient, FlightDescriptor
+
+from utils.tracing import inject_headers, span
+
+# AKSES DREMIO LEWAT ARROW FLIGHT (DIPAKAI ROUTER DAN SERVICE LATAR BELAKANG)
+load_dotenv()
+
+DREMIO_ENDPOINT = os.getenv("DREMIO_ENDPOINT")
+DREMIO_USERNAME = os.getenv("DREMIO_USERNAME")
+DREMIO_PASSWORD = os.getenv("DREMIO_PASSWORD")
+
+
+def dremio_headers() -> List[tuple]:
+    basic_token = base64.b64encode(
+        f"{DREMIO_USERNAME}:{DREMIO_PASSWORD}".encode("utf-8")
+    ).decode("utf-8")
+    return [(b"authorization", f"Basic {basic_token}".encode("utf-8"))]
+
+
+# ? SETIAP PANGGILAN FLIGHT JADI SPAN CLIENT + HEADER traceparent IKUT DIKIRIM
+def flight_get_info(flight_client: FlightClient, query: str, headers: List[tuple]):
+    with span(
+        "flight.get_flight_info",
+        kind="client",
+        **{"db.system": "dremio", "db.statement": query.strip()[:500]},
+    ):
+        return flight_client.get_flight_info(
+            FlightDescriptor.for_command(query.encode("utf-8")),
+            FlightCallOptions(headers=inject_headers(headers)),
+        )
+
+
+def flight_do_get(flight_client: FlightClient, info, headers: List[tuple], read=True):
+    with span("flight.do_get", kind="client", **{"db.system": "dremio"}) as s:
+        reader = flight_client.do_get(
+            info.endpoints[0].ticket, FlightCallOptions(headers=inject_headers(headers))
+        )
+        if not read:
+            return reader
+        table = reader.read_all()
+        if s is not None:
+            s.set_attribute("db.rows", table.num_rows)
+        return table
+
+
+def dremio_query(query: str) -> pa.Table:
+    """Satu query SELECT -> Arrow table (koneksi baru per panggilan)."""
+    headers = dremio_headers()
+    flight_client = FlightClient(DREMIO_ENDPOINT)
+    try:
+        info = flight_get_info(flight_client, query, headers)
+        return flight_do_get(flight_client, info, headers)
+    finally:
+        flight_client.close()
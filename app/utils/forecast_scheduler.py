@@ -0,0 +1,261 @@
+import datetime as dt
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from predictions_model.predict import (
+    load_inference_runtime,
+    load_seed_window,
+    model_signature,
+    persistence_meteorology,
+    predict_pollutants,
+    predict_stations,
+)
+from predictions_model.stations import STATION_COL, is_station_model, station_seed_frame
+from utils import wire_formats
+from utils.forecast_store import latest_materialized, materialize_forecast, request_hash
+from utils.metrics import counter, gauge, stage_timer
+from utils.model_utils import (
+    MODELS_BASE,
+    PREDICTIONS_BASE,
+    _active_model_name,
+    _read_json,
+    _write_json,
+)
+from utils.seed_windows import refresh_seed_windows
+
+# FORECAST STANDAR 14 HARI YANG DIHITUNG DI LATAR BELAKANG
+# Input: model aktif + seed window (observasi terbaru, di-refresh dari Dremio sebelum
+# setiap pengecekan jika SEED_SOURCE_TABLE diisi) + cuaca minggu-1 persistence
+# (7 hari terakhir seed window diulang; per stasiun untuk model multi-stasiun, yang
+# di-rollout sekaligus lewat predict_stations). Hash input disimpan bersama setiap versi;
+# perhitungan dilewati jika hash sama dengan versi terbaru.
+# Dipicu: sekali sehari (FORECAST_SCHEDULE_AT), cek berkala (FORECAST_CHECK_SECONDS),
+# dan segera setelah model aktif berubah (PATCH /model/active, registry watcher).
+# Snapshot versi terbaru ditulis ke standard_forecast.json (dependensi response cache).
+load_dotenv()
+
+FORECAST_SCHEDULER_ENABLED = os.getenv("FORECAST_SCHEDULER_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+FORECAST_SCHEDULE_AT = os.getenv("FORECAST_SCHEDULE_AT", "00:05")
+FORECAST_CHECK_SECONDS = float(os.getenv("FORECAST_CHECK_SECONDS", 300))
+
+STANDARD_FORECAST = "standard"
+STANDARD_FORECAST_PATH = Path(
+    os.getenv("STANDARD_FORECAST_PATH") or PREDICTIONS_BASE / "standard_forecast.json"
+)
+STANDARD_WEEK1_DAYS = 7
+
+REFRESHES = counter(
+    "app_scheduled_forecast_refreshes_total", "Scheduled forecast refresh attempts by result."
+)
+FORECAST_VERSION = gauge(
+    "app_scheduled_forecast_version", "Version of the materialized forecast being served."
+)
+
+_REFRESH_LOCK = threading.Lock()
+
+
+def standard_inputs(model_name: str) -> Tuple[pd.DataFrame, str, Dict[str, Any]]:
+    """(cuaca minggu-1, hash input, ringkasan input) untuk forecast standar."""
+    _, _, _, metadata = load_inference_runtime(model_name)
+    if is_station_model(metadata):
+        seed = station_seed_frame(MODELS_BASE / model_name)
+        df_meteorology = pd.concat(
+            persistence_meteorology(rows, days=STANDARD_WEEK1_DAYS).assign(
+                **{STATION_COL: name}
+            )
+            for name, rows in seed.groupby(STATION_COL, sort=False)
+        )
+    else:
+        seed = load_seed_window(
+            model_name, list(metadata["features"]), int(metadata["time_step"])
+        )
+        df_meteorology = persistence_meteorology(seed, days=STANDARD_WEEK1_DAYS)
+    seed_digest = hashlib.sha256(
+        pd.util.hash_pandas_object(seed, index=True).to_numpy().tobytes()
+    ).hexdigest()
+    summary = {
+        "model_name": model_name,
+        "model_signature": list(model_signature(model_name)),
+        "seed_last_date": seed.index.max().strftime("%Y-%m-%d"),
+        "seed_digest": seed_digest,
+        "meteorology": "persistence",
+        "horizon_days": 2 * STANDARD_WEEK1_DAYS,
+    }
+    return df_meteorology, request_hash(summary), summary
+
+
+def refresh_standard_forecast(reason: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Hitung ulang forecast standar jika input berubah (atau force=True).
+    Return {"status": "materialized" | "unchanged", "version", ...}.
+    """
+    with _REFRESH_LOCK:
+        try:
+            refresh_seed_windows()
+        except Exception as e:
+            # DREMIO TIDAK TERSEDIA: LANJUT DENGAN SEED WINDOW TERAKHIR
+            print(f"Seed window refresh failed: {e}")
+        model_name = _active_model_name()
+        if not model_name:
+            raise FileNotFoundError("No active model configured.")
+        with stage_timer("scheduled_forecast_inputs"):
+            df_meteorology, input_hash, summary = standard_inputs(model_name)
+
+        current = latest_materialized(STANDARD_FORECAST)
+        if current is not None and current["input_hash"] == input_hash and not force:
+            REFRESHES.inc(result="unchanged", reason=reason)
+            return {"status": "unchanged", "version": current["version"], "reason": reason}
+
+        with stage_timer("scheduled_forecast_rollout"):
+            if STATION_COL in df_meteorology.columns:
+                preds_all = predict_stations(df_meteorology, model_dir=model_name)
+            else:
+                _, _, preds_all = predict_pollutants(
+                    df_meteorology=df_meteorology, model_dir=model_name
+                )
+                preds_all = preds_all.reset_index()
+        stored = {
+            "predictions": wire_formats.frame_to_records(preds_all),
+            "inputs": summary,
+        }
+        record = materialize_forecast(
+            STANDARD_FORECAST, stored, input_hash, model_name=model_name, reason=reason
+        )
+        _write_json(STANDARD_FORECAST_PATH, _snapshot(record))
+        FORECAST_VERSION.set(record["version"], name=STANDARD_FORECAST)
+        REFRESHES.inc(result="materialized", reason=reason)
+        return {
+            "status": "materialized",
+            "version": record["version"],
+            "reason": reason,
+            "materialized_at": record["materialized_at"],
+        }
+
+
+def _snapshot(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "version": record["version"],
+        "materialized_at": record["materialized_at"],
+        "model_name": record["model_name"],
+        **record["payload"],
+    }
+
+
+def current_standard_forecast() -> Optional[Dict[str, Any]]:
+    """
+    Versi terbaru sebagai payload response. Versi dari worker lain terdeteksi lewat
+    snapshot (versi di file lebih baru dari yang ada di memori).
+    """
+    record = latest_materialized(STANDARD_FORECAST)
+    snapshot = _read_snapshot_version()
+    if snapshot is not None and (record is None or snapshot > record["version"]):
+        record = latest_materialized(STANDARD_FORECAST, reload=True)
+    return _snapshot(record) if record is not None else None
+
+
+def _read_snapshot_version() -> Optional[int]:
+    data = _read_json(STANDARD_FORECAST_PATH)
+    return data.get("version") if isinstance(data, dict) else None
+
+
+def _seconds_until(at: str, now: Optional[dt.datetime] = None) -> float:
+    """Detik sampai jam HH:MM (waktu lokal) berikutnya."""
+    now = now or dt.datetime.now()
+    hour, minute = (int(x) for x in at.split(":"))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += dt.timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+class ForecastScheduler:
+    """Thread latar belakang; trigger() membangunkannya untuk refresh segera."""
+
+    def __init__(
+        self,
+        schedule_at: str = FORECAST_SCHEDULE_AT,
+        check_seconds: float = FORECAST_CHECK_SECONDS,
+    ):
+        self.schedule_at = schedule_at
+        self.check_seconds = check_seconds
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._reason = "startup"
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="forecast-scheduler", daemon=True
+        )
+
+    def start(self) -> "ForecastScheduler":
+        self._wake.set()
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+
+    def trigger(self, reason: str) -> None:
+        with self._lock:
+            self._reason = reason
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            until_daily = _seconds_until(self.schedule_at)
+            woken = self._wake.wait(min(self.check_seconds, until_daily))
+            if self._stop.is_set():
+                return
+            self._wake.clear()
+            with self._lock:
+                reason, self._reason = self._reason, "check"
+            if not woken:
+                reason = "daily" if until_daily <= self.check_seconds else "check"
+            try:
+                self.last_result = refresh_standard_forecast(reason)
+                if self.last_result["status"] == "materialized":
+                    print(
+                        f"Standard forecast v{self.last_result['version']} materialized "
+                        f"({reason})"
+                    )
+            except Exception as e:
+                REFRESHES.inc(result="failed", reason=reason)
+                self.last_result = {"status": "failed", "reason": reason, "error": str(e)}
+                print(f"Standard forecast refresh failed ({reason}): {e}")
+
+
+SCHEDULER: Optional[ForecastScheduler] = None
+
+
+def start_scheduler() -> Optional[ForecastScheduler]:
+    global SCHEDULER
+    if FORECAST_SCHEDULER_ENABLED and SCHEDULER is None:
+        SCHEDULER = ForecastScheduler().start()
+    return SCHEDULER
+
+
+def stop_scheduler() -> None:
+    global SCHEDULER
+    if SCHEDULER is not None:
+        SCHEDULER.stop()
+        SCHEDULER = None
+
+
+def request_refresh(reason: str) -> bool:
+    """Bangunkan scheduler (jika aktif). False jika scheduler tidak berjalan."""
+    if SCHEDULER is None:
+        return False
+    SCHEDULER.trigger(reason)
+    return True
@@ -0,0 +1,473 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.data_validation import STATION_COL
+from utils.ispu import ISPU_COLUMNS
+from utils.model_utils import MODELS_BASE, PREDICTIONS_BASE, _read_json
+
+# RIWAYAT FORECAST (APPEND-ONLY) DI SQLITE
+# forecasts        : satu baris per forecast yang disimpan (diindeks per issue_date)
+# forecast_values  : format panjang (forecast, tanggal target, stasiun, polutan, nilai);
+#                    stasiun '' untuk forecast satu lokasi (/predict)
+# prediction_result.json tetap ditulis sebagai snapshot forecast terbaru, dan
+# mtime-nya dipakai sebagai sinyal murah bahwa worker lain menyimpan forecast baru.
+# materialized_forecasts : forecast terjadwal (mis. "standard"), satu versi per
+# perhitungan ulang; terpisah dari riwayat PATCH /predict/result.
+FORECAST_DB_PATH = Path(
+    os.getenv("FORECAST_DB_PATH", PREDICTIONS_BASE / "forecast_history.sqlite3")
+)
+PREDICTION_RESULTS_PATH = MODELS_BASE / "prediction_result.json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecasts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    issued_at TEXT NOT NULL,
+    issue_date TEXT NOT NULL,
+    model_name TEXT,
+    request_hash TEXT NOT NULL,
+    n_items INTEGER,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_forecasts_issue_date ON forecasts(issue_date, id);
+CREATE INDEX IF NOT EXISTS idx_forecasts_request_hash ON forecasts(request_hash);
+CREATE TABLE IF NOT EXISTS forecast_values (
+    forecast_id INTEGER NOT NULL REFERENCES forecasts(id),
+    target_date TEXT NOT NULL,
+    station TEXT NOT NULL DEFAULT '',
+    pollutant TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (forecast_id, target_date, station, pollutant)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_forecast_values_target
+    ON forecast_values(pollutant, station, target_date);
+CREATE TABLE IF NOT EXISTS materialized_forecasts (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    materialized_at TEXT NOT NULL,
+    model_name TEXT,
+    input_hash TEXT NOT NULL,
+    reason TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_materialized_name ON materialized_forecasts(name, version);
+"""
+
+_LOCK = threading.RLock()
+# FORECAST TERBARU DI MEMORI: {"record": {...}, "snapshot_mtime_ns": int}
+_LATEST: Dict[str, Any] = {"record": None, "snapshot_mtime_ns": None, "loaded": False}
+# VERSI TERBARU PER NAMA FORECAST TERJADWAL: {nama: record}
+_MATERIALIZED: Dict[str, Dict[str, Any]] = {}
+_MIGRATED = [False]
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    # DB LAMA: forecast_values TANPA KOLOM station (PK TANPA STASIUN) -> DIBANGUN ULANG
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cols = [row[1] for row in conn.execute("PRAGMA table_info(forecast_values)")]
+        rebuild = bool(cols) and "station" not in cols
+        if rebuild:
+            conn.execute("ALTER TABLE forecast_values RENAME TO forecast_values_v1")
+            conn.execute("DROP INDEX IF EXISTS idx_forecast_values_target")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    if rebuild:
+        conn.executescript(_SCHEMA)
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO forecast_values
+                    (forecast_id, target_date, station, pollutant, value)
+                SELECT forecast_id, target_date, '', pollutant, value
+                FROM forecast_values_v1
+                """
+            )
+            conn.execute("DROP TABLE forecast_values_v1")
+
+
+def _connect() -> sqlite3.Connection:
+    FORECAST_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(FORECAST_DB_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    if not _MIGRATED[0]:
+        _migrate(conn)
+        _MIGRATED[0] = True
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def request_hash(obj: Any) -> str:
+    """sha256 dari JSON kanonik (key diurutkan, tanpa spasi)."""
+    canonical = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _long_values(stored: Dict[str, Any]) -> List[tuple]:
+    rows = []
+    for item in stored.get("predictions") or []:
+        if not isinstance(item, dict) or not item.get("Tanggal"):
+            continue
+        target_date = str(item["Tanggal"])[:10]
+        # HASIL /predict/stations: SATU BARIS PER (TANGGAL, STASIUN)
+        station = str(item.get(STATION_COL) or "")
+        for key, value in item.items():
+            # KOLOM ISPU BISA DIHITUNG ULANG, JADI TIDAK DISIMPAN SEBAGAI POLUTAN
+            skip = key in ("Tanggal", STATION_COL) or key in ISPU_COLUMNS
+            if skip or isinstance(value, bool):
+                continue
+            if isinstance(value, (int, float)) or value is None:
+                rows.append((target_date, station, key, value))
+    return rows
+
+
+def _snapshot_mtime_ns() -> Optional[int]:
+    try:
+        return PREDICTION_RESULTS_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _record(row: tuple) -> Dict[str, Any]:
+    return {
+        "id": row[0],
+        "issued_at": row[1],
+        "issue_date": row[2],
+        "model_name": row[3],
+        "request_hash": row[4],
+        "n_items": row[5],
+        "payload": json.loads(row[6]),
+    }
+
+
+_RECORD_COLUMNS = "id, issued_at, issue_date, model_name, request_hash, n_items, payload"
+
+
+def append_forecast(
+    stored: Dict[str, Any],
+    model_name: Optional[str] = None,
+    req_hash: Optional[str] = None,
+    issued_at: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Tambahkan satu forecast (satu transaksi) dan jadikan forecast terbaru di memori."""
+    issued_at = issued_at or time.strftime("%Y-%m-%d %H:%M:%S")
+    req_hash = req_hash or request_hash(stored)
+    preds = stored.get("predictions")
+    n_items = len(preds) if isinstance(preds, list) else None
+    payload = json.dumps(stored, ensure_ascii=False, separators=(",", ":"))
+
+    with _LOCK:
+        conn = _connect()
+        try:
+            with conn:
+                cur = conn.execute(
+                    """
+                    INSERT INTO forecasts (issued_at, issue_date, model_name, request_hash, n_items, payload)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (issued_at, issued_at[:10], model_name, req_hash, n_items, payload),
+                )
+                forecast_id = cur.lastrowid
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO forecast_values
+                        (forecast_id, target_date, station, pollutant, value)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [(forecast_id, *v) for v in _long_values(stored)],
+                )
+        finally:
+            conn.close()
+        record = {
+            "id": forecast_id,
+            "issued_at": issued_at,
+            "issue_date": issued_at[:10],
+            "model_name": model_name,
+            "request_hash": req_hash,
+            "n_items": n_items,
+            "payload": stored,
+        }
+        _LATEST.update(record=record, loaded=True)
+    return record
+
+
+def mark_snapshot_written() -> None:
+    """Panggil setelah snapshot JSON ditulis oleh worker ini (bukan perubahan dari luar)."""
+    with _LOCK:
+        _LATEST["snapshot_mtime_ns"] = _snapshot_mtime_ns()
+
+
+def _load_latest() -> Optional[Dict[str, Any]]:
+    conn = _connect()
+    try:
+        row = conn.execute(
+            f"SELECT {_RECORD_COLUMNS} FROM forecasts ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is not None:
+        return _record(row)
+
+    # MIGRASI: RIWAYAT MASIH KOSONG, IMPOR SNAPSHOT LAMA SEBAGAI FORECAST PERTAMA
+    legacy = _read_json(PREDICTION_RESULTS_PATH)
+    if isinstance(legacy, dict):
+        issued_at = time.strftime(
+            "%Y-%m-%d %H:%M:%S",
+            time.localtime(PREDICTION_RESULTS_PATH.stat().st_mtime),
+        )
+        return append_forecast(legacy, issued_at=issued_at)
+    return None
+
+
+def latest_forecast() -> Optional[Dict[str, Any]]:
+    """
+    Forecast terbaru dari memori. Hanya satu stat() per panggilan untuk
+    mendeteksi penyimpanan dari worker lain; tabel dibaca ulang hanya jika berubah.
+    """
+    mtime = _snapshot_mtime_ns()
+    with _LOCK:
+        if _LATEST["loaded"] and mtime == _LATEST["snapshot_mtime_ns"]:
+            return _LATEST["record"]
+        _LATEST.update(record=_load_latest(), loaded=True, snapshot_mtime_ns=mtime)
+        return _LATEST["record"]
+
+
+def get_forecast(forecast_id: int) -> Optional[Dict[str, Any]]:
+    conn = _connect()
+    try:
+        row = conn.execute(
+            f"SELECT {_RECORD_COLUMNS} FROM forecasts WHERE id = ?", (forecast_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+    return _record(row) if row is not None else None
+
+
+def query_forecasts(
+    issue_from: Optional[str] = None,
+    issue_to: Optional[str] = None,
+    target_from: Optional[str] = None,
+    target_to: Optional[str] = None,
+    pollutants: Optional[List[str]] = None,
+    model_name: Optional[str] = None,
+    limit: int = 30,
+    stations: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Forecast terbaru lebih dulu. Tanggal "YYYY-MM-DD" (inklusif). Nilai per
+    forecast dikembalikan dalam bentuk baris {"Tanggal", <polutan>...} seperti /predict,
+    ditambah "Stasiun" untuk forecast multi-stasiun.
+    """
+    if limit < 1:
+        raise ValueError("limit must be >= 1.")
+
+    f_where, f_args = [], []
+    if issue_from:
+        f_where.append("issue_date >= ?")
+        f_args.append(issue_from)
+    if issue_to:
+        f_where.append("issue_date <= ?")
+        f_args.append(issue_to)
+    if model_name:
+        f_where.append("model_name = ?")
+        f_args.append(model_name)
+
+    v_where, v_args = [], []
+    if target_from:
+        v_where.append("v.target_date >= ?")
+        v_args.append(target_from)
+    if target_to:
+        v_where.append("v.target_date <= ?")
+        v_args.append(target_to)
+    if pollutants:
+        v_where.append(f"v.pollutant IN ({','.join('?' * len(pollutants))})")
+        v_args.extend(pollutants)
+    if stations:
+        v_where.append(f"v.station IN ({','.join('?' * len(stations))})")
+        v_args.extend(stations)
+
+    # FORECAST TANPA NILAI YANG COCOK DENGAN FILTER TARGET/POLUTAN TIDAK IKUT DIHITUNG LIMIT
+    if v_where:
+        f_where.append(
+            "EXISTS (SELECT 1 FROM forecast_values v WHERE v.forecast_id = forecasts.id AND "
+            + " AND ".join(v_where)
+            + ")"
+        )
+        f_args.extend(v_args)
+
+    where_sql = f"WHERE {' AND '.join(f_where)}" if f_where else ""
+    conn = _connect()
+    try:
+        heads = conn.execute(
+            f"""
+            SELECT id, issued_at, issue_date, model_name, request_hash, n_items
+            FROM forecasts {where_sql}
+            ORDER BY id DESC LIMIT ?
+            """,
+            f_args + [limit],
+        ).fetchall()
+        if not heads:
+            return []
+        ids = [h[0] for h in heads]
+        value_filter = f"AND {' AND '.join(v_where)}" if v_where else ""
+        values = conn.execute(
+            f"""
+            SELECT v.forecast_id, v.target_date, v.station, v.pollutant, v.value
+            FROM forecast_values v
+            WHERE v.forecast_id IN ({','.join('?' * len(ids))}) {value_filter}
+            ORDER BY v.forecast_id, v.target_date, v.station
+            """,
+            ids + v_args,
+        ).fetchall()
+    finally:
+        conn.close()
+
+    by_forecast: Dict[int, Dict[tuple, Dict[str, Any]]] = {i: {} for i in ids}
+    for forecast_id, target_date, station, pollutant, value in values:
+        row = by_forecast[forecast_id].get((target_date, station))
+        if row is None:
+            row = {"Tanggal": target_date, **({STATION_COL: station} if station else {})}
+            by_forecast[forecast_id][(target_date, station)] = row
+        row[pollutant] = value
+
+    return [
+        {
+            "id": h[0],
+            "issued_at": h[1],
+            "issue_date": h[2],
+            "model_name": h[3],
+            "request_hash": h[4],
+            "n_items": h[5],
+            "predictions": list(by_forecast[h[0]].values()),
+        }
+        for h in heads
+    ]
+
+
+# =========================
+# FORECAST TERJADWAL (MATERIALIZED)
+# =========================
+_MATERIALIZED_COLUMNS = (
+    "version, name, materialized_at, model_name, input_hash, reason, payload"
+)
+
+
+def _materialized_record(row: tuple) -> Dict[str, Any]:
+    return {
+        "version": row[0],
+        "name": row[1],
+        "materialized_at": row[2],
+        "model_name": row[3],
+        "input_hash": row[4],
+        "reason": row[5],
+        "payload": json.loads(row[6]),
+    }
+
+
+def materialize_forecast(
+    name: str,
+    stored: Dict[str, Any],
+    input_hash: str,
+    model_name: Optional[str] = None,
+    reason: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Simpan versi baru forecast terjadwal dan jadikan versi terbaru di memori."""
+    materialized_at = time.strftime("%Y-%m-%d %H:%M:%S")
+    payload = json.dumps(stored, ensure_ascii=False, separators=(",", ":"))
+    with _LOCK:
+        conn = _connect()
+        try:
+            with conn:
+                cur = conn.execute(
+                    """
+                    INSERT INTO materialized_forecasts
+                        (name, materialized_at, model_name, input_hash, reason, payload)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (name, materialized_at, model_name, input_hash, reason, payload),
+                )
+                version = cur.lastrowid
+        finally:
+            conn.close()
+        record = {
+            "version": version,
+            "name": name,
+            "materialized_at": materialized_at,
+            "model_name": model_name,
+            "input_hash": input_hash,
+            "reason": reason,
+            "payload": stored,
+        }
+        _MATERIALIZED[name] = record
+    return record
+
+
+def latest_materialized(name: str, reload: bool = False) -> Optional[Dict[str, Any]]:
+    """Versi terbaru dari memori; tabel hanya dibaca saat pertama kali (atau reload=True)."""
+    with _LOCK:
+        if name in _MATERIALIZED and not reload:
+            return _MATERIALIZED[name]
+        conn = _connect()
+        try:
+            row = conn.execute(
+                f"""
+                SELECT {_MATERIALIZED_COLUMNS} FROM materialized_forecasts
+                WHERE name = ? ORDER BY version DESC LIMIT 1
+                """,
+                (name,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            _MATERIALIZED.pop(name, None)
+            return None
+        _MATERIALIZED[name] = _materialized_record(row)
+        return _MATERIALIZED[name]
+
+
+def get_materialized(name: str, version: int) -> Optional[Dict[str, Any]]:
+    conn = _connect()
+    try:
+        row = conn.execute(
+            f"""
+            SELECT {_MATERIALIZED_COLUMNS} FROM materialized_forecasts
+            WHERE name = ? AND version = ?
+            """,
+            (name, version),
+        ).fetchone()
+    finally:
+        conn.close()
+    return _materialized_record(row) if row is not None else None
+
+
+def list_materialized(name: str, limit: int = 30) -> List[Dict[str, Any]]:
+    """Ringkasan versi (tanpa payload), terbaru lebih dulu."""
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            """
+            SELECT version, materialized_at, model_name, input_hash, reason
+            FROM materialized_forecasts WHERE name = ?
+            ORDER BY version DESC LIMIT ?
+            """,
+            (name, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        {
+            "version": r[0],
+            "materialized_at": r[1],
+            "model_name": r[2],
+            "input_hash": r[3],
+            "reason": r[4],
+        }
+        for r in rows
+    ]
@@ -0,0 +1,106 @@
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# ISPU (INDEKS STANDAR PENCEMAR UDARA), KONSENTRASI 24 JAM DALAM µg/m³
+# Permen LHK P.14/2020, interpolasi linear per segmen. Hasilnya harus sama dengan
+# front-end/src/utils/aqi_calculator.js (nama kolom juga sama: AQI, Dominant,
+# Category, <polutan>_AQI), supaya front-end bisa langsung memakai hasil server.
+ISPU_INDEXES = np.array([0, 50, 100, 200, 300, 500], dtype=np.float64)
+ISPU_BREAKPOINTS: Dict[str, List[float]] = {
+    "PM10": [0, 50, 150, 350, 420, 500],
+    "SO2": [0, 52, 180, 400, 800, 1200],
+    "CO": [0, 4000, 8000, 15000, 30000, 45000],
+    "O3": [0, 120, 235, 400, 800, 1000],
+    "NO2": [0, 80, 200, 1130, 2260, 3000],
+}
+# URUTAN SAMA DENGAN aqi_calculator.js: JIKA SUB-INDEKS SAMA, POLUTAN PERTAMA YANG DOMINAN
+ISPU_POLLUTANTS = ("PM10", "O3", "CO", "SO2", "NO2")
+ISPU_CATEGORIES = ("Baik", "Sedang", "Tidak Sehat", "Sangat Tidak Sehat", "Berbahaya")
+_SUMMARY_COLUMNS = ("AQI", "Dominant", "Category")
+ISPU_COLUMNS = (*_SUMMARY_COLUMNS, *(f"{p}_AQI" for p in ISPU_POLLUTANTS))
+
+_BP = np.array([ISPU_BREAKPOINTS[p] for p in ISPU_POLLUTANTS], dtype=np.float64)
+_N_POLLUTANTS, _N_BREAKS = _BP.shape
+# SEMUA TABEL BREAKPOINT DIGESER KE RENTANG YANG TIDAK TUMPANG TINDIH, JADI SATU
+# np.searchsorted CUKUP UNTUK SEMUA BARIS x SEMUA POLUTAN
+_STRIDE = _BP[:, -1].max() + 1.0
+_OFFSETS = np.arange(_N_POLLUTANTS) * _STRIDE
+_FLAT_BP = (_BP + _OFFSETS[:, None]).ravel()
+_CATEGORY_UPPER = np.array([50, 100, 200, 300], dtype=np.float64)
+
+
+def sub_indexes(values: np.ndarray) -> np.ndarray:
+    """
+    values (n, 5) berurutan ISPU_POLLUTANTS -> sub-indeks (n, 5). Nilai negatif
+    dianggap 0, di atas breakpoint terakhir diekstrapolasi dari segmen terakhir,
+    NaN tetap NaN. Dibulatkan setengah ke atas seperti Math.round.
+    """
+    x = np.maximum(np.asarray(values, dtype=np.float64), 0.0)
+    key = np.minimum(x, _BP[:, -1]) + _OFFSETS
+    pos = np.searchsorted(_FLAT_BP, key.ravel(), side="left").reshape(x.shape)
+    # SEGMEN j: Clow < x <= Chigh (x = 0 MASUK SEGMEN PERTAMA)
+    seg = np.clip(pos - np.arange(_N_POLLUTANTS) * _N_BREAKS - 1, 0, _N_BREAKS - 2)
+
+    cols = np.arange(_N_POLLUTANTS)
+    c_low, c_high = _BP[cols, seg], _BP[cols, seg + 1]
+    i_low, i_high = ISPU_INDEXES[seg], ISPU_INDEXES[seg + 1]
+    index = (i_high - i_low) / (c_high - c_low) * (x - c_low) + i_low
+    return np.floor(index + 0.5)
+
+
+def compute_ispu(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Kolom ISPU untuk setiap baris df (index sama). Polutan yang kolomnya tidak ada
+    atau nilainya kosong dilewati; baris tanpa polutan sama sekali -> AQI kosong.
+    """
+    n = len(df)
+    values = np.full((n, _N_POLLUTANTS), np.nan)
+    present = []
+    for j, name in enumerate(ISPU_POLLUTANTS):
+        if name in df.columns:
+            values[:, j] = pd.to_numeric(df[name], errors="coerce").to_numpy(np.float64)
+            present.append(j)
+    sub = sub_indexes(values)
+
+    has_any = ~np.isnan(sub).all(axis=1)
+    dominant_idx = np.where(np.isnan(sub), -np.inf, sub).argmax(axis=1)
+    aqi = np.where(has_any, sub[np.arange(n), dominant_idx], np.nan)
+    category_idx = np.searchsorted(_CATEGORY_UPPER, np.nan_to_num(aqi), side="left")
+
+    out = pd.DataFrame(
+        {
+            "AQI": aqi,
+            "Dominant": np.where(
+                has_any, np.array(ISPU_POLLUTANTS, dtype=object)[dominant_idx], None
+            ),
+            "Category": np.where(
+                has_any, np.array(ISPU_CATEGORIES, dtype=object)[category_idx], None
+            ),
+        },
+        index=df.index,
+    )
+    for j in present:
+        out[f"{ISPU_POLLUTANTS[j]}_AQI"] = sub[:, j]
+    return out
+
+
+def with_ispu(df: pd.DataFrame) -> pd.DataFrame:
+    """df + kolom ISPU (kolom ISPU lama, jika ada, diganti)."""
+    base = df.drop(columns=[c for c in ISPU_COLUMNS if c in df.columns])
+    return pd.concat([base, compute_ispu(base)], axis=1)
+
+
+def records_with_ispu(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Versi list-of-dict (format JSON /predict) untuk forecast tersimpan."""
+    if not rows or not all(isinstance(row, dict) for row in rows):
+        return rows
+    ispu = compute_ispu(pd.DataFrame(rows))
+    ispu = ispu.astype(object).where(ispu.notna(), None)
+    out = []
+    for row, extra in zip(rows, ispu.to_dict(orient="records")):
+        # SEPERTI aqi_calculator.js: SUB-INDEKS POLUTAN YANG KOSONG TIDAK DITULIS
+        extra = {k: v for k, v in extra.items() if v is not None or k in _SUMMARY_COLUMNS}
+        out.append({**{k: v for k, v in row.items() if k not in ISPU_COLUMNS}, **extra})
+    return out
@@ -0,0 +1,305 @@
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.metrics import cache_event
+from utils.model_utils import (
+    MODELS_BASE,
+    PREDICTIONS_BASE,
+    _collect_model_entry,
+    _read_json,
+    _required_files_present,
+)
+from predictions_model.telemetry import TRAINING_REPORT_FILENAME
+
+# ? KATALOG DISIMPAN DI LUAR MODELS_BASE SUPAYA TULISAN SQLITE TIDAK MENGUBAH MTIME FOLDER MODEL
+CATALOG_PATH = Path(
+    os.getenv("MODEL_CATALOG_PATH", PREDICTIONS_BASE / "model_catalog.sqlite3")
+)
+
+SORTABLE_COLUMNS = {"name", "created_at"}
+_METRIC_SORT = re.compile(r"^[A-Za-z0-9 ()_.-]+\.(MAE|MAPE|MSE|RMSE|R2)$")
+_PARAM_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    name TEXT PRIMARY KEY,
+    created_at TEXT,
+    dir_mtime_ns INTEGER NOT NULL,
+    metadata TEXT NOT NULL,
+    evaluation TEXT NOT NULL,
+    hyperparameters TEXT NOT NULL,
+    training_report TEXT,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_models_created_at ON models(created_at);
+"""
+# ? NAIKKAN SETIAP SKEMA BERUBAH; KATALOG LAMA DIBUANG LALU DIISI ULANG DARI DISK
+_SCHEMA_VERSION = 2
+
+_LOCK = threading.RLock()
+_STATE: Dict[str, Any] = {"base_mtime_ns": None}
+_QUERY_CACHE: Dict[tuple, Dict] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    CATALOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CATALOG_PATH, timeout=30)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+        conn.executescript(
+            f"DROP TABLE IF EXISTS models; PRAGMA user_version = {_SCHEMA_VERSION};"
+        )
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _base_mtime_ns() -> Optional[int]:
+    try:
+        return MODELS_BASE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _row_for(model_dir: Path) -> tuple:
+    meta = _read_json(model_dir / "metadata.json") or {}
+    eval_ = _read_json(model_dir / "evaluation.json") or {}
+    report = _read_json(model_dir / TRAINING_REPORT_FILENAME)
+    entry = _collect_model_entry(model_dir)
+    return (
+        model_dir.name,
+        entry["created_at"],
+        model_dir.stat().st_mtime_ns,
+        json.dumps(meta, ensure_ascii=False),
+        json.dumps(eval_, ensure_ascii=False),
+        json.dumps(meta.get("hyperparameters") or {}, ensure_ascii=False),
+        json.dumps(report, ensure_ascii=False) if report is not None else None,
+        json.dumps(entry, ensure_ascii=False),
+    )
+
+
+def _upsert(conn: sqlite3.Connection, rows: List[tuple]) -> None:
+    conn.executemany(
+        """
+        INSERT INTO models (name, created_at, dir_mtime_ns, metadata, evaluation, hyperparameters, training_report, entry)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            created_at = excluded.created_at,
+            dir_mtime_ns = excluded.dir_mtime_ns,
+            metadata = excluded.metadata,
+            evaluation = excluded.evaluation,
+            hyperparameters = excluded.hyperparameters,
+            training_report = excluded.training_report,
+            entry = excluded.entry
+        """,
+        rows,
+    )
+
+
+def register_model(model_dir: str | Path) -> None:
+    """Tambah/perbarui satu model di katalog (satu transaksi)."""
+    model_dir = Path(model_dir)
+    if not model_dir.is_absolute():
+        model_dir = MODELS_BASE / model_dir
+    with _LOCK:
+        conn = _connect()
+        try:
+            with conn:
+                if model_dir.is_dir() and _required_files_present(model_dir):
+                    _upsert(conn, [_row_for(model_dir)])
+                else:
+                    conn.execute("DELETE FROM models WHERE name = ?", (model_dir.name,))
+        finally:
+            conn.close()
+        _QUERY_CACHE.clear()
+
+
+def sync_catalog(force: bool = False) -> bool:
+    """
+    Samakan katalog dengan isi MODELS_BASE. Hanya berjalan jika mtime folder
+    berubah (model baru/dihapus), lalu hanya folder yang mtime-nya berubah
+    yang dibaca ulang. Return True jika katalog berubah.
+    """
+    with _LOCK:
+        base_mtime = _base_mtime_ns()
+        if not force and base_mtime == _STATE["base_mtime_ns"]:
+            return False
+
+        conn = _connect()
+        try:
+            known = dict(conn.execute("SELECT name, dir_mtime_ns FROM models"))
+            on_disk = {}
+            if MODELS_BASE.exists():
+                for p in MODELS_BASE.iterdir():
+                    if (
+                        p.is_dir()
+                        and not p.name.startswith(".")
+                        and _required_files_present(p)
+                    ):
+                        on_disk[p.name] = p
+
+            stale = [
+                p
+                for name, p in on_disk.items()
+                if force or known.get(name) != p.stat().st_mtime_ns
+            ]
+            removed = [name for name in known if name not in on_disk]
+            with conn:
+                if force:
+                    conn.execute("DELETE FROM models")
+                else:
+                    conn.executemany(
+                        "DELETE FROM models WHERE name = ?", [(n,) for n in removed]
+                    )
+                _upsert(conn, [_row_for(p) for p in stale])
+        finally:
+            conn.close()
+
+        _STATE["base_mtime_ns"] = base_mtime
+        changed = bool(stale or removed or force)
+        if changed:
+            _QUERY_CACHE.clear()
+        return changed
+
+
+def rebuild_catalog() -> int:
+    sync_catalog(force=True)
+    conn = _connect()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM models").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _parse_value(raw: str) -> Any:
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return raw
+
+
+def query_models(
+    page: int = 1,
+    page_size: Optional[int] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    params: Optional[Dict[str, str]] = None,
+) -> Dict:
+    """
+    sort_by: "name", "created_at", atau "<Polutan|Overall>.<MAE|MAPE|MSE|RMSE|R2>".
+    created_from/created_to: "YYYY-MM-DD" (inklusif).
+    params: filter hyperparameter, mis. {"lstm_units": "128"}.
+    """
+    params = params or {}
+    if order.lower() not in ("asc", "desc"):
+        raise ValueError("order must be 'asc' or 'desc'.")
+    if sort_by not in SORTABLE_COLUMNS and not _METRIC_SORT.match(sort_by):
+        raise ValueError(
+            f"sort_by must be one of {sorted(SORTABLE_COLUMNS)} or '<Pollutant|Overall>.<MAE|MAPE|MSE|RMSE|R2>'."
+        )
+    for key in params:
+        if not _PARAM_NAME.match(key):
+            raise ValueError(f"Invalid hyperparameter name '{key}'.")
+    if page < 1 or (page_size is not None and page_size < 1):
+        raise ValueError("page and page_size must be >= 1.")
+
+    sync_catalog()
+    cache_key = (
+        page,
+        page_size,
+        sort_by,
+        order.lower(),
+        created_from,
+        created_to,
+        tuple(sorted(params.items())),
+    )
+    with _LOCK:
+        cached = _QUERY_CACHE.get(cache_key)
+    cache_event("model_catalog", hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    where, args = [], []
+    if created_from:
+        where.append("created_at >= ?")
+        args.append(f"{created_from} 00:00:00")
+    if created_to:
+        where.append("created_at <= ?")
+        args.append(f"{created_to} 23:59:59")
+    for key, raw in params.items():
+        where.append(f"json_extract(hyperparameters, '$.{key}') = ?")
+        args.append(_parse_value(raw))
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+
+    if sort_by in SORTABLE_COLUMNS:
+        order_expr, order_args = sort_by, []
+    else:
+        group, metric = sort_by.rsplit(".", 1)
+        order_expr, order_args = "json_extract(evaluation, ?)", [
+            f'$."{group}".{metric}'
+        ]
+    # NILAI NULL SELALU DI AKHIR
+    order_sql = f"ORDER BY ({order_expr}) IS NULL, {order_expr} {order.upper()}, name"
+
+    limit_sql, limit_args = "", []
+    if page_size is not None:
+        limit_sql = "LIMIT ? OFFSET ?"
+        limit_args = [page_size, (page - 1) * page_size]
+
+    conn = _connect()
+    try:
+        total = conn.execute(f"SELECT COUNT(*) FROM models {where_sql}", args).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT entry FROM models {where_sql} {order_sql} {limit_sql}",
+            args + order_args + order_args + limit_args,
+        ).fetchall()
+    finally:
+        conn.close()
+
+    result = {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "models": [json.loads(r[0]) for r in rows],
+    }
+    with _LOCK:
+        _QUERY_CACHE[cache_key] = result
+    return result
+
+
+def get_model_record(name: str) -> Optional[Dict]:
+    """Metadata, evaluation, dan training report dari katalog (tanpa membaca file model)."""
+    sync_catalog()
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT metadata, evaluation, training_report, entry FROM models WHERE name = ?",
+            (name,),
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    return {
+        "metadata": json.loads(row[0]),
+        "evaluation": json.loads(row[1]),
+        "training_report": json.loads(row[2]) if row[2] is not None else None,
+        "entry": json.loads(row[3]),
+    }
+
+
+# ? BANGUN ULANG KATALOG DARI DISK:
+#   python -m utils.model_catalog rebuild
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        print("usage: python -m utils.model_catalog rebuild")
+        sys.exit(2)
+    count = rebuild_catalog()
+    print(f"Catalog rebuilt at {CATALOG_PATH}: {count} models ({datetime.now():%Y-%m-%d %H:%M:%S}).")
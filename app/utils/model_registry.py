@@ -0,0 +1,382 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from minio import Minio
+from minio.error import S3Error
+
+from utils.predict_utils import INFERENCE_FILENAME
+from utils.tracing import traced
+from utils.model_utils import (
+    MODEL_INFO_PATH,
+    MODELS_BASE,
+    PREDICTIONS_BASE,
+    REGISTRY_ORIGIN_FILENAME,
+    _read_json,
+    _required_files_present,
+    _write_json,
+)
+
+load_dotenv()
+
+# REGISTRY MODEL DI MINIO
+# versions/<nama>/<sha256>/<file>         -> isi folder model (immutable)
+# versions/<nama>/<sha256>/manifest.json  -> daftar file + checksum
+# active.json                             -> pointer model aktif (generation++)
+# inference.json (pilihan backend) ikut di pointer, bukan di versi: ganti backend tidak
+# membuat versi baru, jadi node lain tidak mengunduh ulang bobot yang sama.
+MODEL_REGISTRY_ENABLED = os.getenv("MODEL_REGISTRY_ENABLED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+MODEL_REGISTRY_BUCKET = os.getenv("MODEL_REGISTRY_BUCKET", "models")
+MODEL_CACHE_DIR = Path(os.getenv("MODEL_CACHE_DIR", PREDICTIONS_BASE / "model_cache"))
+MODEL_CACHE_MAX_BYTES = int(os.getenv("MODEL_CACHE_MAX_BYTES", 2 * 1024**3))
+MODEL_REGISTRY_POLL_SECONDS = float(os.getenv("MODEL_REGISTRY_POLL_SECONDS", 2))
+MODEL_DOWNLOAD_PART_SIZE = int(os.getenv("MODEL_DOWNLOAD_PART_SIZE", 8 * 1024**2))
+MODEL_DOWNLOAD_CONCURRENCY = int(os.getenv("MODEL_DOWNLOAD_CONCURRENCY", 4))
+
+ACTIVE_POINTER = "active.json"
+_MANIFEST = "manifest.json"
+_COMPLETE_MARKER = ".complete"
+_CACHE_LOCK = threading.Lock()
+
+
+def _sha256_file(path: Path, chunk: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _model_files(model_dir: Path) -> List[Path]:
+    return sorted(
+        p
+        for p in model_dir.rglob("*")
+        if p.is_file()
+        and not p.name.startswith(".")
+        and not p.name.endswith(".tmp")
+        and p.name != INFERENCE_FILENAME
+    )
+
+
+def build_manifest(model_dir: str | Path) -> Dict:
+    """Manifest berisi checksum per file; versi = sha256 dari seluruh manifest."""
+    model_dir = Path(model_dir)
+    files = {}
+    for p in _model_files(model_dir):
+        rel = p.relative_to(model_dir).as_posix()
+        files[rel] = {"size": p.stat().st_size, "sha256": _sha256_file(p)}
+    digest = hashlib.sha256(
+        json.dumps(files, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return {"name": model_dir.name, "version": digest, "files": files}
+
+
+def _prefix(name: str, version: str) -> str:
+    return f"versions/{name}/{version}"
+
+
+def _ensure_bucket(client: Minio) -> None:
+    if not client.bucket_exists(MODEL_REGISTRY_BUCKET):
+        client.make_bucket(MODEL_REGISTRY_BUCKET)
+
+
+def _object_exists(client: Minio, object_name: str) -> bool:
+    try:
+        client.stat_object(MODEL_REGISTRY_BUCKET, object_name)
+        return True
+    except S3Error as e:
+        if e.code in ("NoSuchKey", "NoSuchObject", "NotFound"):
+            return False
+        raise
+
+
+@traced("minio.put_object", kind="client")
+def _put_json(client: Minio, object_name: str, payload: Dict) -> None:
+    data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    client.put_object(
+        MODEL_REGISTRY_BUCKET,
+        object_name,
+        io.BytesIO(data),
+        length=len(data),
+        content_type="application/json",
+    )
+
+
+@traced("minio.get_object", kind="client")
+def _get_bytes(client: Minio, object_name: str, offset: int = 0, length: int = 0) -> bytes:
+    resp = client.get_object(MODEL_REGISTRY_BUCKET, object_name, offset=offset, length=length)
+    try:
+        return resp.read()
+    finally:
+        resp.close()
+        resp.release_conn()
+
+
+@traced("registry.publish_model")
+def publish_model(client: Minio, model_dir: str | Path) -> Dict:
+    """Upload folder model sebagai versi immutable; versi yang sudah ada dilewati."""
+    model_dir = Path(model_dir)
+    if not model_dir.is_absolute():
+        model_dir = MODELS_BASE / model_dir
+    if not _required_files_present(model_dir):
+        raise FileNotFoundError(f"Model {model_dir.name} is incomplete; not publishing.")
+
+    _ensure_bucket(client)
+    manifest = build_manifest(model_dir)
+    prefix = _prefix(manifest["name"], manifest["version"])
+    if _object_exists(client, f"{prefix}/{_MANIFEST}"):
+        _mark_published(model_dir, manifest["version"])
+        return manifest
+
+    def upload(rel: str) -> None:
+        client.fput_object(MODEL_REGISTRY_BUCKET, f"{prefix}/{rel}", str(model_dir / rel))
+
+    with ThreadPoolExecutor(max_workers=MODEL_DOWNLOAD_CONCURRENCY) as pool:
+        list(pool.map(upload, manifest["files"]))
+
+    # MANIFEST DITULIS TERAKHIR: VERSI DIANGGAP ADA HANYA JIKA SEMUA FILE SUDAH TERUPLOAD
+    manifest["published_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    _put_json(client, f"{prefix}/{_MANIFEST}", manifest)
+    _mark_published(model_dir, manifest["version"])
+    return manifest
+
+
+def _mark_published(model_dir: Path, version: str) -> None:
+    # FOLDER LOKAL YANG SUDAH ADA DI REGISTRY BUKAN LAGI HASIL TRAINING YANG BELUM DIPUBLISH
+    if not model_dir.is_symlink():
+        _write_json(model_dir / REGISTRY_ORIGIN_FILENAME, {"version": version})
+
+
+def read_active_pointer(client: Minio) -> Tuple[Optional[Dict], Optional[str]]:
+    """Return (pointer, etag) atau (None, None) kalau belum ada."""
+    try:
+        stat = client.stat_object(MODEL_REGISTRY_BUCKET, ACTIVE_POINTER)
+    except S3Error as e:
+        if e.code in ("NoSuchKey", "NoSuchObject", "NotFound", "NoSuchBucket"):
+            return None, None
+        raise
+    return json.loads(_get_bytes(client, ACTIVE_POINTER)), stat.etag
+
+
+def set_active_pointer(
+    client: Minio, name: str, version: str, inference: Optional[Dict] = None
+) -> Dict:
+    _ensure_bucket(client)
+    current, _ = read_active_pointer(client)
+    pointer = {
+        "active": name,
+        "version": version,
+        "generation": int((current or {}).get("generation", 0)) + 1,
+        "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    if inference is not None:
+        pointer["inference"] = inference
+    _put_json(client, ACTIVE_POINTER, pointer)
+    return pointer
+
+
+def _download_file(client: Minio, object_name: str, dest: Path, size: int, pool) -> None:
+    # PREALOKASI LALU TULIS PER RANGE SECARA PARALEL (pwrite TIDAK BERBAGI POSISI FILE)
+    with open(dest, "wb") as f:
+        f.truncate(size)
+    if size == 0:
+        return
+    ranges = [
+        (off, min(MODEL_DOWNLOAD_PART_SIZE, size - off))
+        for off in range(0, size, MODEL_DOWNLOAD_PART_SIZE)
+    ]
+    fd = os.open(dest, os.O_WRONLY)
+    try:
+
+        def fetch(r):
+            off, length = r
+            data = _get_bytes(client, object_name, offset=off, length=length)
+            if len(data) != length:
+                raise IOError(f"Short read for {object_name} at {off}: {len(data)}/{length}")
+            os.pwrite(fd, data, off)
+
+        list(pool.map(fetch, ranges))
+    finally:
+        os.close(fd)
+
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def _evict(keep: Optional[Path] = None) -> None:
+    """Hapus versi yang paling lama tidak dipakai sampai cache <= batas ukuran."""
+    entries = [
+        p for p in MODEL_CACHE_DIR.iterdir() if p.is_dir() and (p / _COMPLETE_MARKER).exists()
+    ]
+    sizes = {p: _dir_size(p) for p in entries}
+    total = sum(sizes.values())
+    for p in sorted(entries, key=lambda p: (p / _COMPLETE_MARKER).stat().st_mtime):
+        if total <= MODEL_CACHE_MAX_BYTES:
+            break
+        if p == keep or _is_linked(p):
+            continue
+        shutil.rmtree(p, ignore_errors=True)
+        total -= sizes[p]
+
+
+def _is_linked(cache_dir: Path) -> bool:
+    link = MODELS_BASE / cache_dir.name.split("@", 1)[0]
+    return link.is_symlink() and link.resolve() == cache_dir.resolve()
+
+
+@traced("registry.fetch_model")
+def fetch_model(client: Minio, name: str, version: str) -> Path:
+    """Tarik versi model ke cache lokal (lazy, paralel, checksum diverifikasi)."""
+    MODEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    target = MODEL_CACHE_DIR / f"{name}@{version}"
+    with _CACHE_LOCK:
+        if (target / _COMPLETE_MARKER).exists():
+            (target / _COMPLETE_MARKER).touch()
+            return target
+
+        prefix = _prefix(name, version)
+        manifest = json.loads(_get_bytes(client, f"{prefix}/{_MANIFEST}"))
+        tmp = MODEL_CACHE_DIR / f".{name}@{version}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        try:
+            with ThreadPoolExecutor(max_workers=MODEL_DOWNLOAD_CONCURRENCY) as pool:
+                for rel, info in manifest["files"].items():
+                    dest = tmp / rel
+                    dest.parent.mkdir(parents=True, exist_ok=True)
+                    _download_file(client, f"{prefix}/{rel}", dest, info["size"], pool)
+                    if _sha256_file(dest) != info["sha256"]:
+                        raise IOError(f"Checksum mismatch for {name}@{version}/{rel}")
+            (tmp / _COMPLETE_MARKER).touch()
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(tmp, target)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        _evict(keep=target)
+        return target
+
+
+def link_model(cache_dir: Path, name: str) -> Path:
+    """
+    Pasang versi dari cache sebagai MODELS_BASE/<nama> (symlink, diganti atomik).
+    Folder asli (hasil training di node ini) tidak ditimpa.
+    """
+    link = MODELS_BASE / name
+    if link.exists() and not link.is_symlink():
+        if build_manifest(link)["version"] == cache_dir.name.split("@", 1)[1]:
+            return link
+        raise FileExistsError(
+            f"{link} is a local model directory with different content; not replacing it."
+        )
+    tmp_link = MODELS_BASE / f".{name}.{os.getpid()}.link"
+    tmp_link.unlink(missing_ok=True)
+    tmp_link.symlink_to(cache_dir.resolve(), target_is_directory=True)
+    os.replace(tmp_link, link)
+    return link
+
+
+def _replace_local_dir(cache_dir: Path, name: str) -> Path:
+    local = MODELS_BASE / name
+    old = MODELS_BASE / f".{name}.{os.getpid()}.old"
+    shutil.rmtree(old, ignore_errors=True)
+    os.replace(local, old)
+    try:
+        return link_model(cache_dir, name)
+    finally:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def apply_active_pointer(client: Minio, pointer: Dict) -> Dict:
+    """Terapkan pointer; return isi model_information.json yang ditulis."""
+    name, version = pointer["active"], pointer["version"]
+    info = {"active": name, "version": version, "generation": pointer.get("generation")}
+    local = MODELS_BASE / name
+    if local.exists() and not local.is_symlink():
+        # FOLDER ASLI (DIKIRIM BERSAMA APP, TRAINING, ATAU SALINAN DARI CACHE)
+        origin = _read_json(local / REGISTRY_ORIGIN_FILENAME) or {}
+        local_version = build_manifest(local)["version"]
+        if local_version == version:
+            _mark_published(local, version)
+        elif origin.get("local_training"):
+            # HASIL TRAINING DI NODE INI BELUM DIPUBLISH: TIDAK DIHAPUS, TAPI DITANDAI.
+            # PATCH /model/active DI NODE INI MEMPUBLISH-NYA KE SEMUA NODE.
+            print(
+                f"WARNING: model {name} has unpublished local training "
+                f"({local_version[:12]}); registry version {version[:12]} not applied"
+            )
+            info.update(version=local_version, registry_version=version, diverged=True)
+        elif origin.get("version") != version:
+            # SALINAN VERSI LAMA (ATAU FOLDER TANPA ASAL) DIGANTI VERSI YANG DITUNJUK POINTER
+            _replace_local_dir(fetch_model(client, name, version), name)
+    else:
+        link_model(fetch_model(client, name, version), name)
+    if pointer.get("inference") is not None:
+        _write_json(local / INFERENCE_FILENAME, pointer["inference"])
+    _write_json(MODEL_INFO_PATH, info)
+    return info
+
+
+class ActivePointerWatcher:
+    """Thread yang mem-poll active.json (berdasarkan ETag) dan menerapkan perubahan."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Minio],
+        interval: float = MODEL_REGISTRY_POLL_SECONDS,
+        on_change: Optional[Callable[[Dict], None]] = None,
+    ):
+        self.client_factory = client_factory
+        self.interval = interval
+        self.on_change = on_change
+        self.etag: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="model-registry-watcher", daemon=True
+        )
+
+    def start(self) -> "ActivePointerWatcher":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.interval * 2)
+
+    def poll_once(self) -> Optional[Dict]:
+        client = self.client_factory()
+        pointer, etag = read_active_pointer(client)
+        if pointer is None or etag == self.etag:
+            return None
+        apply_active_pointer(client, pointer)
+        self.etag = etag
+        if self.on_change:
+            self.on_change(pointer)
+        return pointer
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                pointer = self.poll_once()
+                if pointer:
+                    print(
+                        f"Active model -> {pointer['active']}@{pointer['version'][:12]} "
+                        f"(generation {pointer.get('generation')})"
+                    )
+            except Exception as e:
+                print(f"Model registry poll failed: {e}")
+            self._stop.wait(self.interval)
@@ -1,13 +1,29 @@
 import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 from fastapi import HTTPException, status
 
+from predictions_model.bundle import (
+    BUNDLE_FILENAME,
+    BundleError,
+    verify_inference_bundle,
+)
+from predictions_model.stations import STATION_SCALERS_FILENAME
+from predictions_model.telemetry import TRAINING_REPORT_FILENAME
+from utils.predict_utils import _inference_selection
+from utils.response_cache import invalidate_path
+
 PREDICTIONS_BASE = Path(__file__).resolve().parents[1] / "predictions_model"
 MODELS_BASE = PREDICTIONS_BASE / "models"
 MODEL_INFO_PATH = MODELS_BASE / "model_information.json"
+# ASAL FOLDER MODEL LOKAL: {"version": <versi registry>} ATAU {"local_training": true}
+REGISTRY_ORIGIN_FILENAME = ".registry.json"
 
 
 def _read_json(path: Path) -> Optional[dict]:
@@ -26,6 +42,61 @@ def _write_json(path: Path, payload: dict) -> None:
     with tmp.open("w", encoding="utf-8") as f:
         json.dump(payload, f, ensure_ascii=False, indent=2)
     tmp.replace(path)
+    invalidate_path(path)
+
+
+_DETACH_LOCK = threading.Lock()
+
+
+def _detach_model_dir(model_dir: Path) -> Path:
+    """
+    Folder model yang berupa symlink ke cache registry diganti salinan biasa sebelum
+    ditulis; versi di cache immutable dan harus tetap sama dengan manifest-nya.
+    """
+    model_dir = Path(model_dir)
+    with _DETACH_LOCK:
+        if not model_dir.is_symlink():
+            return model_dir
+        tmp = model_dir.with_name(f".{model_dir.name}.{os.getpid()}.detach")
+        shutil.rmtree(tmp, ignore_errors=True)
+        source = model_dir.resolve()
+        # FILE TERSEMBUNYI (MARKER .complete CACHE) TIDAK IKUT DISALIN
+        shutil.copytree(source, tmp, ignore=shutil.ignore_patterns(".*"))
+        # SALINAN TETAP TERCATAT BERASAL DARI VERSI INI, JADI VERSI BARU BOLEH MENGGANTINYA
+        _write_json(tmp / REGISTRY_ORIGIN_FILENAME, {"version": source.name.split("@", 1)[1]})
+        model_dir.unlink()
+        os.replace(tmp, model_dir)
+    return model_dir
+
+
+@contextmanager
+def _staged_model_dir(model_dir: Path) -> Iterator[Path]:
+    """
+    Artefak ditulis ke folder staging di samping model_dir, lalu dipasang dengan rename
+    saat blok selesai. Folder model tidak pernah terlihat setengah ditulis (bobot baru
+    dengan metadata lama); jika blok gagal, folder lama tetap utuh.
+    """
+    model_dir = Path(model_dir)
+    staging = model_dir.with_name(f".{model_dir.name}.{os.getpid()}.staging")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    try:
+        yield staging
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    old = model_dir.with_name(f".{model_dir.name}.{os.getpid()}.old")
+    with _DETACH_LOCK:
+        shutil.rmtree(old, ignore_errors=True)
+        # SYMLINK KE CACHE REGISTRY CUKUP DILEPAS; ISI CACHE IMMUTABLE TIDAK DISENTUH
+        if model_dir.is_symlink():
+            model_dir.unlink()
+        elif model_dir.exists():
+            os.replace(model_dir, old)
+        os.replace(staging, model_dir)
+    shutil.rmtree(old, ignore_errors=True)
+    for path in model_dir.iterdir():
+        invalidate_path(path)
 
 
 def _active_model_name() -> Optional[str]:
@@ -44,10 +115,49 @@ def _required_files_present(model_dir: Path) -> bool:
         "bilstm_model.keras": model_dir / "bilstm_model.keras",
         "evaluation.json": model_dir / "evaluation.json",
         "metadata.json": model_dir / "metadata.json",
-        "scaler_X.joblib": model_dir / "scaler_X.joblib",
-        "scaler_y.joblib": model_dir / "scaler_y.joblib",
     }
-    return all(p.exists() for p in requirments.values())
+    # SCALER: scaler_X/scaler_y.joblib, ATAU station_scalers.npz UNTUK MODEL MULTI-STASIUN
+    scalers = (model_dir / STATION_SCALERS_FILENAME).exists() or all(
+        (model_dir / name).exists() for name in ("scaler_X.joblib", "scaler_y.joblib")
+    )
+    return scalers and all(p.exists() for p in requirments.values())
+
+
+# NAMA VARIAN DI metadata["variants"] -> NAMA BACKEND INFERENSI
+_VARIANT_BACKENDS = {
+    "float32": "tflite",
+    "float16": "tflite_float16",
+    "int8": "tflite_int8",
+}
+
+
+def _variant_summary(meta: dict, inference: dict) -> Dict:
+    benchmark = inference.get("benchmark") or {}
+    summary = {}
+    for name, info in (meta.get("variants") or {}).items():
+        served = benchmark.get(_VARIANT_BACKENDS.get(name), {})
+        summary[name] = {
+            "size_bytes": info.get("size_bytes"),
+            "latency_ms": info.get("latency_ms"),
+            "serving_latency_ms": served.get("median_ms"),
+            "overall": info.get("overall"),
+        }
+    return summary
+
+
+def _training_summary(report: Optional[dict]) -> Optional[Dict]:
+    if not report:
+        return None
+    keys = (
+        "wall_seconds",
+        "epochs_run",
+        "best_epoch",
+        "stopped_early",
+        "mean_samples_per_sec",
+        "peak_rss_bytes",
+        "rows",
+    )
+    return {k: report.get(k) for k in keys}
 
 
 def _collect_model_entry(model_dir: Path) -> Dict:
@@ -55,16 +165,25 @@ def _collect_model_entry(model_dir: Path) -> Dict:
     eval_ = _read_json(model_dir / "evaluation.json") or {}
     overall = eval_.get("Overall")
 
-    try:
-        unix_time = int(model_dir.stat().st_mtime)
-        created_at = datetime.fromtimestamp(unix_time).strftime("%Y-%m-%d %H:%M:%S")
-    except Exception:
-        created_at = None
+    # WAKTU TRAINING DARI METADATA; mtime FOLDER BERUBAH SETIAP KALI FILE DI DALAMNYA
+    # DITULIS ULANG, JADI HANYA DIPAKAI UNTUK MODEL LAMA TANPA trained_at
+    created_at = meta.get("trained_at")
+    if not isinstance(created_at, str):
+        try:
+            unix_time = int(model_dir.stat().st_mtime)
+            created_at = datetime.fromtimestamp(unix_time).strftime("%Y-%m-%d %H:%M:%S")
+        except Exception:
+            created_at = None
 
     return {
         "name": model_dir.name,
         "created_at": created_at,
         "overall": overall,
+        "stations": len(meta.get("stations") or []) or None,
+        "variants": _variant_summary(meta, _inference_selection(model_dir, meta)),
+        "training": _training_summary(
+            _read_json(model_dir / TRAINING_REPORT_FILENAME)
+        ),
     }
 
 
@@ -73,7 +192,7 @@ def _list_trained_models() -> List[Dict]:
         return []
     items: List[Dict] = []
     for p in MODELS_BASE.iterdir():
-        if p.is_dir() and _required_files_present(p):
+        if p.is_dir() and not p.name.startswith(".") and _required_files_present(p):
             items.append(_collect_model_entry(p))
     items.sort(key=lambda x: (x["created_at"] or 0), reverse=True)
     return items
@@ -91,4 +210,13 @@ def _ensure_model_exists(name: str) -> Path:
             status_code=status.HTTP_409_CONFLICT,
             detail=f'Model "{name}" is incomplete; missing required files.',
         )
+    bundle = model_dir / BUNDLE_FILENAME
+    if bundle.exists():
+        try:
+            verify_inference_bundle(bundle)
+        except (BundleError, OSError, ValueError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f'Model "{name}" has a corrupt {BUNDLE_FILENAME}: {e}',
+            )
     return model_dir
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 from typing import List
 
@@ -7,6 +8,17 @@ import pandas as pd
 PREDICTIONS_BASE = Path(__file__).resolve().parents[1] / "predictions_model"
 MODELS_BASE = PREDICTIONS_BASE / "models"
 MODEL_INFO_PATH = MODELS_BASE / "model_information.json"
+# PILIHAN BACKEND PER AKTIVASI; DI LUAR FILE YANG DI-HASH SEBAGAI VERSI MODEL
+INFERENCE_FILENAME = "inference.json"
+
+
+def _inference_selection(model_dir: Path, metadata: dict) -> dict:
+    """Isi inference.json; model lama menyimpannya di metadata["inference"]."""
+    try:
+        with (Path(model_dir) / INFERENCE_FILENAME).open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return metadata.get("inference") or {}
 
 
 # CEK KOLOM TANGGAL
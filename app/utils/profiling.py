@@ -0,0 +1,193 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.model_utils import PREDICTIONS_BASE
+
+# PROFILING ON-DEMAND UNTUK REQUEST ADMIN
+# Sampling profiler berbasis sys._current_frames() (stdlib, tanpa dependency).
+# Output "collapsed stacks" bisa langsung dibuka di speedscope / flamegraph.pl.
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", PREDICTIONS_BASE / "profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 20))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.005))
+
+_TRACEMALLOC_LOCK = threading.Lock()
+# PROFIL AKTIF -> True JIKA WINDOW-NYA BERTUMPUK DENGAN PROFIL LAIN
+# (reset_peak/get_traced_memory berlaku untuk seluruh proses, jadi peak-nya tidak valid)
+_TRACEMALLOC_ACTIVE: Dict[str, bool] = {}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Ambil stack dari satu thread setiap `interval` detik."""
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {n}" for stack, n in self.stacks.most_common())
+
+    def top_functions(self, limit: int = 25) -> List[Dict[str, Any]]:
+        # SELF TIME = FRAME PALING ATAS, TOTAL = MUNCUL DI MANA SAJA DALAM STACK
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, n in self.stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += n
+            for f in set(frames):
+                total_counts[f] += n
+        total = max(self.samples, 1)
+        return [
+            {
+                "function": f,
+                "self_pct": 100.0 * self_counts[f] / total,
+                "total_pct": 100.0 * total_counts[f] / total,
+            }
+            for f, _ in total_counts.most_common(limit)
+        ]
+
+
+def _start_tracemalloc(profile_id: str) -> None:
+    with _TRACEMALLOC_LOCK:
+        if not _TRACEMALLOC_ACTIVE:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+            tracemalloc.reset_peak()
+        overlapped = bool(_TRACEMALLOC_ACTIVE)
+        for other in _TRACEMALLOC_ACTIVE:
+            _TRACEMALLOC_ACTIVE[other] = True
+        _TRACEMALLOC_ACTIVE[profile_id] = overlapped
+
+
+def _stop_tracemalloc(profile_id: str) -> Tuple[int, Optional[int], List[Dict[str, Any]]]:
+    with _TRACEMALLOC_LOCK:
+        current, peak = tracemalloc.get_traced_memory()
+        if _TRACEMALLOC_ACTIVE.pop(profile_id):
+            peak = None
+        top = [
+            {"location": str(stat.traceback[0]), "size_bytes": stat.size, "count": stat.count}
+            for stat in tracemalloc.take_snapshot().statistics("lineno")[:15]
+        ]
+        if not _TRACEMALLOC_ACTIVE:
+            tracemalloc.stop()
+    return current, peak, top
+
+
+def _rotate_profiles() -> None:
+    files = sorted(PROFILE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for old in files[: max(0, len(files) - PROFILE_KEEP)]:
+        old.unlink(missing_ok=True)
+
+
+def run_profiled(label: str, fn: Callable, *args, **kwargs) -> Tuple[Any, str]:
+    """
+    Jalankan fn di thread saat ini di bawah sampling profiler + tracemalloc.
+    Return (hasil, profile_id). Profil disimpan walaupun fn melempar exception.
+    tracemalloc_peak_bytes = None jika ada profil lain yang berjalan bersamaan.
+    """
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    profiler = SamplingProfiler(threading.get_ident())
+    _start_tracemalloc(profile_id)
+    started_at = time.strftime("%Y-%m-%d %H:%M:%S")
+    t0 = time.perf_counter()
+    profiler.start()
+    error = None
+    try:
+        return fn(*args, **kwargs), profile_id
+    except Exception as e:
+        error = repr(e)
+        raise
+    finally:
+        profiler.stop()
+        wall_ms = (time.perf_counter() - t0) * 1000.0
+        current, peak, top_alloc = _stop_tracemalloc(profile_id)
+        report = {
+            "id": profile_id,
+            "label": label,
+            "started_at": started_at,
+            "wall_ms": wall_ms,
+            "error": error,
+            "interval_s": profiler.interval,
+            "samples": profiler.samples,
+            "tracemalloc_peak_bytes": peak,
+            "tracemalloc_current_bytes": current,
+            "top_functions": profiler.top_functions(),
+            "top_allocations": top_alloc,
+            "collapsed": profiler.collapsed(),
+        }
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = PROFILE_DIR / f"{profile_id}.json.tmp"
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False)
+        tmp.replace(PROFILE_DIR / f"{profile_id}.json")
+        _rotate_profiles()
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Ringkasan profil tersimpan, paling lambat di atas."""
+    items = []
+    if not PROFILE_DIR.exists():
+        return items
+    for p in PROFILE_DIR.glob("*.json"):
+        try:
+            with p.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            continue
+        items.append(
+            {
+                k: data.get(k)
+                for k in (
+                    "id",
+                    "label",
+                    "started_at",
+                    "wall_ms",
+                    "tracemalloc_peak_bytes",
+                    "samples",
+                    "error",
+                )
+            }
+        )
+    items.sort(key=lambda x: x.get("wall_ms") or 0, reverse=True)
+    return items
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    path = PROFILE_DIR / f"{Path(profile_id).name}.json"
+    return path if path.exists() else None
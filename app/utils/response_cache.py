@@ -0,0 +1,166 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from utils.metrics import cache_event
+
+try:
+    import brotli  # OPSIONAL
+except ImportError:
+    brotli = None
+
+# CACHE RESPONSE JSON YANG SUDAH DISERIALISASI (+ KOMPRESI SEKALI SAAT DIBANGUN)
+# Entry dibuang saat _write_json / _atomic_write_json menulis file yang menjadi
+# dependensinya (invalidate_path). mtime dependensi juga dicek dengan stat()
+# supaya penulisan dari worker/proses lain tetap terdeteksi.
+# ? https://developer.mozilla.org/en-US/docs/Web/HTTP/Conditional_requests
+COMPRESS_MIN_BYTES = 1024
+
+
+class CachedResponse:
+    __slots__ = ("body", "encoded", "etag", "last_modified", "headers", "deps")
+
+    def __init__(
+        self,
+        body: bytes,
+        deps: Dict[Path, Optional[int]],
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.body = body
+        self.deps = deps
+        self.headers = headers or {}
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        mtimes = [m for m in deps.values() if m is not None]
+        last = max(mtimes) / 1e9 if mtimes else time.time()
+        self.last_modified = formatdate(int(last), usegmt=True)
+        self.encoded: Dict[str, bytes] = {}
+        if len(body) >= COMPRESS_MIN_BYTES:
+            self.encoded["gzip"] = gzip.compress(body, compresslevel=6, mtime=0)
+            if brotli is not None:
+                self.encoded["br"] = brotli.compress(body, quality=5)
+
+
+_CACHE: Dict[str, CachedResponse] = {}
+_LOCK = threading.Lock()
+# NAIK SETIAP INVALIDASI; ENTRY YANG DIBANGUN SAAT ADA PENULISAN TIDAK DISIMPAN
+_GENERATION = [0]
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def invalidate_path(path: str | Path) -> None:
+    """Buang semua entry yang bergantung pada file ini."""
+    path = Path(path).resolve()
+    with _LOCK:
+        _GENERATION[0] += 1
+        for key in [k for k, v in _CACHE.items() if path in v.deps]:
+            del _CACHE[key]
+
+
+def invalidate(key: Optional[str] = None) -> None:
+    with _LOCK:
+        _GENERATION[0] += 1
+        if key is None:
+            _CACHE.clear()
+        else:
+            _CACHE.pop(key, None)
+
+
+def _fresh(entry: CachedResponse) -> bool:
+    return all(_mtime_ns(p) == m for p, m in entry.deps.items())
+
+
+def _parse_etags(header: str) -> List[str]:
+    # W/"x" DAN "x" DIANGGAP SAMA (WEAK COMPARISON UNTUK If-None-Match)
+    return [t.strip().removeprefix("W/") for t in header.split(",") if t.strip()]
+
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        tags = _parse_etags(inm)
+        return "*" in tags or entry.etag in tags
+    ims = request.headers.get("if-modified-since")
+    if ims:
+        try:
+            return parsedate_to_datetime(entry.last_modified) <= parsedate_to_datetime(ims)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _pick_encoding(request: Request, entry: CachedResponse) -> Optional[str]:
+    accepted = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    for enc in ("br", "gzip"):
+        if enc in entry.encoded and accepted.get(enc, 0) > 0:
+            return enc
+    return None
+
+
+def cached_json_response(
+    request: Request,
+    key: str,
+    build: Callable[[], Tuple[Any, Iterable[Path], Optional[Dict[str, str]]]],
+) -> Response:
+    """
+    build() -> (objek JSON, daftar file dependensi, header tambahan).
+    Dipanggil hanya jika cache kosong/basi; HTTPException dari build() diteruskan.
+    """
+    with _LOCK:
+        entry = _CACHE.get(key)
+        generation = _GENERATION[0]
+    if entry is not None and not _fresh(entry):
+        entry = None
+    cache_event(f"response:{key}", hit=entry is not None)
+
+    if entry is None:
+        obj, deps, headers = build()
+        body = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        entry = CachedResponse(
+            body, {Path(p).resolve(): _mtime_ns(Path(p)) for p in deps}, headers
+        )
+        with _LOCK:
+            if generation == _GENERATION[0]:
+                _CACHE[key] = entry
+
+    common = {
+        "ETag": entry.etag,
+        "Last-Modified": entry.last_modified,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        **entry.headers,
+    }
+    if _not_modified(request, entry):
+        return Response(status_code=304, headers=common)
+
+    encoding = _pick_encoding(request, entry)
+    if encoding is None:
+        return Response(entry.body, media_type="application/json", headers=common)
+    return Response(
+        entry.encoded[encoding],
+        media_type="application/json",
+        headers={**common, "Content-Encoding": encoding},
+    )
@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+from dotenv import load_dotenv
+
+from utils.data_validation import DATE_COL, REQUIRED_COLS, STATION_COL
+from utils.dremio import dremio_query
+from utils.metrics import counter, gauge, stage_timer
+from utils.predict_utils import PREDICTIONS_BASE, _preprocess_history
+
+# SEED WINDOW "HIDUP" DARI TABEL DREMIO KANONIK (SEED_SOURCE_TABLE)
+# - Query inkremental: hanya baris dengan Tanggal > watermark. Saat belum ada state,
+#   cukup SEED_BUFFER_ROWS baris terbaru (ORDER BY Tanggal DESC LIMIT n), bukan full scan.
+# - Ekor data mentah (buffer) disimpan supaya preprocessing (0 -> NaN + interpolasi)
+#   sama dengan saat training; window time_step terakhir di-cache per set fitur.
+# - State (watermark, buffer, window) ditulis atomik ke SEED_WINDOW_PATH, jadi restart
+#   tidak perlu query ulang dari awal.
+# - Tanpa SEED_SOURCE_TABLE service mati dan seed window statis dari model dipakai.
+# - Tabel multi-stasiun (kolom Stasiun) wajib difilter lewat SEED_STATION; tanpa itu
+#   baris antar stasiun bertabrakan di Tanggal yang sama, jadi refresh ditolak.
+# - Window baru dari request hanya disimpan di memori; file state ditulis saat refresh.
+# Baris lama yang dikoreksi di tabel (Tanggal <= watermark) tidak terbaca ulang.
+load_dotenv()
+
+SEED_SOURCE_TABLE = os.getenv("SEED_SOURCE_TABLE", "").strip()
+SEED_BUFFER_ROWS = int(os.getenv("SEED_BUFFER_ROWS", 60))
+SEED_REFRESH_SECONDS = float(os.getenv("SEED_REFRESH_SECONDS", 300))
+SEED_STATION = os.getenv("SEED_STATION", "").strip()
+SEED_WINDOW_PATH = Path(
+    os.getenv("SEED_WINDOW_PATH", PREDICTIONS_BASE / "seed_window_state.json")
+)
+
+SEED_ROWS_FETCHED = counter(
+    "app_seed_window_rows_fetched_total", "Observation rows fetched for the live seed window."
+)
+SEED_WATERMARK = gauge(
+    "app_seed_window_watermark_timestamp", "Latest observation date in the live seed window."
+)
+
+WindowKey = Tuple[Tuple[str, ...], Tuple[str, ...], int]
+
+
+def _window_key(feat_cols: List[str], target_cols: List[str], time_step: int) -> WindowKey:
+    return tuple(feat_cols), tuple(target_cols), int(time_step)
+
+
+def _key_id(key: WindowKey) -> str:
+    return hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()[:16]
+
+
+class SeedWindowService:
+    def __init__(
+        self,
+        table: str,
+        path: Path = SEED_WINDOW_PATH,
+        buffer_rows: int = SEED_BUFFER_ROWS,
+        refresh_seconds: float = SEED_REFRESH_SECONDS,
+        query: Optional[Callable[[str], pa.Table]] = None,
+        station: str = SEED_STATION,
+    ):
+        self.table = table
+        self.station = station
+        self.path = Path(path)
+        self.buffer_rows = buffer_rows
+        self.refresh_seconds = refresh_seconds
+        self.query = query or dremio_query
+        self.buffer: Optional[pd.DataFrame] = None
+        self.watermark: Optional[pd.Timestamp] = None
+        self.windows: Dict[WindowKey, pd.DataFrame] = {}
+        self.checked_at = 0.0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._load()
+
+    # =========================
+    # STATE
+    # =========================
+    def _load(self) -> None:
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if state.get("table") != self.table or not state.get("buffer"):
+            return
+        if state.get("station", "") != self.station:
+            return
+        self.buffer = _frame_from_json(state["buffer"])
+        self.watermark = self.buffer.index.max()
+        for item in state.get("windows", []):
+            key = _window_key(item["features"], item["targets"], item["time_step"])
+            self.windows[key] = _frame_from_json(item["rows"])
+        SEED_WATERMARK.set(self.watermark.timestamp(), table=self.table)
+
+    def _persist(self) -> None:
+        state = {
+            "table": self.table,
+            "station": self.station,
+            "watermark": self.watermark.strftime("%Y-%m-%d") if self.watermark else None,
+            "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "buffer": _frame_to_json(self.buffer),
+            "windows": [
+                {
+                    "features": list(key[0]),
+                    "targets": list(key[1]),
+                    "time_step": key[2],
+                    "rows": _frame_to_json(window),
+                }
+                for key, window in self.windows.items()
+            ],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        tmp.replace(self.path)
+        self._dirty = False
+
+    # =========================
+    # QUERY INKREMENTAL
+    # =========================
+    def _fetch(self) -> pd.DataFrame:
+        source = f'Minio."{self.table}"'
+        # FILTER STASIUN DI SQL SUPAYA LIMIT BUFFER AWAL DIHITUNG PER STASIUN
+        station = ""
+        if self.station:
+            name = self.station.replace("'", "''")
+            station = f"AND {STATION_COL} = '{name}' "
+        if self.watermark is None:
+            sql = (
+                f"SELECT * FROM {source} WHERE {DATE_COL} IS NOT NULL {station}"
+                f"ORDER BY {DATE_COL} DESC LIMIT {self.buffer_rows}"
+            )
+        else:
+            since = self.watermark.strftime("%Y-%m-%d")
+            sql = (
+                f"SELECT * FROM {source} "
+                f"WHERE {DATE_COL} > TO_DATE('{since}', 'YYYY-MM-DD') {station}"
+                f"ORDER BY {DATE_COL}"
+            )
+        df = self.query(sql).to_pandas()
+        SEED_ROWS_FETCHED.inc(len(df), table=self.table)
+        if STATION_COL in df.columns and not self.station:
+            raise ValueError(
+                f"Tabel {self.table} memiliki kolom {STATION_COL}; "
+                "set SEED_STATION untuk memilih satu stasiun"
+            )
+        if df.empty:
+            return df
+        df[DATE_COL] = pd.to_datetime(df[DATE_COL])
+        df = df.set_index(DATE_COL).sort_index()
+        return df[[c for c in REQUIRED_COLS if c in df.columns]].apply(
+            pd.to_numeric, errors="coerce"
+        )
+
+    def refresh(self) -> int:
+        """Ambil baris baru; return jumlah tanggal baru. Satu refresh dalam satu waktu."""
+        with self._refresh_lock:
+            with stage_timer("seed_window_refresh"):
+                new_rows = self._fetch()
+            with self._lock:
+                self.checked_at = time.monotonic()
+                if new_rows.empty:
+                    # WINDOW BARU DARI REQUEST TETAP DISIMPAN WALAU TIDAK ADA BARIS BARU
+                    if self._dirty:
+                        self._persist()
+                    return 0
+                combined = (
+                    new_rows if self.buffer is None else pd.concat([self.buffer, new_rows])
+                )
+                combined = combined[~combined.index.duplicated(keep="last")].sort_index()
+                added = len(combined) - (0 if self.buffer is None else len(self.buffer))
+                self.buffer = combined.iloc[-self.buffer_rows :]
+                self.watermark = self.buffer.index.max()
+                # WINDOW DIHITUNG ULANG UNTUK SEMUA SET FITUR YANG PERNAH DIMINTA
+                for key in list(self.windows):
+                    self.windows[key] = self._build_window(key)
+                self._persist()
+            SEED_WATERMARK.set(self.watermark.timestamp(), table=self.table)
+            return added
+
+    def _refresh_in_background(self) -> None:
+        if self._refresh_lock.locked():
+            return
+        self.checked_at = time.monotonic()
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Seed window refresh failed: {e}")
+
+        threading.Thread(target=run, name="seed-window-refresh", daemon=True).start()
+
+    # =========================
+    # WINDOW
+    # =========================
+    def _build_window(self, key: WindowKey) -> Optional[pd.DataFrame]:
+        feat_cols, target_cols, time_step = key
+        if self.buffer is None or len(self.buffer) < time_step:
+            return None
+        if not set(feat_cols).issubset(self.buffer.columns):
+            return None
+        window = _preprocess_history(self.buffer, list(feat_cols), list(target_cols))
+        window = window.iloc[-time_step:].copy()
+        return None if window.isna().any().any() else window
+
+    def window(
+        self, feat_cols: List[str], target_cols: List[str], time_step: int
+    ) -> Optional[pd.DataFrame]:
+        """
+        Window time_step terakhir (sudah dipreprocess) atau None jika belum tersedia.
+        Tidak pernah menunggu Dremio; jika data sudah lebih tua dari SEED_REFRESH_SECONDS,
+        refresh dijalankan di latar belakang.
+        """
+        if time.monotonic() - self.checked_at > self.refresh_seconds:
+            self._refresh_in_background()
+        key = _window_key(feat_cols, target_cols, time_step)
+        with self._lock:
+            if key not in self.windows and self.buffer is not None:
+                self.windows[key] = self._build_window(key)
+                self._dirty = True
+            window = self.windows.get(key)
+        return window.copy() if window is not None else None
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "table": self.table,
+                "station": self.station or None,
+                "watermark": self.watermark.strftime("%Y-%m-%d") if self.watermark else None,
+                "buffer_rows": 0 if self.buffer is None else len(self.buffer),
+                "windows": [
+                    {"id": _key_id(key), "time_step": key[2], "ready": w is not None}
+                    for key, w in self.windows.items()
+                ],
+                "checked_seconds_ago": (
+                    time.monotonic() - self.checked_at if self.checked_at else None
+                ),
+            }
+
+
+def _frame_to_json(df: Optional[pd.DataFrame]) -> Optional[Dict[str, Any]]:
+    if df is None:
+        return None
+    return {
+        "index": df.index.strftime("%Y-%m-%d").tolist(),
+        "columns": list(df.columns),
+        "data": df.astype(object).where(df.notna(), None).values.tolist(),
+    }
+
+
+def _frame_from_json(data: Optional[Dict[str, Any]]) -> Optional[pd.DataFrame]:
+    if data is None:
+        return None
+    index = pd.DatetimeIndex(pd.to_datetime(data["index"]), name=DATE_COL)
+    return pd.DataFrame(data["data"], index=index, columns=data["columns"], dtype=float)
+
+
+SEED_WINDOWS: Optional[SeedWindowService] = (
+    SeedWindowService(SEED_SOURCE_TABLE) if SEED_SOURCE_TABLE else None
+)
+
+
+def live_seed_window(
+    feat_cols: List[str], target_cols: List[str], time_step: int
+) -> Optional[pd.DataFrame]:
+    """Seed window dari observasi terbaru, atau None (pakai seed window statis model)."""
+    if SEED_WINDOWS is None:
+        return None
+    return SEED_WINDOWS.window(feat_cols, target_cols, time_step)
+
+
+def refresh_seed_windows() -> int:
+    """Refresh sinkron (dipanggil scheduler); 0 jika service mati."""
+    if SEED_WINDOWS is None:
+        return 0
+    return SEED_WINDOWS.refresh()
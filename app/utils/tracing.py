@@ -0,0 +1,366 @@
+import atexit
+import contextvars
+import functools
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+# TRACING RINGAN ALA OPENTELEMETRY (TANPA DEPENDENCY)
+# Span disimpan di contextvars, jadi ikut ke run_in_threadpool dan bisa dibawa
+# ke thread lain lewat contextvars.copy_context(). Ekspor dilakukan oleh thread
+# latar belakang, handler tidak pernah menunggu I/O exporter.
+# ? https://www.w3.org/TR/trace-context/
+# ? https://opentelemetry.io/docs/specs/otlp/#otlphttp
+load_dotenv()
+
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").strip().lower()
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", 1.0))
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "air-quality-api")
+OTLP_ENDPOINT = os.getenv(
+    "OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318"
+).rstrip("/")
+
+_CURRENT: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def _hex_id(n_bytes: int) -> str:
+    return f"{random.getrandbits(n_bytes * 8):0{n_bytes * 2}x}"
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "kind",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "status",
+        "error",
+        "sampled",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        sampled: bool,
+        kind: str = "internal",
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _hex_id(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.sampled = sampled
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": ((self.end_ns or self.start_ns) - self.start_ns) / 1e6,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+            "service": TRACING_SERVICE_NAME,
+        }
+
+
+# =========================
+# EXPORTER
+# =========================
+class ConsoleExporter:
+    def export(self, spans: List[Span]) -> None:
+        for s in spans:
+            indent = "  " if s.parent_id else ""
+            print(
+                f"[trace {s.trace_id[:8]}] {indent}{s.name} {(s.end_ns - s.start_ns) / 1e6:.2f} ms {s.status}",
+                file=sys.stderr,
+            )
+
+
+class FileExporter:
+    """Satu span per baris (JSON Lines)."""
+
+    def __init__(self, path: str = TRACING_FILE):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for s in spans:
+                f.write(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+class OtlpHttpExporter:
+    """OTLP/HTTP JSON ke collector (Jaeger, Tempo, otel-collector)."""
+
+    _KINDS = {"internal": 1, "server": 2, "client": 3}
+
+    def __init__(self, endpoint: str = OTLP_ENDPOINT):
+        self.url = f"{endpoint}/v1/traces"
+
+    @staticmethod
+    def _value(v: Any) -> Dict[str, Any]:
+        if isinstance(v, bool):
+            return {"boolValue": v}
+        if isinstance(v, int):
+            return {"intValue": str(v)}
+        if isinstance(v, float):
+            return {"doubleValue": v}
+        return {"stringValue": str(v)}
+
+    def _span(self, s: Span) -> Dict[str, Any]:
+        out = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": self._KINDS.get(s.kind, 1),
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [
+                {"key": k, "value": self._value(v)} for k, v in s.attributes.items()
+            ],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            out["parentSpanId"] = s.parent_id
+        return out
+
+    def export(self, spans: List[Span]) -> None:
+        body = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": TRACING_SERVICE_NAME},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "utils.tracing"},
+                            "spans": [self._span(s) for s in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        req = urllib.request.Request(
+            self.url,
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        urllib.request.urlopen(req, timeout=5).close()
+
+
+EXPORTERS: Dict[str, Callable[[], Any]] = {
+    "console": ConsoleExporter,
+    "file": FileExporter,
+    "otlp": OtlpHttpExporter,
+}
+
+
+def register_exporter(name: str, factory: Callable[[], Any]) -> None:
+    """Tambah exporter lain; objeknya cukup punya method export(spans)."""
+    EXPORTERS[name] = factory
+
+
+class _BatchProcessor:
+    def __init__(self, exporter, max_batch: int = 256, interval: float = 1.0):
+        self.exporter = exporter
+        self.max_batch = max_batch
+        self.interval = interval
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=10_000)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            # LEBIH BAIK KEHILANGAN SPAN DARIPADA MEMPERLAMBAT REQUEST
+            pass
+
+    def _drain(self) -> List[Span]:
+        batch = []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self) -> None:
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            try:
+                self.exporter.export(batch)
+            except Exception as e:
+                print(f"Trace export failed: {e}", file=sys.stderr)
+                return
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+_PROCESSOR: Optional[_BatchProcessor] = None
+_PROCESSOR_LOCK = threading.Lock()
+
+
+def configure(exporter: Optional[str] = None) -> None:
+    """Pilih exporter ("none", "console", "file", "otlp", atau yang didaftarkan)."""
+    global _PROCESSOR, TRACING_EXPORTER
+    name = (exporter or TRACING_EXPORTER).strip().lower()
+    with _PROCESSOR_LOCK:
+        if _PROCESSOR is not None:
+            _PROCESSOR.flush()
+        TRACING_EXPORTER = name
+        if name in ("", "none"):
+            _PROCESSOR = None
+            return
+        if name not in EXPORTERS:
+            raise ValueError(f"Unknown tracing exporter '{name}'. Use one of {['none', *EXPORTERS]}.")
+        _PROCESSOR = _BatchProcessor(EXPORTERS[name]())
+
+
+def enabled() -> bool:
+    return _PROCESSOR is not None
+
+
+def flush() -> None:
+    if _PROCESSOR is not None:
+        _PROCESSOR.flush()
+
+
+# =========================
+# SPAN API
+# =========================
+def current_span() -> Optional[Span]:
+    return _CURRENT.get()
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """Return (trace_id, parent_span_id, sampled) atau None jika tidak valid."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    if set(parts[1]) == {"0"} or set(parts[2]) == {"0"}:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+@contextmanager
+def span(
+    name: str,
+    kind: str = "internal",
+    traceparent: Optional[str] = None,
+    **attributes,
+):
+    """
+    Buka span anak dari span aktif (atau dari header traceparent, atau trace baru).
+    Tanpa exporter, tidak ada yang dicatat dan overhead-nya hanya satu cek.
+    """
+    if _PROCESSOR is None:
+        yield None
+        return
+
+    parent = _CURRENT.get()
+    remote = parse_traceparent(traceparent) if parent is None else None
+    if parent is not None:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+    elif remote is not None:
+        trace_id, parent_id, sampled = remote
+    else:
+        trace_id, parent_id = _hex_id(16), None
+        sampled = random.random() < TRACING_SAMPLE_RATIO
+
+    current = Span(name, trace_id, parent_id, sampled, kind, attributes)
+    token = _CURRENT.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.record_exception(e)
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _CURRENT.reset(token)
+        if current.sampled and _PROCESSOR is not None:
+            _PROCESSOR.submit(current)
+
+
+def traced(name: str, kind: str = "internal"):
+    """Decorator: jalankan seluruh fungsi di dalam satu span."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, kind=kind):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def inject_headers(headers: Iterable[Tuple[bytes, bytes]] = ()) -> List[Tuple[bytes, bytes]]:
+    """Tambah header traceparent (format gRPC/Flight: list of (bytes, bytes))."""
+    headers = list(headers)
+    current = _CURRENT.get()
+    if current is not None:
+        headers.append((b"traceparent", current.traceparent.encode("ascii")))
+    return headers
+
+
+configure()
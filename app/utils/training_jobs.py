@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+# JOB TRAINING DI LATAR BELAKANG + EVENT PROGRES UNTUK SSE
+# Thread training hanya memanggil publish() (append + call_soon_threadsafe),
+# jadi tidak pernah menunggu subscriber yang lambat.
+# Satu model_name hanya boleh dilatih oleh satu job/request sekaligus (semuanya menulis
+# ke folder model yang sama), dan paling banyak TRAINING_CONCURRENCY training berjalan
+# bersamaan; job lain menunggu giliran (status "queued"), maksimal TRAINING_JOBS_MAX_ACTIVE.
+# ? https://html.spec.whatwg.org/multipage/server-sent-events.html
+TRAINING_JOBS_KEEP = int(os.getenv("TRAINING_JOBS_KEEP", 20))
+TRAINING_CONCURRENCY = int(os.getenv("TRAINING_CONCURRENCY", 1))
+TRAINING_JOBS_MAX_ACTIVE = int(os.getenv("TRAINING_JOBS_MAX_ACTIVE", 4))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", 15))
+
+TERMINAL_EVENTS = ("done", "failed")
+
+
+class TrainingRejected(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+
+
+class TrainingJob:
+    def __init__(self, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.status = "queued"
+        self.created_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.events: List[Dict[str, Any]] = []
+        # (event loop subscriber, queue): SETIAP SUBSCRIBER DIBANGUNKAN DI LOOP-NYA SENDIRI
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_EVENTS
+
+    def publish(self, event_type: str, **data) -> None:
+        """Aman dipanggil dari thread mana pun."""
+        with self._lock:
+            event = {
+                "id": len(self.events),
+                "event": event_type,
+                "time": time.time(),
+                **data,
+            }
+            self.events.append(event)
+            if event_type in TERMINAL_EVENTS:
+                self.status = event_type
+            elif self.status == "queued" and event_type != "queued":
+                self.status = "running"
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # EVENT LOOP SUDAH DITUTUP (SERVER SHUTDOWN)
+                pass
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            last = self.events[-1] if self.events else None
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "params": self.params,
+            "last_event": last,
+        }
+
+    async def subscribe(self, after: int = -1) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield event dengan id > after (riwayat dulu, lalu event baru).
+        Yield None setiap SSE_KEEPALIVE_SECONDS tanpa event.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            backlog = [e for e in self.events if e["id"] > after]
+            finished = self.finished
+            if not finished:
+                self._subscribers.append(subscriber)
+        try:
+            for event in backlog:
+                yield event
+            if finished:
+                return
+            last_id = backlog[-1]["id"] if backlog else after
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event["id"] <= last_id:
+                    continue
+                last_id = event["id"]
+                yield event
+                if event["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            with self._lock:
+                if subscriber in self._subscribers:
+                    self._subscribers.remove(subscriber)
+
+
+_JOBS: "OrderedDict[str, TrainingJob]" = OrderedDict()
+_JOBS_LOCK = threading.Lock()
+# model_name -> pemilik (job id atau "train") SELAMA TRAINING BELUM SELESAI
+_ACTIVE_MODELS: Dict[str, str] = {}
+_TRAINING_SLOTS = threading.BoundedSemaphore(TRAINING_CONCURRENCY)
+
+
+def _claim_locked(model_name: str, owner: str) -> None:
+    holder = _ACTIVE_MODELS.get(model_name)
+    if holder is not None:
+        raise TrainingRejected(
+            409, f"Model '{model_name}' is already being trained (by {holder})."
+        )
+    _ACTIVE_MODELS[model_name] = owner
+
+
+def claim_model(model_name: str, owner: str) -> None:
+    """409 jika model_name sedang dilatih job/request lain."""
+    with _JOBS_LOCK:
+        _claim_locked(model_name, owner)
+
+
+def release_model(model_name: str) -> None:
+    with _JOBS_LOCK:
+        _ACTIVE_MODELS.pop(model_name, None)
+
+
+@contextmanager
+def training_slot(wait: bool = True) -> Iterator[None]:
+    """Satu dari TRAINING_CONCURRENCY slot; wait=False -> 429 jika semua terpakai."""
+    if not _TRAINING_SLOTS.acquire(blocking=wait):
+        raise TrainingRejected(429, "All training slots are busy; try again later.")
+    try:
+        yield
+    finally:
+        _TRAINING_SLOTS.release()
+
+
+def create_job(params: Dict[str, Any], model_name: str) -> TrainingJob:
+    """Job baru yang langsung memegang model_name (lepas lewat release_model)."""
+    job = TrainingJob(params)
+    with _JOBS_LOCK:
+        active = sum(not j.finished for j in _JOBS.values())
+        if active >= TRAINING_JOBS_MAX_ACTIVE:
+            raise TrainingRejected(
+                429, f"Too many training jobs ({active} queued or running); try again later."
+            )
+        _claim_locked(model_name, job.id)
+        _JOBS[job.id] = job
+        # BUANG JOB LAMA YANG SUDAH SELESAI
+        finished = [j for j in _JOBS.values() if j.finished]
+        for old in finished[: max(0, len(finished) - TRAINING_JOBS_KEEP)]:
+            _JOBS.pop(old.id, None)
+    return job
+
+
+def get_job(job_id: str) -> Optional[TrainingJob]:
+    with _JOBS_LOCK:
+        return _JOBS.get(job_id)
+
+
+def list_jobs() -> List[Dict[str, Any]]:
+    with _JOBS_LOCK:
+        jobs = list(_JOBS.values())
+    return [j.summary() for j in reversed(jobs)]
+
+
+def format_sse(event: Optional[Dict[str, Any]]) -> str:
+    if event is None:
+        return ": keepalive\n\n"
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {data}\n\n"
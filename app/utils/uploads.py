@@ -0,0 +1,242 @@
+import asyncio
+import base64
+import contextvars
+import functools
+import hashlib
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from minio import Minio
+from minio.datatypes import Part
+
+from utils.metrics import stage_timer
+from utils.tracing import span
+
+# UPLOAD KE OBJECT STORE (MINIO) TANPA MEMBLOKIR EVENT LOOP
+# Semua panggilan MinIO dan baca file berjalan di thread pool sendiri; event loop
+# hanya mengatur urutan part. File besar dikirim sebagai multipart dengan maksimal
+# UPLOAD_CONCURRENCY part sekaligus, jadi memori per file <= (concurrency + 1) x part_size.
+# ? https://docs.aws.amazon.com/AmazonS3/latest/userguide/mpuoverview.html
+# ? https://docs.aws.amazon.com/AmazonS3/latest/userguide/checking-object-integrity.html
+load_dotenv()
+
+MIN_PART_SIZE = 5 * 1024 * 1024  # BATAS S3 (KECUALI PART TERAKHIR)
+MAX_PARTS = 10_000
+
+UPLOAD_PART_SIZE = max(MIN_PART_SIZE, int(os.getenv("UPLOAD_PART_SIZE", 8 * 1024 * 1024)))
+UPLOAD_CONCURRENCY = max(1, int(os.getenv("UPLOAD_CONCURRENCY", 4)))
+UPLOAD_IO_WORKERS = max(1, int(os.getenv("UPLOAD_IO_WORKERS", 16)))
+UPLOAD_MAX_PART_SIZE = int(os.getenv("UPLOAD_MAX_PART_SIZE", 64 * 1024 * 1024))
+
+_IO_POOL = ThreadPoolExecutor(max_workers=UPLOAD_IO_WORKERS, thread_name_prefix="object-io")
+
+
+class ChecksumMismatch(ValueError):
+    pass
+
+
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    """Jalankan fungsi blocking di pool I/O (context ikut, jadi span tracing tetap tersambung)."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(_IO_POOL, functools.partial(ctx.run, fn, *args, **kwargs))
+
+
+def md5_b64(data: bytes) -> str:
+    return base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+
+def multipart_etag(part_md5s: List[bytes]) -> str:
+    """ETag objek multipart di S3/MinIO: md5(gabungan md5 biner tiap part)-jumlah part."""
+    return f"{hashlib.md5(b''.join(part_md5s)).hexdigest()}-{len(part_md5s)}"
+
+
+def upload_part(
+    client: Minio,
+    bucket: str,
+    object_name: str,
+    upload_id: str,
+    part_number: int,
+    data: bytes,
+    content_md5: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Upload satu part. Content-MD5 dikirim supaya server menolak part yang rusak di
+    jalan; ETag balasan juga dicek terhadap md5 lokal.
+    """
+    digest = hashlib.md5(data).digest()
+    local_md5 = base64.b64encode(digest).decode("ascii")
+    if content_md5 is not None and content_md5 != local_md5:
+        raise ChecksumMismatch(
+            f"Part {part_number}: Content-MD5 {content_md5} does not match body ({local_md5})."
+        )
+    with span(
+        "minio.upload_part", kind="client", bucket=bucket, object=object_name, part=part_number
+    ):
+        etag = client._upload_part(
+            bucket, object_name, data, {"Content-MD5": local_md5}, upload_id, part_number
+        )
+    # ETag PART = md5 ISI PART (TANPA SSE-KMS/SSE-C)
+    if etag and etag.strip('"') != digest.hex():
+        raise ChecksumMismatch(f"Part {part_number}: ETag {etag} != md5 {digest.hex()}.")
+    return {"part_number": part_number, "etag": etag, "size": len(data), "md5": digest}
+
+
+def complete_upload(
+    client: Minio,
+    bucket: str,
+    object_name: str,
+    upload_id: str,
+    parts: List[Tuple[int, str]],
+    part_md5s: Optional[List[bytes]] = None,
+) -> str:
+    """Selesaikan multipart; jika md5 tiap part diketahui, ETag gabungan diverifikasi."""
+    parts = sorted(parts)
+    with span("minio.complete_multipart_upload", kind="client", bucket=bucket, object=object_name):
+        result = client._complete_multipart_upload(
+            bucket, object_name, upload_id, [Part(n, etag.strip('"')) for n, etag in parts]
+        )
+    etag = (result.etag or "").strip('"')
+    if part_md5s is not None and "-" in etag and etag != multipart_etag(part_md5s):
+        raise ChecksumMismatch(f"Object ETag {etag} != {multipart_etag(part_md5s)}.")
+    return etag
+
+
+def list_uploaded_parts(
+    client: Minio, bucket: str, object_name: str, upload_id: str
+) -> List[Dict[str, Any]]:
+    parts, marker = [], None
+    while True:
+        result = client._list_parts(bucket, object_name, upload_id, part_number_marker=marker)
+        parts.extend(
+            {"part_number": p.part_number, "etag": p.etag, "size": p.size} for p in result.parts
+        )
+        if not result.is_truncated:
+            return parts
+        marker = result.next_part_number_marker
+
+
+def sha256_of_object(client: Minio, bucket: str, object_name: str) -> str:
+    """Baca ulang objek (streaming) untuk verifikasi sha256 dari klien."""
+    h = hashlib.sha256()
+    response = client.get_object(bucket, object_name)
+    try:
+        for chunk in response.stream(1024 * 1024):
+            h.update(chunk)
+    finally:
+        response.close()
+        response.release_conn()
+    return h.hexdigest()
+
+
+async def put_parallel(
+    client: Minio,
+    bucket: str,
+    object_name: str,
+    fileobj: IO[bytes],
+    content_type: str = "application/octet-stream",
+    part_size: int = UPLOAD_PART_SIZE,
+    concurrency: int = UPLOAD_CONCURRENCY,
+    expected_sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Upload fileobj ke bucket/object_name. File < part_size dikirim dengan satu PUT,
+    selebihnya multipart paralel. Jika expected_sha256 tidak cocok, multipart
+    dibatalkan sebelum objek terbentuk.
+    """
+    part_size = max(MIN_PART_SIZE, part_size)
+    t0 = time.perf_counter()
+    sha = hashlib.sha256()
+
+    first = await run_io(fileobj.read, part_size)
+    sha.update(first)
+    if len(first) < part_size:
+        _check_sha256(sha, expected_sha256)
+        with stage_timer("upload_put_object"), span(
+            "minio.put_object", kind="client", bucket=bucket, object=object_name
+        ):
+            result = await run_io(
+                client.put_object,
+                bucket,
+                object_name,
+                io.BytesIO(first),
+                len(first),
+                content_type=content_type,
+            )
+        return _result(object_name, len(first), result.etag, sha, 1, t0)
+
+    upload_id = await run_io(
+        client._create_multipart_upload, bucket, object_name, {"Content-Type": content_type}
+    )
+    slots = asyncio.Semaphore(concurrency)
+    tasks: List[asyncio.Future] = []
+
+    async def send(part_number: int, data: bytes) -> Dict[str, Any]:
+        try:
+            return await run_io(
+                upload_part, client, bucket, object_name, upload_id, part_number, data
+            )
+        finally:
+            slots.release()
+
+    try:
+        with stage_timer("upload_multipart"):
+            part_number, data, size = 1, first, 0
+            while data:
+                if part_number > MAX_PARTS:
+                    raise ValueError(f"File needs more than {MAX_PARTS} parts; raise part_size.")
+                await slots.acquire()
+                # GAGAL CEPAT: JANGAN BACA PART BERIKUTNYA JIKA ADA PART YANG GAGAL
+                for task in tasks:
+                    if task.done() and task.exception() is not None:
+                        slots.release()
+                        raise task.exception()
+                tasks.append(asyncio.ensure_future(send(part_number, data)))
+                size += len(data)
+                data = await run_io(fileobj.read, part_size)
+                sha.update(data)
+                part_number += 1
+
+            parts = await asyncio.gather(*tasks)
+            _check_sha256(sha, expected_sha256)
+            etag = await run_io(
+                complete_upload,
+                client,
+                bucket,
+                object_name,
+                upload_id,
+                [(p["part_number"], p["etag"]) for p in parts],
+                [p["md5"] for p in parts],
+            )
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            await run_io(client._abort_multipart_upload, bucket, object_name, upload_id)
+        except Exception:
+            pass
+        raise
+    return _result(object_name, size, etag, sha, len(parts), t0)
+
+
+def _check_sha256(sha, expected: Optional[str]) -> None:
+    if expected and sha.hexdigest() != expected.strip().lower():
+        raise ChecksumMismatch(f"sha256 {sha.hexdigest()} != expected {expected}.")
+
+
+def _result(object_name: str, size: int, etag: str, sha, parts: int, t0: float) -> Dict[str, Any]:
+    seconds = time.perf_counter() - t0
+    return {
+        "name": object_name,
+        "size": size,
+        "etag": (etag or "").strip('"'),
+        "sha256": sha.hexdigest(),
+        "parts": parts,
+        "seconds": seconds,
+        "mb_per_s": (size / 1e6) / seconds if seconds > 0 else None,
+    }
@@ -1,5 +1,6 @@
-from typing import List, Optional, Union
+from typing import Dict, List, Mapping, Optional, Sequence, Union
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field, field_validator, model_validator
 
@@ -124,3 +125,53 @@ def _history_to_dataframe(h: HistoryPayload) -> pd.DataFrame:
             }
         )
         return df
+
+
+# =========================
+# INPUT KOLOMNAR (COLUMNAR JSON / ARROW)
+# =========================
+# Validasi per kolom dengan numpy, bukan per elemen lewat pydantic.
+# Nama kolom sama dengan field PredictRequest / HistoryPayload.
+_WEEK1_COLUMNS = {
+    "temperatur": "Temperatur",
+    "kelembapan": "Kelembapan",
+    "curah_hujan": "Curah Hujan",
+    "penyinaran_matahari": "Penyinaran Matahari",
+    "kecepatan_angin": "Kecepatan Angin",
+}
+_POLLUTANT_COLUMNS = ["PM10", "SO2", "CO", "O3", "NO2"]
+
+
+def _columns_to_dataframe(
+    columns: Mapping[str, Sequence], rename: Dict[str, str], label: str
+) -> pd.DataFrame:
+    missing = [c for c in ["tanggal", *rename] if c not in columns]
+    if missing:
+        raise ValueError(f"{label} missing columns {missing}")
+
+    dates = pd.to_datetime(np.asarray(columns["tanggal"]))
+    data = {"Tanggal": dates}
+    for name, target in rename.items():
+        try:
+            values = np.asarray(columns[name], dtype="float64")
+        except (TypeError, ValueError):
+            raise ValueError(f"{label}.{name} must contain only numbers")
+        if values.ndim != 1 or len(values) != len(dates):
+            raise ValueError(f"{name} length must equal dates length")
+        if not np.isfinite(values).all():
+            raise ValueError(f"{label}.{name} contains null/NaN values")
+        data[target] = values
+    return pd.DataFrame(data)
+
+
+def _week1_from_columns(columns: Mapping[str, Sequence]) -> pd.DataFrame:
+    """Setara create_meteorology_df(**PredictRequest)."""
+    return _columns_to_dataframe(columns, _WEEK1_COLUMNS, "week1")
+
+
+def _history_from_columns(columns: Mapping[str, Sequence]) -> pd.DataFrame:
+    """Setara _history_to_dataframe: full features jika semua kolom cuaca ada."""
+    rename = {p: p for p in _POLLUTANT_COLUMNS}
+    if all(c in columns for c in _WEEK1_COLUMNS):
+        rename = {**_WEEK1_COLUMNS, **rename}
+    return _columns_to_dataframe(columns, rename, "history")
@@ -0,0 +1,162 @@
+import datetime
+import json
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+try:
+    import orjson  # OPSIONAL, FALLBACK KE json BAWAAN
+except ImportError:
+    orjson = None
+
+# FORMAT REQUEST/RESPONSE ENDPOINT PREDIKSI
+# application/json                         : format lama (baris per dict, divalidasi pydantic)
+# application/vnd.airquality.columnar+json : {kolom: [nilai...]}, tanpa key berulang per baris
+# application/vnd.apache.arrow.stream      : Arrow IPC stream (biner, kolomnar)
+# application/x-ndjson                     : response streaming, satu baris JSON per record
+#                                            (hanya response endpoint yang mendukungnya)
+# ? https://arrow.apache.org/docs/format/Columnar.html#ipc-streaming-format
+# ? https://www.iana.org/assignments/media-types/application/vnd.apache.arrow.stream
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.airquality.columnar+json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MEDIA_TYPES = (JSON, COLUMNAR_JSON, ARROW_STREAM)
+NDJSON = "application/x-ndjson"
+
+_ARROW_META_PREFIX = b"airquality."
+
+
+def media_type_of(content_type: Optional[str]) -> str:
+    """Content-Type tanpa parameter (charset dll.), default application/json."""
+    value = (content_type or "").split(";")[0].strip().lower()
+    return value or JSON
+
+
+def negotiate(accept: Optional[str], supported: tuple = MEDIA_TYPES) -> str:
+    """
+    Pilih format response dari header Accept (q-value dihormati).
+    Tidak ada yang cocok -> application/json, supaya klien lama tetap jalan.
+    """
+    best, best_q = JSON, 0.0
+    for part in (accept or "").split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if name.lower() in supported and q > best_q:
+            best, best_q = name.lower(), q
+    return best
+
+
+# =========================
+# JSON
+# =========================
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+    return text.encode("utf-8")
+
+
+def ndjson_lines(records: List[Dict[str, Any]]) -> bytes:
+    """Record -> baris NDJSON (setiap baris diakhiri newline)."""
+    return b"".join(dumps(record) + b"\n" for record in records)
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def frame_to_columns(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    DataFrame -> {kolom: array}. Kolom datetime menjadi string ISO (sama dengan
+    format JSON lama), kolom numerik tetap ndarray supaya orjson menulisnya langsung.
+    """
+    columns: Dict[str, Any] = {}
+    for name in df.columns:
+        series = df[name]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            columns[str(name)] = series.dt.strftime("%Y-%m-%dT%H:%M:%S").tolist()
+        elif pd.api.types.is_numeric_dtype(series) and series.notna().all():
+            columns[str(name)] = np.ascontiguousarray(series.to_numpy())
+        else:
+            # NaN BUKAN JSON YANG VALID -> null
+            columns[str(name)] = series.astype(object).where(series.notna(), None).tolist()
+    return columns
+
+
+def frame_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """DataFrame -> list baris (format JSON lama), konversi sama dengan frame_to_columns."""
+    columns = frame_to_columns(df)
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+# =========================
+# ARROW IPC
+# =========================
+def write_arrow(df: pd.DataFrame, metadata: Optional[Mapping[str, Any]] = None) -> bytes:
+    """Satu DataFrame -> satu Arrow IPC stream. metadata disimpan di schema."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = {
+        _ARROW_META_PREFIX + k.encode("utf-8"): str(v).encode("utf-8")
+        for k, v in (metadata or {}).items()
+        if v is not None
+    }
+    table = table.replace_schema_metadata(meta)
+    sink = pa.BufferOutputStream()
+    with ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def read_arrow_tables(data: bytes) -> List[pa.Table]:
+    """
+    Baca satu atau lebih Arrow IPC stream yang ditulis berurutan dalam satu body
+    (mis. cuaca minggu-1 lalu riwayat).
+    """
+    reader = pa.BufferReader(pa.py_buffer(data))
+    tables = []
+    while reader.tell() < reader.size():
+        tables.append(ipc.open_stream(reader).read_all())
+    if not tables:
+        raise ValueError("Empty Arrow IPC body.")
+    return tables
+
+
+def arrow_metadata(table: pa.Table) -> Dict[str, str]:
+    meta = table.schema.metadata or {}
+    return {
+        k[len(_ARROW_META_PREFIX):].decode("utf-8"): v.decode("utf-8")
+        for k, v in meta.items()
+        if k.startswith(_ARROW_META_PREFIX)
+    }
+
+
+def table_to_columns(table: pa.Table) -> Dict[str, np.ndarray]:
+    """Arrow table -> {kolom: ndarray} tanpa membuat dict per baris."""
+    return {
+        name: table.column(name).to_numpy(zero_copy_only=False)
+        for name in table.column_names
+    }
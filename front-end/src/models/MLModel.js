@@ -91,9 +91,69 @@ export const trainUsingCache = async (baseName, modelName) => {
   return data; // { message, base_name, model_name }
 };
 
+// Training di latar belakang + progres per epoch lewat Server-Sent Events.
+// EventSource tidak bisa mengirim header Authorization, jadi stream dibaca
+// dengan fetch + ReadableStream. onEvent menerima { event, ...data }.
+const parseSSE = (chunk) => {
+  const message = { event: "message", data: "" };
+  for (const line of chunk.split("\n")) {
+    if (line.startsWith(":")) continue; // keepalive
+    const idx = line.indexOf(":");
+    const field = idx === -1 ? line : line.slice(0, idx);
+    const value = idx === -1 ? "" : line.slice(idx + 1).replace(/^ /, "");
+    if (field === "event") message.event = value;
+    if (field === "data") message.data += value;
+    if (field === "id") message.id = value;
+  }
+  return message.data ? { ...JSON.parse(message.data), event: message.event } : null;
+};
+
+export const trainWithProgress = async (baseName, modelName, onEvent) => {
+  if (!baseName) throw new Error("base_name is required.");
+
+  const body = { base_name: baseName };
+  if (modelName && modelName.trim()) body.model_name = modelName.trim();
+
+  const { data: job } = await axios.post(`${BASE_URL}/model/train/jobs`, body, {
+    headers: {
+      Authorization: `Bearer ${getToken()}`,
+      "Content-Type": "application/json",
+    },
+  });
+
+  const response = await fetch(`${BASE_URL}${job.events_url}`, {
+    headers: {
+      Authorization: `Bearer ${getToken()}`,
+      Accept: "text/event-stream",
+    },
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Gagal membuka stream progres (${response.status})`);
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    let sep;
+    while ((sep = buffer.indexOf("\n\n")) !== -1) {
+      const event = parseSSE(buffer.slice(0, sep));
+      buffer = buffer.slice(sep + 2);
+      if (!event) continue;
+      onEvent?.(event);
+      if (event.event === "done") return event.result; // { message, base_name, model_name, version }
+      if (event.event === "failed") throw new Error(event.detail || "Training failed");
+    }
+  }
+  throw new Error("Stream progres terputus sebelum training selesai.");
+};
+
 export const modelPredict = async (data) => {
   const response = await axios.post(`${BASE_URL}/model/predict`, data, {
     headers: { "Content-Type": "application/json" },
+    params: { ispu: true },
   });
   return response.data;
 };
@@ -106,6 +166,16 @@ export const savePrediction = async (data) => {
 };
 
 export const getSavedPrediction = async () => {
-  const response = await axios.get(`${BASE_URL}/model/predict/result`);
+  const response = await axios.get(`${BASE_URL}/model/predict/result`, {
+    params: { ispu: true },
+  });
+  return response.data;
+};
+
+// Forecast 14 hari terjadwal dari server (tidak menghitung ulang)
+export const getStandardForecast = async () => {
+  const response = await axios.get(`${BASE_URL}/model/forecast/standard`, {
+    params: { ispu: true },
+  });
   return response.data;
 };
@@ -1,10 +1,25 @@
 import React, { useEffect, useState } from "react";
-import { uploadDataModel, trainUsingCache } from "../models/MLModel";
+import { uploadDataModel, trainWithProgress } from "../models/MLModel";
 import { validateCsvHeaders, EXPECTED_HEADERS } from "../utils/validateCSV";
 import Swal from "sweetalert2";
 
 const CACHE_KEY = "ml_base_name";
 
+// detail dari backend bisa berupa string atau objek (laporan validasi CSV)
+const formatUploadError = (detail) => {
+  if (!detail || typeof detail === "string") return detail;
+  if (Array.isArray(detail.errors) && detail.errors.length) {
+    const rows = detail.errors
+      .slice(0, 5)
+      .map((e) => `baris ${e.row} ${e.column}: ${e.error} (${e.value ?? "kosong"})`)
+      .join("; ");
+    const more = detail.error_count > 5 ? ` (+${detail.error_count - 5} lainnya)` : "";
+    return `${detail.message} ${rows}${more}`;
+  }
+  if (detail.missing) return `${detail.message} Missing: ${detail.missing.join(", ")}`;
+  return detail.message || JSON.stringify(detail);
+};
+
 const UploadPage = () => {
   const [file, setFile] = useState(null);
   const [status, setStatus] = useState("idle");
@@ -15,6 +30,7 @@ const UploadPage = () => {
   const [trainStatus, setTrainStatus] = useState("idle");
   const [trainError, setTrainError] = useState("");
   const [modelName, setModelName] = useState("");
+  const [progress, setProgress] = useState(null);
 
   useEffect(() => {
     const saved = localStorage.getItem(CACHE_KEY);
@@ -57,7 +73,9 @@ const UploadPage = () => {
     } catch (err) {
       setStatus("error");
       setErrorMsg(
-        err?.response?.data?.detail || err?.message || "Upload failed"
+        formatUploadError(err?.response?.data?.detail) ||
+          err?.message ||
+          "Upload failed"
       );
     }
   };
@@ -67,9 +85,14 @@ const UploadPage = () => {
 
     setTrainStatus("training");
     setTrainError("");
+    setProgress(null);
 
     try {
-      const res = await trainUsingCache(cachedBaseName, modelName);
+      const res = await trainWithProgress(cachedBaseName, modelName, (ev) => {
+        if (ev.event === "epoch" || ev.event === "stage") {
+          setProgress((prev) => ({ ...prev, [ev.event]: ev }));
+        }
+      });
       setTrainStatus("done");
       Swal.fire({
         title: "Pelatihan Selesai",
@@ -253,6 +276,22 @@ const UploadPage = () => {
                 <span className="text-sm text-gray-700 font-medium">
                   Melatih model...
                 </span>
+                {progress?.epoch && (
+                  <span className="text-xs text-gray-500">
+                    Epoch {progress.epoch.epoch}/{progress.epoch.epochs} · loss{" "}
+                    {progress.epoch.loss?.toFixed(4)} · val_loss{" "}
+                    {progress.epoch.val_loss?.toFixed(4)}
+                    {progress.epoch.eta_seconds != null &&
+                      ` · ETA ≤ ${Math.round(progress.epoch.eta_seconds)} dtk`}
+                    {progress.epoch.early_stop &&
+                      ` · early stop ${progress.epoch.early_stop.wait}/${progress.epoch.early_stop.patience}`}
+                  </span>
+                )}
+                {!progress?.epoch && progress?.stage && (
+                  <span className="text-xs text-gray-500">
+                    Tahap: {progress.stage.stage}
+                  </span>
+                )}
               </div>
 
               <div className="relative w-full h-2 bg-gray-200 rounded-full overflow-hidden">
@@ -1,5 +1,5 @@
 import React, { useMemo, useState, useEffect } from "react";
-import { getSavedPrediction } from "../models/MLModel";
+import { getSavedPrediction, getStandardForecast } from "../models/MLModel";
 import { motion, AnimatePresence } from "framer-motion";
 import {
   ArrowLeft,
@@ -416,7 +416,11 @@ const UserPage = () => {
     let alive = true;
     (async () => {
       try {
-        const response = await getSavedPrediction();
+        // Belum ada hasil yang disimpan admin -> pakai forecast terjadwal
+        const response = await getSavedPrediction().catch((e) => {
+          if (e?.response?.status === 404) return getStandardForecast();
+          throw e;
+        });
         const mapped = (response?.predictions ?? []).map((p) => ({
           date: toDMY(p.Tanggal),
           PM10: Number(p.PM10.toFixed(4)),
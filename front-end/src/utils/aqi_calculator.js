@@ -76,6 +76,8 @@ const computeAQIs = (row) => {
 };
 
 const enrichWithAQI = (row) => {
+  // ISPU sudah dihitung server (?ispu=true)
+  if (typeof row.AQI === "number") return row;
   return { ...row, ...computeAQIs(row) };
 };
 